@@ -1,21 +1,53 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, send_file, redirect, url_for, stream_with_context
 import os
 import json
+import random
+import threading
 from datetime import datetime
+from itertools import chain, groupby
 
 from src.models.curriculum import (
     get_all_volumes, get_volume, get_all_topics_for_volume, 
     get_topic, Difficulty, calculate_question_distribution
 )
 from src.generators.question_engine import QuestionGenerator
+from src.generators.hash_registry import UniqueHashRegistry
+from src.generators.question_pool import QuestionPool
+from src.generators.exam_builder import DEFAULT_BANK_DIR, DEFAULT_DIFFICULTY_MIX, ExamBuilder, ExamConstraints, QuestionBank
+from src.generators.telemetry import GeneratorTelemetry
 from src.generators.pdf_generator import PDFGenerator
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
-generator = QuestionGenerator()
+UniqueHashRegistry.configure_from_env()
+
+generator = QuestionGenerator(workers=int(os.environ.get('GENERATOR_WORKERS', 0)) or None)
 pdf_generator = PDFGenerator()
 
+question_pool = None
+if int(os.environ.get('QUESTION_POOL_HIGH', 0)):
+    question_pool = QuestionPool(
+        generator,
+        low_watermark=int(os.environ.get('QUESTION_POOL_LOW', QuestionPool.LOW_WATERMARK)),
+        high_watermark=int(os.environ['QUESTION_POOL_HIGH'])
+    )
+    for warm_volume in filter(None, os.environ.get('QUESTION_POOL_WARM_VOLUMES', '').split(',')):
+        question_pool.warm(int(warm_volume))
+
+
+exam_builder = None
+exam_builder_lock = threading.Lock()
+
+
+def get_exam_builder() -> ExamBuilder:
+    # The stored bank is indexed once, on the first exam request.
+    global exam_builder
+    with exam_builder_lock:
+        if exam_builder is None:
+            exam_builder = ExamBuilder(QuestionBank.from_directory(os.environ.get('EXAM_BANK_DIR', DEFAULT_BANK_DIR)))
+        return exam_builder
+
 
 @app.route('/')
 def index():
@@ -51,6 +83,24 @@ def api_topics(volume_id):
     return jsonify(result)
 
 
+@app.route('/api/question/<question_id>')
+def api_question(question_id):
+    # Ids encode topic, difficulty, generator version and seed, so the
+    # question is rebuilt on demand instead of being looked up.
+    try:
+        question = generator.rebuild_question(question_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    return jsonify({'success': True, 'question': question.to_dict()})
+
+
+@app.route('/api/stats/generators')
+def api_generator_stats():
+    # Sorted by time lost to rejected draws, so the generators worth fixing
+    # come first.
+    return jsonify({'success': True, 'generators': GeneratorTelemetry.report()})
+
+
 @app.route('/generate', methods=['GET', 'POST'])
 def generate():
     volumes = get_all_volumes()
@@ -63,9 +113,12 @@ def generate():
         
         try:
             if topic_id and topic_id != 'all':
-                question_set = generator.generate_topic_questions(
-                    volume_id, topic_id, questions_count
-                )
+                if question_pool:
+                    question_set = question_pool.take_topic(volume_id, topic_id, questions_count)
+                else:
+                    question_set = generator.generate_topic_questions(
+                        volume_id, topic_id, questions_count
+                    )
                 
                 if generate_pdf:
                     pdf_path = pdf_generator.generate_topic_pdf(question_set)
@@ -118,24 +171,32 @@ def api_generate_topic():
         return jsonify({'error': 'topic_id is required'}), 400
     
     try:
-        question_set = generator.generate_topic_questions(
-            volume_id, topic_id, questions_count
-        )
-        
-        questions_data = []
-        for q in question_set.questions:
-            questions_data.append(q.to_dict())
-        
-        return jsonify({
+        if question_pool:
+            questions = iter(question_pool.take_topic(volume_id, topic_id, questions_count).questions)
+        else:
+            questions = generator.iter_topic_questions(volume_id, topic_id, questions_count)
+        # Pull the first chunk before answering so planning errors still
+        # produce a proper error response instead of a truncated stream.
+        first = next(questions, None)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    topic = get_topic(volume_id, topic_id)
+    
+    def generate_json():
+        header = json.dumps({
             'success': True,
             'volume_id': volume_id,
             'topic_id': topic_id,
-            'topic_name': question_set.topic_name,
-            'total_questions': len(questions_data),
-            'questions': questions_data
+            'topic_name': topic.name
         })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        yield header[:-1] + ', "questions": ['
+        total = 0
+        for q in chain([first] if first else [], questions):
+            yield (', ' if total else '') + json.dumps(q.to_dict())
+            total += 1
+        yield f'], "total_questions": {total}}}'
+    
+    return Response(stream_with_context(generate_json()), mimetype='application/json')
 
 
 @app.route('/api/generate/volume', methods=['POST'])
@@ -145,28 +206,67 @@ def api_generate_volume():
     questions_per_topic = data.get('questions_per_topic', 20)
     
     try:
-        volume_set = generator.generate_volume_questions(
-            volume_id, questions_per_topic
-        )
-        
-        topics_data = []
-        for ts in volume_set.topic_sets:
-            topic_questions = [q.to_dict() for q in ts.questions]
-            topics_data.append({
-                'topic_id': ts.topic_id,
-                'topic_name': ts.topic_name,
-                'questions': topic_questions
-            })
-        
-        return jsonify({
+        questions = generator.iter_volume_questions(volume_id, questions_per_topic)
+        first = next(questions, None)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    volume = get_volume(volume_id)
+    
+    def generate_json():
+        header = json.dumps({
             'success': True,
             'volume_id': volume_id,
-            'volume_name': volume_set.volume_name,
-            'total_questions': volume_set.total_count(),
-            'topics': topics_data
+            'volume_name': volume.name
         })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        yield header[:-1] + ', "topics": ['
+        total = 0
+        topics_written = 0
+        for topic_id, topic_questions in groupby(chain([first] if first else [], questions), key=lambda q: q.topic_id):
+            topic = get_topic(volume_id, topic_id)
+            topic_header = json.dumps({'topic_id': topic_id, 'topic_name': topic.name})
+            yield (', ' if topics_written else '') + topic_header[:-1] + ', "questions": ['
+            for i, q in enumerate(topic_questions):
+                yield (', ' if i else '') + json.dumps(q.to_dict())
+                total += 1
+            yield ']}'
+            topics_written += 1
+        yield f'], "total_questions": {total}}}'
+    
+    return Response(stream_with_context(generate_json()), mimetype='application/json')
+
+
+@app.route('/api/exam', methods=['POST'])
+def api_exam():
+    data = request.get_json() or {}
+    source = data.get('source', 'bank')
+    title = data.get('title', 'Simulado')
+    seed = data.get('seed')
+    seed = int(seed) if seed is not None else random.randrange(2 ** 31)
+    
+    try:
+        difficulty = data.get('difficulty')
+        constraints = ExamConstraints(
+            total=int(data.get('total', 60)),
+            topic_weights={str(k): float(v) for k, v in data.get('topics', {}).items()},
+            difficulty_mix=(
+                {Difficulty(k): float(v) for k, v in difficulty.items()} if difficulty else dict(DEFAULT_DIFFICULTY_MIX)
+            ),
+            max_letter_run=data.get('max_letter_run', 1),
+            excluded_hashes=set(data.get('exclude', [])),
+            seed=seed
+        )
+        if source == 'pool':
+            if not question_pool:
+                return jsonify({'error': 'Question pool is not enabled (QUESTION_POOL_HIGH)'}), 400
+            exam = question_pool.assemble_exam(constraints, title)
+        elif source == 'bank':
+            exam = get_exam_builder().build(constraints, title)
+        else:
+            return jsonify({'error': f'Unknown source: {source}'}), 400
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'success': True, 'seed': seed, 'exam': exam.to_dict()})
 
 
 @app.route('/api/generate/pdf/topic', methods=['POST'])
@@ -201,10 +301,9 @@ def api_generate_pdf_volume():
     questions_per_topic = data.get('questions_per_topic', 20)
     
     try:
-        volume_set = generator.generate_volume_questions(
-            volume_id, questions_per_topic
+        pdf_path = pdf_generator.generate_volume_pdf_from_questions(
+            volume_id, generator.iter_volume_questions(volume_id, questions_per_topic)
         )
-        pdf_path = pdf_generator.generate_volume_pdf(volume_set)
         
         return send_file(
             pdf_path,
@@ -1,6 +1,6 @@
-import matplotlib.pyplot as plt
+import sys
 
-fig, ax = plt.subplots()
-ax.plot([1, 2, 3, 4], [1, 4, 2, 5])
-plt.ylabel('some numbers')
-plt.show()
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
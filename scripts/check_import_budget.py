@@ -0,0 +1,68 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed per entry point, in milliseconds.
+BUDGETS_MS: Dict[str, float] = {
+    "src.models": 100,
+    "src.generators": 250,
+    "src.generators.question_engine": 250,
+    "src.generators.question_pool": 250,
+    "src.cli": 300,
+}
+
+# Heavy dependencies that must only be imported by the code paths using them.
+FORBIDDEN_MODULES: Tuple[str, ...] = ("sympy", "numpy", "weasyprint", "matplotlib", "pandas", "flask")
+
+
+def measure(module: str) -> Tuple[float, List[str]]:
+    code = (
+        f"import {module}, sys; "
+        f"print(' '.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [f.strip() for f in line[len("import time:"):].split("|")]
+        if fields[2] == module:
+            cumulative_us = int(fields[1])
+    return cumulative_us / 1000, result.stdout.split()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check import time of the main entry points against a budget")
+    parser.add_argument("--runs", type=int, default=5, help="best of N fresh interpreters per module")
+    parser.add_argument("--scale", type=float, default=float(os.environ.get("IMPORT_BUDGET_SCALE", 1.0)),
+                        help="multiply every budget, for slow machines")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':40} {'import ms':>10} {'budget ms':>10}")
+    for module, budget in BUDGETS_MS.items():
+        runs = [measure(module) for _ in range(args.runs)]
+        elapsed = min(ms for ms, _ in runs)
+        loaded = sorted({m for _, mods in runs for m in mods})
+        limit = budget * args.scale
+        print(f"{module:40} {elapsed:10.1f} {limit:10.1f}")
+        if elapsed > limit:
+            failures.append(f"{module} took {elapsed:.1f} ms (budget {limit:.1f} ms)")
+        if loaded:
+            failures.append(f"{module} eagerly imports {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
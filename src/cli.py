@@ -0,0 +1,336 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Set, TextIO
+
+from .models.curriculum import Difficulty, get_all_volumes, get_volume
+from .models.question import Question
+from .generators.exam_builder import DEFAULT_BANK_DIR, ExamBuilder, ExamConstraints, QuestionBank, read_questions
+from .generators.hash_registry import UniqueHashRegistry
+from .generators.question_engine import QuestionGenerator
+from .generators.telemetry import GeneratorTelemetry
+
+
+# Flask and WeasyPrint are imported inside the commands that need them, so
+# a headless bulk run only loads the generation engine.
+
+DEFAULT_OUTPUT_DIR = DEFAULT_BANK_DIR
+STATS_FILE_NAME = "generator_stats.json"
+
+
+def parse_volumes(spec: str) -> List[int]:
+    if spec == "all":
+        return sorted(get_all_volumes())
+    volumes: List[int] = []
+    for part in spec.split(","):
+        if "-" in part:
+            start, end = part.split("-", 1)
+            volumes.extend(range(int(start), int(end) + 1))
+        else:
+            volumes.append(int(part))
+    for volume_id in volumes:
+        if not get_volume(volume_id):
+            raise ValueError(f"Volume {volume_id} not found")
+    return volumes
+
+
+class Checkpoint:
+    FILE_NAME = "checkpoint.json"
+
+    def __init__(self, output_dir: str, questions_per_topic: int):
+        self.path = os.path.join(output_dir, self.FILE_NAME)
+        self.questions_per_topic = questions_per_topic
+        self.completed: Dict[str, int] = {}
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if data.get("questions_per_topic") != self.questions_per_topic:
+            raise ValueError(
+                f"Checkpoint was written for {data.get('questions_per_topic')} questions per topic, "
+                f"not {self.questions_per_topic}"
+            )
+        self.completed = data.get("completed", {})
+
+    @staticmethod
+    def _key(volume_id: int, topic_id: str) -> str:
+        return f"{volume_id}/{topic_id}"
+
+    def is_done(self, volume_id: int, topic_id: str) -> bool:
+        return self._key(volume_id, topic_id) in self.completed
+
+    def mark_done(self, volume_id: int, topic_id: str, count: int):
+        self.completed[self._key(volume_id, topic_id)] = count
+        self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"questions_per_topic": self.questions_per_topic, "completed": self.completed}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class Progress:
+    REPORT_INTERVAL = 0.5
+    LOG_INTERVAL = 10.0
+
+    def __init__(self, total: int, stream: Optional[TextIO] = None):
+        self.total = total
+        self.done = 0
+        self.stream = stream or sys.stderr
+        # On a terminal the line is redrawn in place; in logs a line is
+        # appended every LOG_INTERVAL seconds instead.
+        self.interactive = self.stream.isatty()
+        self.started = time.monotonic()
+        self._last_report = 0.0
+
+    def advance(self, count: int, label: str):
+        self.done += count
+        now = time.monotonic()
+        if now - self._last_report >= (self.REPORT_INTERVAL if self.interactive else self.LOG_INTERVAL):
+            self._last_report = now
+            self._write(label)
+
+    def finish(self, label: str):
+        self._write(label)
+        if self.interactive:
+            self.stream.write("\n")
+
+    def _write(self, label: str):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = self.done / elapsed
+        remaining = (self.total - self.done) / rate if rate else 0.0
+        percent = 100 * self.done / self.total if self.total else 100.0
+        line = (
+            f"{label}: {self.done}/{self.total} questões ({percent:.1f}%), "
+            f"{rate:.0f} questões/s, decorrido {_format_duration(elapsed)}, restante ~{_format_duration(remaining)}"
+        )
+        self.stream.write("\r\033[K" + line if self.interactive else line + "\n")
+        self.stream.flush()
+
+
+def topic_path(output_dir: str, volume_id: int, topic_id: str) -> str:
+    return os.path.join(output_dir, f"volume_{volume_id:02d}", f"topic_{topic_id}.jsonl")
+
+
+def _write_topic(
+    output_dir: str,
+    volume_id: int,
+    topic_id: str,
+    questions: Iterable[Question],
+    progress: Progress
+) -> int:
+    path = topic_path(output_dir, volume_id, topic_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # A topic only appears under its final name once it is complete; an
+    # interrupted run leaves a .part file that the next run overwrites.
+    tmp_path = path + ".part"
+    label = f"Volume {volume_id}, tópico {topic_id}"
+    count = 0
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for question in questions:
+            f.write(json.dumps(question.to_dict(), ensure_ascii=False) + "\n")
+            count += 1
+            progress.advance(1, label)
+    os.replace(tmp_path, path)
+    return count
+
+
+def _write_volume_pdf(output_dir: str, volume_id: int) -> str:
+    from .generators.pdf_generator import PDFGenerator
+    volume = get_volume(volume_id)
+    paths = [topic_path(output_dir, volume_id, topic.id) for topic in volume.topics]
+    questions = (q for path in paths if os.path.exists(path) for q in read_questions(path))
+    return PDFGenerator(os.path.join(output_dir, "pdf")).generate_volume_pdf_from_questions(volume_id, questions)
+
+
+def _write_stats(output_dir: str) -> str:
+    path = os.path.join(output_dir, STATS_FILE_NAME)
+    report = GeneratorTelemetry.report()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    fallbacks = sum(sum(row["fallbacks"].values()) for row in report)
+    if fallbacks:
+        print(f"{fallbacks} questões genéricas usadas no lugar de questões do tópico; detalhes em {path}", file=sys.stderr)
+    dropped = sum(row["dropped"] for row in report)
+    if dropped:
+        print(f"{dropped} questões não geradas por falta de questões únicas; detalhes em {path}", file=sys.stderr)
+    return path
+
+
+def run_generate(args: argparse.Namespace) -> int:
+    volumes = parse_volumes(args.volumes)
+    os.makedirs(args.output, exist_ok=True)
+    checkpoint = Checkpoint(args.output, args.per_topic)
+    if checkpoint.exists():
+        if not args.resume:
+            print(f"Já existe um checkpoint em {checkpoint.path}; use --resume para continuar", file=sys.stderr)
+            return 2
+        checkpoint.load()
+
+    UniqueHashRegistry.configure_from_env()
+    generator = QuestionGenerator(
+        global_dedup=args.global_dedup,
+        near_duplicate_check=not args.no_near_duplicates,
+        workers=args.workers if args.workers > 1 else None
+    )
+    pending = {
+        volume_id: {t.id for t in get_volume(volume_id).topics if not checkpoint.is_done(volume_id, t.id)}
+        for volume_id in volumes
+    }
+    progress = Progress(sum(len(topics) for topics in pending.values()) * args.per_topic)
+
+    try:
+        for volume_id in volumes:
+            if pending[volume_id]:
+                questions = generator.iter_volume_questions(
+                    volume_id,
+                    args.per_topic,
+                    chunk_size=args.chunk_size,
+                    topic_ids=pending[volume_id]
+                )
+                for topic_id, topic_questions in groupby(questions, key=lambda q: q.topic_id):
+                    count = _write_topic(args.output, volume_id, topic_id, topic_questions, progress)
+                    # Hashes must be on disk before the topic is recorded as
+                    # done, or a resumed run could hand them out again.
+                    UniqueHashRegistry.flush_all()
+                    checkpoint.mark_done(volume_id, topic_id, count)
+            if args.pdf:
+                progress.finish(f"Volume {volume_id}")
+                print(f"PDF: {_write_volume_pdf(args.output, volume_id)}", file=sys.stderr)
+    except KeyboardInterrupt:
+        progress.finish("Interrompido")
+        print("Use --resume para continuar de onde parou", file=sys.stderr)
+        return 130
+    finally:
+        QuestionGenerator.shutdown_pool()
+        UniqueHashRegistry.flush_all()
+        _write_stats(args.output)
+
+    progress.finish("Concluído")
+    return 0
+
+
+def parse_topic_weights(spec: Optional[str]) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for part in filter(None, (spec or "").split(",")):
+        topic_id, _, weight = part.partition(":")
+        weights[topic_id.strip()] = float(weight) if weight else 1.0
+    return weights
+
+
+def parse_difficulty_mix(spec: str) -> Dict[Difficulty, float]:
+    parts = spec.split("/")
+    if len(parts) != len(Difficulty):
+        raise ValueError(f"Difficulty mix must have {len(Difficulty)} parts (fácil/médio/difícil), got {spec!r}")
+    return {difficulty: float(part) for difficulty, part in zip(Difficulty, parts)}
+
+
+def _exam_hashes(paths: Iterable[str]) -> Set[str]:
+    hashes: Set[str] = set()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            hashes.update(q["hash_signature"] for q in json.load(f)["questions"])
+    return hashes
+
+
+def run_exam(args: argparse.Namespace) -> int:
+    started = time.perf_counter()
+    bank = QuestionBank.from_directory(args.bank)
+    if not len(bank):
+        print(f"Nenhuma questão encontrada em {args.bank}; gere o banco com `main.py generate`", file=sys.stderr)
+        return 2
+    loaded = time.perf_counter()
+    constraints = ExamConstraints(
+        total=args.total,
+        topic_weights=parse_topic_weights(args.topics),
+        difficulty_mix=parse_difficulty_mix(args.difficulty),
+        max_letter_run=args.max_letter_run or None,
+        excluded_hashes=_exam_hashes(args.exclude),
+        seed=args.seed
+    )
+    exam = ExamBuilder(bank).build(constraints, args.title)
+    print(
+        f"Banco: {len(bank)} questões (carregado em {loaded - started:.1f}s); "
+        f"simulado montado em {(time.perf_counter() - loaded) * 1000:.1f} ms",
+        file=sys.stderr
+    )
+    data = json.dumps(exam.to_dict(), ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+    else:
+        print(data)
+    return 0
+
+
+def run_serve(args: argparse.Namespace) -> int:
+    from app import app
+    os.makedirs('src/output', exist_ok=True)
+    app.run(host=args.host, port=args.port, debug=args.debug)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="MathQuest - gerador de questões matemáticas")
+    subparsers = parser.add_subparsers(dest="command")
+
+    generate = subparsers.add_parser("generate", help="gera bancos de questões em arquivos JSONL")
+    generate.add_argument("--volumes", default="all", help="volumes a gerar, ex.: all, 4, 1,3,5-7 (padrão: all)")
+    generate.add_argument("--per-topic", type=int, default=20, help="questões por tópico (padrão: 20)")
+    generate.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help=f"diretório de saída (padrão: {DEFAULT_OUTPUT_DIR})")
+    generate.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                          help="processos que geram tópicos em paralelo (padrão: número de CPUs)")
+    generate.add_argument("--chunk-size", type=int, default=500,
+                          help="questões por ida ao registro de hashes (padrão: 500)")
+    generate.add_argument("--resume", action="store_true", help="continua a partir do checkpoint do diretório de saída")
+    generate.add_argument("--pdf", action="store_true", help="também gera o PDF de cada volume")
+    generate.add_argument("--global-dedup", action="store_true", help="garante unicidade entre todos os volumes")
+    generate.add_argument("--no-near-duplicates", action="store_true", help="desativa a detecção de quase-duplicatas")
+    generate.set_defaults(handler=run_generate)
+
+    exam = subparsers.add_parser("exam", help="monta um simulado a partir de um banco gerado, sem gerar questões novas")
+    exam.add_argument("--bank", default=DEFAULT_OUTPUT_DIR, help=f"diretório do banco (padrão: {DEFAULT_OUTPUT_DIR})")
+    exam.add_argument("--total", type=int, default=60, help="número de questões (padrão: 60)")
+    exam.add_argument("--topics", help="tópicos e pesos, ex.: 11.3:2,11.4,4.2 (padrão: todos os tópicos do banco, mesmo peso)")
+    exam.add_argument("--difficulty", default="40/40/20", help="proporção fácil/médio/difícil (padrão: 40/40/20)")
+    exam.add_argument("--max-letter-run", type=int, default=1,
+                      help="máximo de questões seguidas com a mesma letra correta; 0 desativa (padrão: 1)")
+    exam.add_argument("--exclude", nargs="*", default=[], help="simulados anteriores (JSON) cujas questões não podem se repetir")
+    exam.add_argument("--seed", type=int, default=0)
+    exam.add_argument("--title", default="Simulado")
+    exam.add_argument("--output", help="arquivo JSON de saída (padrão: saída padrão)")
+    exam.set_defaults(handler=run_exam)
+
+    serve = subparsers.add_parser("serve", help="inicia a aplicação web")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=5000)
+    serve.add_argument("--debug", action="store_true")
+    serve.set_defaults(handler=run_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        # A bare `python main.py` (the deployment command) starts the web app.
+        args = parser.parse_args(["serve"])
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
@@ -1,6 +1,15 @@
-from .question_engine import QuestionGenerator, UniqueHashRegistry
-from .pdf_generator import PDFGenerator
+from .question_engine import QuestionGenerator
+from .hash_registry import UniqueHashRegistry
 from .question_templates import (
     ContextGenerator, NumberGenerator, DistractorGenerator, 
-    StatementPatterns, format_set, format_number, format_fraction, format_expression
+    StatementPatterns, format_set, format_number, format_fraction, format_expression,
+    is_prime
 )
+
+
+def __getattr__(name):
+    # WeasyPrint is heavy to import; only callers that render PDFs pay for it.
+    if name == "PDFGenerator":
+        from .pdf_generator import PDFGenerator
+        return PDFGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
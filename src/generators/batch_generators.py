@@ -0,0 +1,341 @@
+from __future__ import annotations
+import gc
+import math
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence
+
+from ..models.curriculum import Difficulty, Topic
+from ..models.question import Alternative, Question
+from .question_templates import ContextGenerator, DistractorGenerator, _numeric_pool, format_number
+from .generator_registry import get_generator_spec
+from .number_tables import PRIME_COUNTS
+from .question_ids import GenerationPath, QuestionKey
+
+if TYPE_CHECKING:
+    from .question_engine import QuestionGenerator
+
+
+# Batch counterparts of the scalar generators: parameters, answers and
+# distractors for the whole batch are drawn as NumPy arrays, and only the
+# final strings are built row by row.
+
+_LETTERS = ["A", "B", "C", "D", "E"]
+
+
+def _mix(x):
+    import numpy as np
+    # splitmix64 finalizer; uint64 arithmetic wraps, which is intended.
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class _RowRandom:
+    # Counter-based draws: row i only ever depends on seeds[i], so a single
+    # question of a batch can be rebuilt from its own seed.
+    BLOCK = 16
+
+    def __init__(self, seeds: Sequence[int]):
+        import numpy as np
+        self._keys = _mix(np.asarray(seeds, dtype=np.uint64))[:, None]
+        self._counter = 0
+        self._block = np.empty((len(seeds), 0))
+        self._position = 0
+
+    def _refill(self, width: int):
+        import numpy as np
+        # Columns are numbered globally, so refilling early never changes
+        # which values a given draw receives.
+        self._counter += self._position
+        counters = _mix(np.arange(self._counter + 1, self._counter + width + 1, dtype=np.uint64))
+        bits = _mix(self._keys ^ counters)
+        self._block = (bits >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+        self._position = 0
+
+    def random(self, columns: Optional[int] = None):
+        width = columns or 1
+        if self._position + width > self._block.shape[1]:
+            self._refill(max(width, self.BLOCK))
+        values = self._block[:, self._position:self._position + width]
+        self._position += width
+        return values if columns else values[:, 0]
+
+    def integers(self, low, high):
+        import numpy as np
+        return (low + np.floor(self.random() * (np.asarray(high) - low))).astype(np.int64)
+
+    def choice(self, options: Sequence[Any]):
+        import numpy as np
+        return np.asarray(options)[self.integers(0, len(options))]
+
+
+@lru_cache(maxsize=None)
+def _binomials(size: int):
+    import numpy as np
+    return np.array([[math.comb(n, k) for k in range(size)] for n in range(size)], dtype=np.int64)
+
+
+@lru_cache(maxsize=None)
+def _prime_counts(limit: int):
+    import numpy as np
+    return np.asarray(PRIME_COUNTS[:limit + 1], dtype=np.int64)
+
+
+_gc_lock = threading.Lock()
+_gc_depth = 0
+_gc_restore = False
+
+
+@contextmanager
+def _gc_paused():
+    # A batch allocates tens of thousands of acyclic objects; letting the
+    # cyclic collector run over them repeatedly costs more than building them.
+    # gc is process-wide and batches overlap across threads (the pool refill
+    # thread, request handlers), so only the last batch out turns it back on,
+    # and only if it was on before the first one came in.
+    global _gc_depth, _gc_restore
+    with _gc_lock:
+        if not _gc_depth:
+            _gc_restore = gc.isenabled()
+            gc.disable()
+        _gc_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_depth -= 1
+            if not _gc_depth and _gc_restore:
+                gc.enable()
+
+
+def _distractors(rng, correct, difficulty: Difficulty, fmt: Callable[[Any], str], count: int = 4) -> List[List[str]]:
+    import numpy as np
+    # The scalar generators' pools, built once per distinct answer in the
+    # batch (and memoized across batches); each row only draws which
+    # entries of its pool to show.
+    size = max(count, DistractorGenerator.POOL_SIZE)
+    values, inverse = np.unique(correct, return_inverse=True)
+    pools = [[fmt(v) for v in _numeric_pool(value, difficulty, size)] for value in values.tolist()]
+    order = np.argsort(rng.random(size), axis=1)[:, :count]
+    return [
+        [pools[i][p] for p in row if p < len(pools[i])]
+        for i, row in zip(inverse.ravel().tolist(), order.tolist())
+    ]
+
+
+def _assemble(
+    rng: _RowRandom,
+    seeds: Sequence[int],
+    volume_id: int,
+    topic: Topic,
+    difficulty: Difficulty,
+    statements: List[str],
+    resolutions: List[str],
+    answers: List[str],
+    distractors: List[List[str]]
+) -> List[Question]:
+    import numpy as np
+    orders = np.argsort(rng.random(5), axis=1).tolist()
+    version = get_generator_spec(topic.id).version
+    ids = [QuestionKey(topic.id, difficulty, GenerationPath.BATCH, version, seed).encode() for seed in seeds]
+    rows = zip(statements, resolutions, answers, distractors, orders)
+    with _gc_paused():
+        return _build_questions(rows, ids, volume_id, topic, difficulty)
+
+
+def _build_questions(rows, ids: List[str], volume_id: int, topic: Topic, difficulty: Difficulty) -> List[Question]:
+    questions = []
+    for i, (statement, resolution, answer, wrong, order) in enumerate(rows):
+        options = DistractorGenerator.complete_options(answer, wrong)
+        alternatives = []
+        correct_letter = ""
+        for letter, position in zip(_LETTERS, order):
+            text = options[position]
+            alternatives.append(Alternative(letter, text, text == answer))
+            if text == answer:
+                correct_letter = letter
+        questions.append(Question(
+            id=ids[i],
+            volume_id=volume_id,
+            topic_id=topic.id,
+            difficulty=difficulty,
+            statement=statement,
+            alternatives=alternatives,
+            correct_answer=correct_letter,
+            resolution=resolution
+        ))
+    return questions
+
+
+def _sequence_columns(topic: Topic, difficulty: Difficulty, seeds: Sequence[int]):
+    import numpy as np
+    columns = get_generator_spec(topic.id).parameter_spaces[difficulty].columns(seeds)
+    if "question_type" in columns:
+        # The ratio questions carry no term count; give them a harmless one
+        # so the whole batch stays in integer arrays.
+        kinds = columns["question_type"]
+        columns["n"] = np.where(kinds == "ratio", 1, columns["n"]).astype(np.int64)
+    return columns
+
+
+def generate_ap_batch(engine: QuestionGenerator, topic: Topic, difficulty: Difficulty, seeds: Sequence[int]) -> List[Question]:
+    import numpy as np
+    if difficulty == Difficulty.DIFICIL:
+        return [engine._run_generator(get_generator_spec(topic.id), topic, difficulty, seed) for seed in seeds]
+
+    rng = _RowRandom(seeds)
+    columns = _sequence_columns(topic, difficulty, seeds)
+    a1 = columns["a1"].astype(np.int64)
+    r = columns["r"].astype(np.int64)
+    n = columns["n"].astype(np.int64)
+    an = a1 + (n - 1) * r
+    sn = n * (a1 + an) // 2
+    statements, resolutions = [], []
+
+    if difficulty == Difficulty.FACIL:
+        kinds = columns["question_type"]
+        correct = np.select([kinds == "nth_term", kinds == "sum"], [an, sn], r)
+        for kind, a, d, m, last, c in zip(kinds.tolist(), a1.tolist(), r.tolist(), n.tolist(), an.tolist(), correct.tolist()):
+            if kind == "nth_term":
+                statements.append(f"Em uma PA de primeiro termo {a} e razão {d}, o {m}º termo vale:")
+                resolutions.append(f"a_n = a_1 + (n-1)r = {a} + ({m}-1)×{d} = {a} + {(m-1)*d} = {c}")
+            elif kind == "sum":
+                statements.append(f"A soma dos {m} primeiros termos da PA ({a}, {a+d}, {a+2*d}, ...) é:")
+                resolutions.append(f"S_n = n(a_1 + a_n)/2 = {m}×({a} + {last})/2 = {c}")
+            else:
+                statements.append(f"A razão da PA ({a}, {a+d}, {a+2*d}, ...) é:")
+                resolutions.append(f"r = a_2 - a_1 = {a+d} - {a} = {c}")
+    else:
+        correct = sn
+        names = ContextGenerator.PEOPLE_NAMES
+        picks = rng.integers(0, len(names)).tolist()
+        for pick, a, d, m, last, c in zip(picks, a1.tolist(), r.tolist(), n.tolist(), an.tolist(), correct.tolist()):
+            name = names[pick]
+            statements.append(f"{name} começou a guardar dinheiro de forma progressiva: no primeiro mês guardou R$ {a},00, no segundo R$ {a+d},00, no terceiro R$ {a+2*d},00, e assim por diante. Ao final de {m} meses, quanto {name} terá guardado no total?")
+            resolutions.append(f"É uma PA com a_1 = {a} e r = {d}. S_{m} = {m}×({a} + {last})/2 = R$ {c},00")
+
+    answers = [str(c) for c in correct.tolist()]
+    distractors = _distractors(rng, correct, difficulty, str)
+    return _assemble(rng, seeds, 4, topic, difficulty, statements, resolutions, answers, distractors)
+
+
+def generate_gp_batch(engine: QuestionGenerator, topic: Topic, difficulty: Difficulty, seeds: Sequence[int]) -> List[Question]:
+    import numpy as np
+    if difficulty == Difficulty.DIFICIL:
+        return [engine._run_generator(get_generator_spec(topic.id), topic, difficulty, seed) for seed in seeds]
+
+    rng = _RowRandom(seeds)
+    columns = _sequence_columns(topic, difficulty, seeds)
+    a1 = columns["a1"].astype(np.int64)
+    statements, resolutions = [], []
+
+    if difficulty == Difficulty.FACIL:
+        kinds = columns["question_type"]
+        q = columns["q"].astype(np.int64)
+        n = columns["n"]
+        an = a1 * q ** (n - 1)
+        sn = a1 * (q ** n - 1) // (q - 1)
+        correct = np.select([kinds == "nth_term", kinds == "sum"], [an, sn], q)
+        for kind, a, k, m, c in zip(kinds.tolist(), a1.tolist(), q.tolist(), n.tolist(), correct.tolist()):
+            if kind == "nth_term":
+                statements.append(f"Em uma PG de primeiro termo {a} e razão {k}, o {m}º termo vale:")
+                resolutions.append(f"a_n = a_1 × q^(n-1) = {a} × {k}^{m-1} = {a} × {k**(m-1)} = {c}")
+            elif kind == "sum":
+                statements.append(f"A soma dos {m} primeiros termos da PG ({a}, {a*k}, {a*k**2}, ...) é:")
+                resolutions.append(f"S_n = a_1(q^n - 1)/(q - 1) = {a}×({k}^{m} - 1)/({k} - 1) = {c}")
+            else:
+                statements.append(f"A razão da PG ({a}, {a*k}, {a*k**2}, ...) é:")
+                resolutions.append(f"q = a_2 / a_1 = {a*k} / {a} = {c}")
+        answers = [str(c) for c in correct.tolist()]
+        distractors = _distractors(rng, correct, difficulty, str)
+    else:
+        q = columns["q"].astype(np.float64)
+        correct = a1 * q ** 5
+        answers, distractors = [], []
+        for a, k, c in zip(a1.tolist(), q.tolist(), correct.tolist()):
+            statements.append(f"Um equipamento que custou R$ {a},00 deprecia {int((1-k)*100)}% ao ano. Após 5 anos, seu valor será aproximadamente:")
+            resolutions.append(f"V = {a} × {k}^5 = {a} × {k**5:.4f} ≈ R$ {c:.2f}")
+            answers.append(f"R$ {c:.2f}")
+            distractors.append([f"R$ {c * f:.2f}" for f in [0.8, 1.2, 1.5, 0.6]])
+
+    return _assemble(rng, seeds, 4, topic, difficulty, statements, resolutions, answers, distractors)
+
+
+def generate_probability_batch(engine: QuestionGenerator, topic: Topic, difficulty: Difficulty, seeds: Sequence[int]) -> List[Question]:
+    import numpy as np
+    rng = _RowRandom(seeds)
+    size = len(seeds)
+    binomials = _binomials(13)
+    statements, resolutions = [], []
+
+    if difficulty == Difficulty.FACIL:
+        scenarios = rng.integers(0, 3)
+        balls = np.stack([rng.integers(3, 9), rng.integers(2, 7), rng.integers(1, 5)])
+        colors = rng.integers(0, 3)
+        picked = balls[colors, np.arange(size)]
+        totals = balls.sum(axis=0)
+        chips = rng.integers(10, 21)
+        props = rng.integers(0, 4)
+        chip_counts = np.select(
+            [props == 0, props == 1, props == 2],
+            [chips // 2, (chips + 1) // 2, chips // 3],
+            _prime_counts(20)[chips]
+        )
+        correct = np.select([scenarios == 0, scenarios == 1], [picked / totals, chip_counts / chips], 13 / 52)
+        color_names = ["vermelha", "azul", "verde"]
+        prop_names = ["par", "ímpar", "múltiplo de 3", "primo"]
+        rows = zip(scenarios.tolist(), balls.T.tolist(), colors.tolist(), picked.tolist(), totals.tolist(),
+                   chips.tolist(), props.tolist(), chip_counts.tolist(), correct.tolist())
+        for scenario, (red, blue, green), color, count, total, n, prop, chip_count, c in rows:
+            if scenario == 0:
+                statements.append(f"Uma urna contém {red} bolas vermelhas, {blue} bolas azuis e {green} bolas verdes. Retirando-se uma bola ao acaso, a probabilidade de ela ser {color_names[color]} é:")
+                resolutions.append(f"P({color_names[color]}) = {count}/{total} = {format_number(c)}")
+            elif scenario == 1:
+                statements.append(f"De uma caixa com fichas numeradas de 1 a {n}, retira-se uma ficha ao acaso. A probabilidade de o número ser {prop_names[prop]} é:")
+                resolutions.append(f"Há {chip_count} números {prop_names[prop]}s de 1 a {n}. P = {chip_count}/{n} = {format_number(c)}")
+            else:
+                statements.append("De um baralho comum de 52 cartas, uma carta é retirada ao acaso. A probabilidade de ser uma carta de copas é:")
+                resolutions.append("São 13 cartas de copas em 52. P = 13/52 = 1/4 = 0,25")
+        answers = [format_number(c) for c in correct.tolist()]
+
+    elif difficulty == Difficulty.MEDIO:
+        scenarios = rng.integers(0, 3)
+        white = rng.integers(3, 7)
+        black = rng.integers(2, 6)
+        total = white + black
+        urn = (white / total) * ((white - 1) / (total - 1))
+        people = rng.integers(8, 13)
+        women = rng.integers(3, people - 2)
+        k = rng.integers(2, 5)
+        total_ways = binomials[people, k]
+        all_women = binomials[women, k]
+        correct = np.select([scenarios == 0, scenarios == 1], [urn, 6 / 36], all_women / total_ways)
+        rows = zip(scenarios.tolist(), white.tolist(), total.tolist(), people.tolist(), women.tolist(),
+                   k.tolist(), total_ways.tolist(), all_women.tolist(), correct.tolist())
+        for scenario, w, t, n, f, m, ways, favorable, c in rows:
+            if scenario == 0:
+                statements.append(f"Uma urna contém {w} bolas brancas e {t - w} bolas pretas. Duas bolas são retiradas, uma após a outra, sem reposição. A probabilidade de ambas serem brancas é:")
+                resolutions.append(f"P = ({w}/{t}) × ({w-1}/{t-1}) = {format_number(c)}")
+            elif scenario == 1:
+                statements.append("Dois dados são lançados simultaneamente. A probabilidade de a soma das faces ser igual a 7 é:")
+                resolutions.append("Casos favoráveis: (1,6), (2,5), (3,4), (4,3), (5,2), (6,1) = 6 casos. P = 6/36 = 1/6")
+            else:
+                statements.append(f"De um grupo de {n} pessoas ({f} mulheres e {n - f} homens), será formado um comitê de {m} pessoas. A probabilidade de o comitê ser formado apenas por mulheres é:")
+                resolutions.append(f"C({f},{m})/C({n},{m}) = {favorable}/{ways} = {format_number(c)}")
+        answers = [format_number(c) for c in correct.tolist()]
+
+    else:
+        n = rng.integers(5, 9)
+        k = rng.integers(2, 4)
+        p = rng.choice([0.5, 0.6, 0.7])
+        correct = binomials[n, k] * p ** k * (1 - p) ** (n - k)
+        for trials, successes, chance, c in zip(n.tolist(), k.tolist(), p.tolist(), correct.tolist()):
+            statements.append(f"Em um experimento binomial com {trials} ensaios independentes e probabilidade de sucesso {chance} em cada ensaio, a probabilidade de exatamente {successes} sucessos é:")
+            resolutions.append(f"P(X={successes}) = C({trials},{successes}) × {chance}^{successes} × {1-chance}^{trials-successes} = {format_number(c)}")
+        answers = [format_number(round(c, 4)) for c in correct.tolist()]
+
+    distractors = _distractors(rng, correct, difficulty, format_number)
+    return _assemble(rng, seeds, 5, topic, difficulty, statements, resolutions, answers, distractors)
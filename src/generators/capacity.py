@@ -0,0 +1,46 @@
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass
+from typing import Hashable, Optional, Sequence
+
+from ..models.curriculum import Difficulty
+
+
+class CapacityExhaustedError(ValueError):
+    pass
+
+
+@dataclass
+class CapacityEstimate:
+    topic_id: str
+    difficulty: Difficulty
+    capacity: Optional[int]
+    declared: bool = False
+    sample_size: int = 0
+
+    @property
+    def bounded(self) -> bool:
+        return self.capacity is not None
+
+
+def estimate_distinct(keys: Sequence[Hashable]) -> Optional[int]:
+    counts = Counter(keys)
+    distinct = len(counts)
+    singletons = sum(1 for c in counts.values() if c == 1)
+    doubletons = sum(1 for c in counts.values() if c == 2)
+    if singletons == distinct:
+        # No repeats at all in the sample: the space is too large for the
+        # sample to say anything, so treat it as unbounded.
+        return None
+    if doubletons:
+        return round(distinct + singletons * singletons / (2 * doubletons))
+    return round(distinct + singletons * (singletons - 1) / 2)
+
+
+def remaining_capacity(capacity: Optional[int], taken: Sequence[bool]) -> Optional[int]:
+    if capacity is None:
+        return None
+    if not taken:
+        return capacity
+    used_fraction = sum(1 for t in taken if t) / len(taken)
+    return max(0, int(capacity * (1 - used_fraction)))
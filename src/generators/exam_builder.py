@@ -0,0 +1,307 @@
+from __future__ import annotations
+import glob
+import json
+import os
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ..models.curriculum import Difficulty
+from ..models.question import Exam, Question
+
+
+CellKey = Tuple[str, Difficulty]
+
+DEFAULT_BANK_DIR = os.path.join("src", "output", "bank")
+
+DEFAULT_DIFFICULTY_MIX: Dict[Difficulty, float] = {
+    Difficulty.FACIL: 0.4,
+    Difficulty.MEDIO: 0.4,
+    Difficulty.DIFICIL: 0.2,
+}
+
+
+def read_questions(path: str) -> Iterator[Question]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield Question.from_dict(json.loads(line))
+
+
+@dataclass
+class ExamConstraints:
+    total: int = 60
+    # Relative weights; an empty dict weighs every topic in the bank equally.
+    topic_weights: Dict[str, float] = field(default_factory=dict)
+    difficulty_mix: Dict[Difficulty, float] = field(default_factory=lambda: dict(DEFAULT_DIFFICULTY_MIX))
+    # Longest allowed run of consecutive questions with the same correct
+    # letter; None disables the check.
+    max_letter_run: Optional[int] = 1
+    excluded_hashes: Set[str] = field(default_factory=set)
+    seed: int = 0
+
+    def validate(self):
+        if self.total <= 0:
+            raise ValueError("Exam total must be positive")
+        if any(w < 0 for w in self.topic_weights.values()) or any(w < 0 for w in self.difficulty_mix.values()):
+            raise ValueError("Weights must not be negative")
+        if self.topic_weights and not any(self.topic_weights.values()):
+            raise ValueError("At least one topic weight must be positive")
+        if not any(self.difficulty_mix.values()):
+            raise ValueError("At least one difficulty weight must be positive")
+        if self.max_letter_run is not None and self.max_letter_run < 1:
+            raise ValueError("max_letter_run must be at least 1")
+
+
+class QuestionBank:
+    def __init__(self, questions: Iterable[Question] = ()):
+        self._cells: Dict[CellKey, List[Question]] = {}
+        self._by_hash: Dict[str, CellKey] = {}
+        self.extend(questions)
+
+    @classmethod
+    def from_directory(cls, path: str) -> QuestionBank:
+        # Layout written by `main.py generate`: volume_XX/topic_T.jsonl.
+        files = sorted(glob.glob(os.path.join(path, "volume_*", "topic_*.jsonl")))
+        return cls(q for file in files for q in read_questions(file))
+
+    def extend(self, questions: Iterable[Question]):
+        for question in questions:
+            if question.hash_signature in self._by_hash:
+                continue
+            key = (question.topic_id, question.difficulty)
+            self._by_hash[question.hash_signature] = key
+            self._cells.setdefault(key, []).append(question)
+
+    def __len__(self) -> int:
+        return len(self._by_hash)
+
+    def topics(self) -> List[str]:
+        return sorted({topic_id for topic_id, _ in self._cells}, key=_topic_order)
+
+    def cell(self, topic_id: str, difficulty: Difficulty) -> List[Question]:
+        return self._cells.get((topic_id, difficulty), [])
+
+    def cell_of(self, digest: str) -> Optional[CellKey]:
+        return self._by_hash.get(digest)
+
+
+def _topic_order(topic_id: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in topic_id.split('.'))
+
+
+def apportion(total: int, weights: Dict[Hashable, float], capacity: Dict[Hashable, int]) -> Dict[Hashable, int]:
+    # Largest remainder, capped by what each key can supply; whatever a
+    # capped key cannot take is shared out again among the others.
+    result = {key: 0 for key in weights}
+    active = [key for key, weight in weights.items() if weight > 0 and capacity.get(key, 0) > 0]
+    remaining = total
+    while remaining and active:
+        weight_sum = sum(weights[key] for key in active)
+        shares = {key: remaining * weights[key] / weight_sum for key in active}
+        grant = {key: min(int(shares[key]), capacity[key] - result[key]) for key in active}
+        leftover = remaining - sum(grant.values())
+        for key in sorted(active, key=lambda k: shares[k] - int(shares[k]), reverse=True):
+            if not leftover:
+                break
+            if grant[key] < capacity[key] - result[key]:
+                grant[key] += 1
+                leftover -= 1
+        granted = sum(grant.values())
+        if not granted:
+            break
+        for key, count in grant.items():
+            result[key] += count
+        remaining -= granted
+        active = [key for key in active if result[key] < capacity[key]]
+    if remaining:
+        raise ValueError(f"The bank only has {total - remaining} of the {total} questions these weights can draw on")
+    return result
+
+
+class ExamBuilder:
+    # Random candidates looked at per pick; the one whose correct letter is
+    # least used so far wins, which keeps the answer key balanced.
+    CANDIDATES_PER_PICK = 3
+
+    def __init__(self, bank: QuestionBank):
+        self.bank = bank
+
+    def build(self, constraints: ExamConstraints, title: str = "Simulado") -> Exam:
+        constraints.validate()
+        rng = random.Random(constraints.seed)
+        topic_weights = constraints.topic_weights or {topic_id: 1.0 for topic_id in self.bank.topics()}
+        difficulties = [d for d in Difficulty if constraints.difficulty_mix.get(d, 0) > 0]
+
+        excluded: Dict[CellKey, Set[str]] = {}
+        for digest in constraints.excluded_hashes:
+            key = self.bank.cell_of(digest)
+            if key is not None:
+                excluded.setdefault(key, set()).add(digest)
+        available = {
+            (topic_id, d): len(self.bank.cell(topic_id, d)) - len(excluded.get((topic_id, d), ()))
+            for topic_id in topic_weights for d in difficulties
+        }
+
+        topic_quota = apportion(
+            constraints.total, topic_weights,
+            {t: sum(available[(t, d)] for d in difficulties) for t in topic_weights}
+        )
+        difficulty_quota = apportion(
+            constraints.total, {d: constraints.difficulty_mix[d] for d in difficulties},
+            {d: sum(available[(t, d)] for t in topic_weights) for d in difficulties}
+        )
+        cells = self._fill_cells(topic_quota, difficulty_quota, available, constraints.total)
+
+        letters: Dict[str, int] = {}
+        picked: List[Question] = []
+        for difficulty in difficulties:
+            block: List[Question] = []
+            for topic_id in sorted(topic_weights, key=_topic_order):
+                count = cells.get((topic_id, difficulty), 0)
+                if count:
+                    block.extend(self._pick(
+                        self.bank.cell(topic_id, difficulty), count,
+                        excluded.get((topic_id, difficulty), set()), letters, rng
+                    ))
+            rng.shuffle(block)
+            picked.extend(block)
+        if constraints.max_letter_run is not None:
+            _repair_letter_runs(picked, constraints.max_letter_run)
+        return Exam(title=title, questions=picked)
+
+    def _fill_cells(
+        self,
+        topic_quota: Dict[str, int],
+        difficulty_quota: Dict[Difficulty, int],
+        available: Dict[CellKey, int],
+        total: int
+    ) -> Dict[CellKey, int]:
+        # Start from the proportional split, then repair the rounding gaps
+        # with augmenting paths topic -> difficulty (-> topic -> ...), which
+        # is exact max-flow on a graph of a few hundred edges.
+        cells = {
+            key: min(available[key], topic_quota[key[0]] * difficulty_quota[key[1]] // total)
+            for key in available
+        }
+        row_gap = {t: q - sum(cells[(t, d)] for d in difficulty_quota) for t, q in topic_quota.items()}
+        col_gap = {d: q - sum(cells[(t, d)] for t in topic_quota) for d, q in difficulty_quota.items()}
+        while any(gap > 0 for gap in row_gap.values()):
+            path = self._augmenting_path(row_gap, col_gap, cells, available)
+            if path is None:
+                raise ValueError("The bank cannot meet the topic weights and the difficulty mix at the same time")
+            for i, (topic_id, difficulty) in enumerate(path):
+                # Even steps move one question into a cell, odd steps move it
+                # back out, so every intermediate row and column stays balanced.
+                cells[(topic_id, difficulty)] += 1 if i % 2 == 0 else -1
+            row_gap[path[0][0]] -= 1
+            col_gap[path[-1][1]] -= 1
+        return cells
+
+    @staticmethod
+    def _augmenting_path(
+        row_gap: Dict[str, int],
+        col_gap: Dict[Difficulty, int],
+        cells: Dict[CellKey, int],
+        available: Dict[CellKey, int]
+    ) -> Optional[List[CellKey]]:
+        parents: Dict[Hashable, Optional[Tuple[Hashable, CellKey]]] = {}
+        queue: Deque[Hashable] = deque()
+        for topic_id, gap in row_gap.items():
+            if gap > 0:
+                parents[topic_id] = None
+                queue.append(topic_id)
+        while queue:
+            node = queue.popleft()
+            if isinstance(node, str):
+                for difficulty in col_gap:
+                    key = (node, difficulty)
+                    if difficulty not in parents and cells[key] < available[key]:
+                        parents[difficulty] = (node, key)
+                        if col_gap[difficulty] > 0:
+                            path = []
+                            step: Hashable = difficulty
+                            while parents[step] is not None:
+                                previous, cell = parents[step]
+                                path.append(cell)
+                                step = previous
+                            return path[::-1]
+                        queue.append(difficulty)
+            else:
+                for topic_id in row_gap:
+                    key = (topic_id, node)
+                    if topic_id not in parents and cells[key] > 0:
+                        parents[topic_id] = (node, key)
+                        queue.append(topic_id)
+        return None
+
+    def _pick(
+        self,
+        cell: List[Question],
+        count: int,
+        excluded: Set[str],
+        letters: Dict[str, int],
+        rng: random.Random
+    ) -> List[Question]:
+        if (count + len(excluded)) * 2 > len(cell):
+            # Dense draw: scanning the cell once is cheaper than rejections.
+            pool = [q for q in cell if q.hash_signature not in excluded]
+            rng.shuffle(pool)
+
+            def draw() -> int:
+                return len(pool) - 1 - rng.randrange(min(len(pool), self.CANDIDATES_PER_PICK))
+            take = pool.pop
+        else:
+            used: Set[int] = set()
+
+            def draw() -> int:
+                while True:
+                    index = rng.randrange(len(cell))
+                    if index not in used and cell[index].hash_signature not in excluded:
+                        return index
+
+            def take(index: int) -> Question:
+                used.add(index)
+                return cell[index]
+            pool = cell
+
+        picked = []
+        for _ in range(count):
+            candidates = {draw() for _ in range(self.CANDIDATES_PER_PICK)}
+            best = take(min(candidates, key=lambda i: (letters.get(pool[i].correct_answer, 0), i)))
+            letters[best.correct_answer] = letters.get(best.correct_answer, 0) + 1
+            picked.append(best)
+        return picked
+
+
+def _run_ok(questions: List[Question], index: int, max_run: int) -> bool:
+    letter = questions[index].correct_answer
+    start = index
+    while start > 0 and questions[start - 1].correct_answer == letter:
+        start -= 1
+    end = index
+    while end + 1 < len(questions) and questions[end + 1].correct_answer == letter:
+        end += 1
+    return end - start + 1 <= max_run
+
+
+def _repair_letter_runs(questions: List[Question], max_run: int):
+    # Left to right, a question that extends a run too far is swapped with a
+    # later one of another letter, preferring the same difficulty so the
+    # easy-to-hard order survives; only the tail ever looks backwards.
+    for i in range(max_run, len(questions)):
+        letter = questions[i].correct_answer
+        if all(questions[i - k].correct_answer == letter for k in range(1, max_run + 1)):
+            later = [j for j in range(i + 1, len(questions)) if questions[j].correct_answer != letter]
+            later.sort(key=lambda j: questions[j].difficulty != questions[i].difficulty)
+            if later:
+                j = later[0]
+                questions[i], questions[j] = questions[j], questions[i]
+                continue
+            for j in range(i - max_run - 1, -1, -1):
+                questions[i], questions[j] = questions[j], questions[i]
+                if _run_ok(questions, i, max_run) and _run_ok(questions, j, max_run):
+                    break
+                questions[i], questions[j] = questions[j], questions[i]
+            else:
+                raise ValueError("Answer letters are too unbalanced to avoid repeated runs")
@@ -0,0 +1,78 @@
+from __future__ import annotations
+import importlib
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from ..models.curriculum import Difficulty
+from .parameter_space import ParameterSpace
+
+
+@dataclass
+class GeneratorSpec:
+    topic_id: str
+    func: Callable
+    difficulties: Tuple[Difficulty, ...] = tuple(Difficulty)
+    capacity: Dict[Difficulty, int] = field(default_factory=dict)
+    parameter_spaces: Dict[Difficulty, ParameterSpace] = field(default_factory=dict)
+    cost: float = 1.0
+    batch: Optional[Callable] = None
+    # Part of every question id; bump it whenever a change makes the same
+    # seed produce a different question, so stale ids fail loudly.
+    version: int = 1
+
+    def supports(self, difficulty: Difficulty) -> bool:
+        return difficulty in self.difficulties
+
+
+_GENERATORS: Dict[str, GeneratorSpec] = {}
+_LAZY_MODULES: Dict[str, str] = {
+    "11.3": ".topics.financial",
+    "11.4": ".topics.financial",
+    "11.5": ".topics.financial",
+}
+_load_lock = threading.Lock()
+
+
+def register_generator(
+    topic_id: str,
+    difficulties: Optional[Iterable[Difficulty]] = None,
+    capacity: Optional[Dict[Difficulty, int]] = None,
+    parameter_spaces: Optional[Dict[Difficulty, ParameterSpace]] = None,
+    cost: float = 1.0,
+    batch: Optional[Callable] = None,
+    version: int = 1
+) -> Callable[[Callable], Callable]:
+    def decorator(func: Callable) -> Callable:
+        if topic_id in _GENERATORS and _GENERATORS[topic_id].func is not func:
+            raise ValueError(f"Generator for topic {topic_id} already registered")
+        _GENERATORS[topic_id] = GeneratorSpec(
+            topic_id=topic_id,
+            func=func,
+            difficulties=tuple(difficulties) if difficulties is not None else tuple(Difficulty),
+            capacity=dict(capacity or {}),
+            parameter_spaces=dict(parameter_spaces or {}),
+            cost=cost,
+            batch=batch,
+            version=version
+        )
+        return func
+    return decorator
+
+
+def register_lazy_module(topic_id: str, module: str):
+    _LAZY_MODULES[topic_id] = module
+
+
+def get_generator_spec(topic_id: str) -> Optional[GeneratorSpec]:
+    spec = _GENERATORS.get(topic_id)
+    if spec is None and topic_id in _LAZY_MODULES:
+        with _load_lock:
+            if topic_id not in _GENERATORS:
+                importlib.import_module(_LAZY_MODULES[topic_id], package=__package__)
+        spec = _GENERATORS.get(topic_id)
+    return spec
+
+
+def registered_topics() -> Tuple[str, ...]:
+    return tuple(sorted(set(_GENERATORS) | set(_LAZY_MODULES)))
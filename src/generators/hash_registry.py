@@ -0,0 +1,1079 @@
+from __future__ import annotations
+import atexit
+import hashlib
+import json
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import Enum
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from .capacity import remaining_capacity as estimate_remaining
+from .parameter_space import ParameterCursors
+
+
+class Durability(Enum):
+    ALWAYS = "always"
+    INTERVAL = "interval"
+    SHUTDOWN = "shutdown"
+
+
+class DigestStore:
+    MAGIC = b"QHDS"
+    HEADER_SIZE = 8
+
+    def __init__(self, path: str, width: int):
+        self.path = path
+        self.width = width
+        self.count = 0
+        self._file: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self.open()
+
+    def open(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            self._file = open(self.path, 'rb')
+            header = self._file.read(self.HEADER_SIZE)
+            if len(header) != self.HEADER_SIZE or header[:4] != self.MAGIC:
+                self.close()
+                return
+            self.width = header[4]
+            size = os.fstat(self._file.fileno()).st_size
+            self.count = (size - self.HEADER_SIZE) // self.width
+            if self.count:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, ValueError):
+            self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.count = 0
+
+    def _record(self, index: int) -> bytes:
+        offset = self.HEADER_SIZE + index * self.width
+        return self._map[offset:offset + self.width]
+
+    def _bisect(self, digest: bytes) -> int:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __contains__(self, digest: bytes) -> bool:
+        if not self.count:
+            return False
+        index = self._bisect(digest)
+        return index < self.count and self._record(index) == digest
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self._record(index)
+
+    def write_merged(self, path: str, delta: Iterable[bytes]):
+        # Copies the untouched runs of the sorted snapshot verbatim and only
+        # bisects for the (few) new digests, so a merge is one sequential
+        # pass over the file instead of a full re-sort.
+        with open(path, 'wb') as out:
+            out.write(self.MAGIC + bytes([self.width]) + b"\0" * (self.HEADER_SIZE - 5))
+            start = 0
+            for digest in sorted(delta):
+                index = self._bisect(digest) if self.count else 0
+                if index > start:
+                    out.write(self._map[self.HEADER_SIZE + start * self.width:self.HEADER_SIZE + index * self.width])
+                    start = index
+                if index < self.count and self._record(index) == digest:
+                    continue
+                out.write(digest)
+            if start < self.count:
+                out.write(self._map[self.HEADER_SIZE + start * self.width:])
+            out.flush()
+            os.fsync(out.fileno())
+
+
+class BloomFilter:
+    MAGIC = b"QHBF"
+    HEADER = struct.Struct("<4sQIQd")
+
+    def __init__(self, capacity: int, fp_rate: float, count: int = 0, bits: Optional[bytearray] = None):
+        self.capacity = max(capacity, 1)
+        self.fp_rate = fp_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = count
+        self._bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        half = len(digest) // 2
+        h1 = int.from_bytes(digest[:half], 'big')
+        h2 = int.from_bytes(digest[half:], 'big') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: bytes):
+        for pos in self._positions(digest):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        bits = self._bits
+        for pos in self._positions(digest):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def save(self, path: str, covers: int):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.capacity, self.hash_count, covers, self.fp_rate))
+            f.write(self._bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional[Tuple['BloomFilter', int]]:
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(cls.HEADER.size)
+                magic, capacity, _, covers, fp_rate = cls.HEADER.unpack(header)
+                bits = bytearray(f.read())
+        except (IOError, struct.error):
+            return None
+        if magic != cls.MAGIC:
+            return None
+        bloom = cls(capacity, fp_rate, covers, bits)
+        if len(bits) != (bloom.size + 7) // 8:
+            return None
+        return bloom, covers
+
+
+class UniqueHashRegistry:
+    CACHE_DIR = "src/output/.cache"
+    BACKEND = "file"
+    DIGEST_SIZE = 8
+    COMPACT_MIN_ENTRIES = 1000
+    COMPACT_MAX_ENTRIES = 100000
+    DURABILITY = Durability.INTERVAL
+    FLUSH_INTERVAL_MS = 500
+    FLUSH_MAX_PENDING = 256
+    BLOOM_FP_RATE = 0.01
+    BLOOM_MIN_CAPACITY = 100000
+    WINDOW_SIZE: Optional[int] = None
+    WINDOW_DAYS: Optional[float] = None
+    MAX_RESIDENT_REGISTRIES = 64
+    # Worker processes load the files another process is appending to; they
+    # must never rewrite them (compaction replaces the inode under the
+    # writer's open handle) nor persist anything of their own.
+    READ_ONLY = False
+    _SETTINGS = (
+        "CACHE_DIR", "BACKEND", "DIGEST_SIZE", "WINDOW_SIZE", "WINDOW_DAYS",
+        "DURABILITY", "FLUSH_INTERVAL_MS", "FLUSH_MAX_PENDING", "READ_ONLY",
+    )
+    _instances: 'OrderedDict[str, UniqueHashRegistry]' = OrderedDict()
+    _users = 0
+    _flusher: Optional[threading.Thread] = None
+    _flush_wakeup = threading.Event()
+    _class_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, volume_id: Optional[int] = None, topic_id: Optional[str] = None) -> 'UniqueHashRegistry':
+        return cls._acquire(volume_id, topic_id, lease=False)
+
+    @classmethod
+    @contextmanager
+    def lease(cls, volume_id: Optional[int] = None, topic_id: Optional[str] = None) -> Iterator['UniqueHashRegistry']:
+        # A leased instance is never evicted, so commits made while it is in
+        # use always reach the instance flush_all() writes out.
+        instance = cls._acquire(volume_id, topic_id, lease=True)
+        try:
+            yield instance
+        finally:
+            with cls._class_lock:
+                instance._users -= 1
+                evicted = cls._evict_idle()
+            for registry in evicted:
+                registry.close()
+
+    @classmethod
+    def _acquire(cls, volume_id: Optional[int], topic_id: Optional[str], lease: bool) -> 'UniqueHashRegistry':
+        key = cls._scope_key(volume_id, topic_id)
+        if cls.BACKEND == "sqlite":
+            registry_cls = SQLiteHashRegistry
+        elif cls.WINDOW_SIZE or cls.WINDOW_DAYS:
+            registry_cls = WindowedHashRegistry
+        else:
+            registry_cls = UniqueHashRegistry
+        with cls._class_lock:
+            if key in cls._instances:
+                cls._instances.move_to_end(key)
+            else:
+                cls._instances[key] = registry_cls(volume_id, topic_id)
+            instance = cls._instances[key]
+            if lease:
+                instance._users += 1
+            evicted = cls._evict_idle()
+        for registry in evicted:
+            registry.close()
+        cls._ensure_flusher()
+        return instance
+
+    @classmethod
+    def _evict_idle(cls) -> List['UniqueHashRegistry']:
+        # Oldest first, skipping leased instances; while every resident
+        # registry is in use the cap is temporarily exceeded.
+        excess = len(cls._instances) - cls.MAX_RESIDENT_REGISTRIES if cls.MAX_RESIDENT_REGISTRIES else 0
+        evicted = []
+        for key in list(cls._instances):
+            if excess <= 0:
+                break
+            if not cls._instances[key]._users:
+                evicted.append(cls._instances.pop(key))
+                excess -= 1
+        return evicted
+
+    @staticmethod
+    def _scope_key(volume_id: Optional[int], topic_id: Optional[str]) -> str:
+        return f"v{volume_id}_t{topic_id}" if volume_id and topic_id else f"v{volume_id}" if volume_id else "global"
+
+    @classmethod
+    def configure_backend(cls, backend: str):
+        if backend not in ("file", "sqlite"):
+            raise ValueError(f"Unknown hash registry backend: {backend}")
+        cls.clear_all_instances()
+        UniqueHashRegistry.BACKEND = backend
+
+    @classmethod
+    def configure_window(cls, size: Optional[int] = None, days: Optional[float] = None):
+        cls.clear_all_instances()
+        UniqueHashRegistry.WINDOW_SIZE = size
+        UniqueHashRegistry.WINDOW_DAYS = days
+
+    @classmethod
+    def configure_from_env(cls, environ: Optional[Dict[str, str]] = None):
+        environ = os.environ if environ is None else environ
+        if environ.get('HASH_REGISTRY_CACHE_DIR'):
+            cls.clear_all_instances()
+            UniqueHashRegistry.CACHE_DIR = environ['HASH_REGISTRY_CACHE_DIR']
+        cls.configure_backend(environ.get('HASH_REGISTRY_BACKEND', 'file'))
+        cls.configure_window(
+            size=int(environ['HASH_REGISTRY_WINDOW_SIZE']) if environ.get('HASH_REGISTRY_WINDOW_SIZE') else None,
+            days=float(environ['HASH_REGISTRY_WINDOW_DAYS']) if environ.get('HASH_REGISTRY_WINDOW_DAYS') else None
+        )
+        cls.configure_durability(
+            Durability(environ.get('HASH_REGISTRY_DURABILITY', 'interval')),
+            interval_ms=int(environ.get('HASH_REGISTRY_FLUSH_MS', 500))
+        )
+
+    @classmethod
+    def settings(cls) -> Dict[str, object]:
+        return {name: getattr(UniqueHashRegistry, name) for name in cls._SETTINGS}
+
+    @classmethod
+    def apply_settings(cls, settings: Dict[str, object]):
+        # Used by worker processes, which do not inherit class-level
+        # configuration when they are spawned.
+        cls.clear_all_instances()
+        for name, value in settings.items():
+            if name in cls._SETTINGS:
+                setattr(UniqueHashRegistry, name, value)
+
+    @classmethod
+    def _window_cutoff(cls) -> float:
+        return time.time() - cls.WINDOW_DAYS * 86400 if cls.WINDOW_DAYS else 0.0
+
+    @classmethod
+    def configure_durability(
+        cls,
+        policy: Durability,
+        interval_ms: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        cls.flush_all()
+        cls.DURABILITY = policy
+        if interval_ms is not None:
+            cls.FLUSH_INTERVAL_MS = interval_ms
+        if max_pending is not None:
+            cls.FLUSH_MAX_PENDING = max_pending
+        cls._ensure_flusher()
+        cls._flush_wakeup.set()
+
+    @classmethod
+    def _ensure_flusher(cls):
+        if cls.DURABILITY != Durability.INTERVAL:
+            return
+        with cls._class_lock:
+            if cls._flusher is None or not cls._flusher.is_alive():
+                cls._flusher = threading.Thread(
+                    target=cls._flush_loop, name="hash-registry-flusher", daemon=True
+                )
+                cls._flusher.start()
+
+    @classmethod
+    def _flush_loop(cls):
+        while True:
+            cls._flush_wakeup.wait(cls.FLUSH_INTERVAL_MS / 1000)
+            cls._flush_wakeup.clear()
+            # The thread outlives a switch to another policy: SHUTDOWN only
+            # writes at exit and ALWAYS already wrote on every add.
+            if cls.DURABILITY == Durability.INTERVAL:
+                cls.flush_all()
+
+    @classmethod
+    def flush_all(cls):
+        with cls._class_lock:
+            instances = list(cls._instances.values())
+        for instance in instances:
+            instance.flush()
+
+    def __init__(self, volume_id: Optional[int] = None, topic_id: Optional[str] = None):
+        self._delta: Set[bytes] = set()
+        self._reserved: Set[bytes] = set()
+        self._pending: List[bytes] = []
+        self._log_entries = 0
+        self._log_handle: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self.volume_id = volume_id
+        self.topic_id = topic_id
+        self.scope = self._scope_key(volume_id, topic_id)
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        self._store = DigestStore(self._get_cache_file(), self.DIGEST_SIZE)
+        self._bloom = BloomFilter(self.BLOOM_MIN_CAPACITY, self.BLOOM_FP_RATE)
+        self._load_cache()
+
+    def _get_cache_base(self) -> str:
+        if self.volume_id and self.topic_id:
+            return os.path.join(self.CACHE_DIR, f"hashes_v{self.volume_id}_t{self.topic_id.replace('.', '_')}")
+        elif self.volume_id:
+            return os.path.join(self.CACHE_DIR, f"hashes_v{self.volume_id}")
+        return os.path.join(self.CACHE_DIR, "hashes_global")
+
+    def _get_cache_file(self) -> str:
+        return self._get_cache_base() + ".bin"
+
+    def _get_log_file(self) -> str:
+        return self._get_cache_base() + ".delta"
+
+    def _get_bloom_file(self) -> str:
+        return self._get_cache_base() + ".bloom"
+
+    def _get_legacy_files(self) -> List[str]:
+        base = self._get_cache_base()
+        return [base + ".json", base + ".log"]
+
+    def digest(self, content: str) -> bytes:
+        return hashlib.md5(content.encode()).digest()[:self.digest_width()]
+
+    def _load_cache(self):
+        self._load_bloom()
+        self._replay_log()
+        if self._load_legacy() and not self.READ_ONLY:
+            self.compact()
+            for path in self._get_legacy_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _load_bloom(self):
+        # The persisted filter is only trusted when it was written for exactly
+        # the current snapshot; anything else could yield false negatives.
+        loaded = BloomFilter.load(self._get_bloom_file())
+        if (
+            loaded is not None
+            and loaded[1] == self._store.count
+            and loaded[0].fp_rate == self.BLOOM_FP_RATE
+            and loaded[0].capacity >= self._store.count
+        ):
+            self._bloom = loaded[0]
+        else:
+            self._rebuild_bloom()
+
+    def _rebuild_bloom(self):
+        capacity = max(self.BLOOM_MIN_CAPACITY, 2 * (self._store.count + len(self._delta)))
+        bloom = BloomFilter(capacity, self.BLOOM_FP_RATE)
+        for d in self._store:
+            bloom.add(d)
+        for d in self._delta:
+            bloom.add(d)
+        self._bloom = bloom
+        self._save_bloom()
+
+    def _save_bloom(self):
+        # Extra delta digests in the saved filter only add false positives;
+        # what must hold is that it covers the whole snapshot it is tagged with.
+        if self.READ_ONLY:
+            return
+        try:
+            self._bloom.save(self._get_bloom_file(), self._store.count)
+        except IOError:
+            pass
+
+    def _load_legacy(self) -> bool:
+        json_file, log_file = self._get_legacy_files()
+        hex_hashes: List[str] = []
+        if os.path.exists(json_file):
+            try:
+                with open(json_file, 'r') as f:
+                    hex_hashes.extend(json.load(f).get('hashes', []))
+            except (json.JSONDecodeError, IOError):
+                pass
+        if os.path.exists(log_file):
+            try:
+                with open(log_file, 'r') as f:
+                    hex_hashes.extend(line.strip() for line in f)
+            except IOError:
+                pass
+        migrated = False
+        for h in hex_hashes:
+            try:
+                d = bytes.fromhex(h)[:self._store.width]
+            except ValueError:
+                continue
+            if len(d) == self._store.width and d not in self._store:
+                self._delta.add(d)
+                self._bloom.add(d)
+                self._pending.append(d)
+            migrated = True
+        return migrated or any(os.path.exists(p) for p in self._get_legacy_files())
+
+    def _replay_log(self):
+        log_file = self._get_log_file()
+        if not os.path.exists(log_file):
+            return
+        try:
+            with open(log_file, 'rb') as f:
+                data = f.read()
+        except IOError:
+            return
+
+        # A crash mid-append leaves a torn last record; drop it so the next
+        # append stays aligned to the record width.
+        width = self._store.width
+        valid_end = len(data) - len(data) % width
+        if valid_end < len(data) and not self.READ_ONLY:
+            try:
+                with open(log_file, 'r+b') as f:
+                    f.truncate(valid_end)
+            except IOError:
+                pass
+
+        for offset in range(0, valid_end, width):
+            d = data[offset:offset + width]
+            if d not in self._store:
+                self._delta.add(d)
+                self._bloom.add(d)
+            self._log_entries += 1
+
+    def flush(self):
+        if self.READ_ONLY:
+            return
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                if self._log_handle is None:
+                    self._log_handle = open(self._get_log_file(), 'ab')
+                self._log_handle.write(b"".join(batch))
+                self._log_handle.flush()
+                if self.DURABILITY == Durability.ALWAYS:
+                    os.fsync(self._log_handle.fileno())
+            except IOError:
+                with self._lock:
+                    self._pending = batch + self._pending
+                return
+            self._log_entries += len(batch)
+            if self._needs_compaction():
+                self._compact()
+
+    def _needs_compaction(self) -> bool:
+        threshold = min(self.COMPACT_MAX_ENTRIES, self._store.count // 2)
+        return self._log_entries >= max(self.COMPACT_MIN_ENTRIES, threshold)
+
+    def _close_log(self):
+        if self._log_handle is not None:
+            try:
+                self._log_handle.close()
+            except IOError:
+                pass
+            self._log_handle = None
+
+    def compact(self):
+        if self.READ_ONLY:
+            return
+        self.flush()
+        with self._io_lock:
+            self._compact()
+
+    def _compact(self):
+        cache_file = self._get_cache_file()
+        tmp_file = cache_file + ".tmp"
+        with self._lock:
+            merged = set(self._delta)
+        try:
+            self._store.write_merged(tmp_file, merged)
+        except IOError:
+            return
+
+        with self._lock:
+            self._store.close()
+            try:
+                os.replace(tmp_file, cache_file)
+            finally:
+                self._store.open()
+            self._delta -= merged
+            rebuild = self._store.count + len(self._delta) > self._bloom.capacity
+            if rebuild:
+                self._rebuild_bloom()
+        if not rebuild:
+            self._save_bloom()
+
+        # The snapshot already holds every logged digest, so a crash before
+        # the truncation below only causes an idempotent replay.
+        self._close_log()
+        try:
+            open(self._get_log_file(), 'wb').close()
+        except IOError:
+            pass
+        self._log_entries = 0
+
+    def _contains(self, d: bytes) -> bool:
+        if d not in self._bloom:
+            return False
+        return d in self._delta or d in self._store
+
+    def _insert(self, d: bytes):
+        self._delta.add(d)
+        self._bloom.add(d)
+        self._pending.append(d)
+
+    def _add(self, d: bytes) -> bool:
+        with self._lock:
+            if d in self._reserved or self._contains(d):
+                return False
+            self._insert(d)
+            pending = len(self._pending)
+        self._schedule_flush(pending)
+        return True
+
+    def _schedule_flush(self, pending: int):
+        if self.DURABILITY == Durability.ALWAYS:
+            self.flush()
+        elif self.DURABILITY == Durability.INTERVAL and pending >= self.FLUSH_MAX_PENDING:
+            self._flush_wakeup.set()
+
+    def contains(self, content: str) -> bool:
+        return self.contains_digest(self.digest(content))
+
+    def contains_digest(self, value: Union[str, bytes]) -> bool:
+        d = self._to_digest(value)
+        with self._lock:
+            return d in self._reserved or self._contains(d)
+
+    def remaining_capacity(self, capacity: Optional[int], sample_digests: Sequence[Union[str, bytes]]) -> Optional[int]:
+        # The share of a fresh sample that is already taken estimates the
+        # share of the whole parameter space that has been consumed.
+        return estimate_remaining(capacity, [self.contains_digest(d) for d in sample_digests])
+
+    def _to_digest(self, value: Union[str, bytes]) -> bytes:
+        if isinstance(value, str):
+            value = bytes.fromhex(value)
+        return value[:self.digest_width()]
+
+    def reserve(self, digests: Sequence[Union[str, bytes]]) -> List[bool]:
+        keys = [self._to_digest(v) for v in digests]
+        results = []
+        with self._lock:
+            for d in keys:
+                accepted = d not in self._reserved and not self._contains(d)
+                if accepted:
+                    self._reserved.add(d)
+                results.append(accepted)
+        return results
+
+    def commit(self, digests: Sequence[Union[str, bytes]]):
+        keys = [self._to_digest(v) for v in digests]
+        with self._lock:
+            for d in keys:
+                if d in self._reserved:
+                    self._reserved.discard(d)
+                    self._insert(d)
+            pending = len(self._pending)
+        self._schedule_flush(pending)
+
+    def abort(self, digests: Sequence[Union[str, bytes]]):
+        keys = [self._to_digest(v) for v in digests]
+        with self._lock:
+            self._reserved.difference_update(keys)
+
+    def is_unique(self, content: str) -> bool:
+        return self._add(self.digest(content))
+
+    def register(self, content: str) -> str:
+        h = hashlib.md5(content.encode()).hexdigest()
+        self._add(bytes.fromhex(h)[:self.digest_width()])
+        return h
+
+    def digest_width(self) -> int:
+        return self._store.width
+
+    def register_many(self, contents: Iterable[str]) -> List[str]:
+        return [self.register(content) for content in contents]
+
+    def count(self) -> int:
+        return self._store.count + len(self._delta)
+
+    def clear(self):
+        with self._io_lock:
+            with self._lock:
+                self._delta.clear()
+                self._reserved.clear()
+                self._pending.clear()
+                self._store.close()
+                self._bloom = BloomFilter(self.BLOOM_MIN_CAPACITY, self.BLOOM_FP_RATE)
+            self._close_log()
+            self._log_entries = 0
+            files = [self._get_cache_file(), self._get_log_file(), self._get_bloom_file()]
+            for path in files + self._get_legacy_files():
+                if os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except IOError:
+                        pass
+        self._reset_cursors()
+
+    def _reset_cursors(self):
+        # Parameter cursors skip draws the registry already holds; once the
+        # scope forgets them, the walks have to start over too.
+        if self.volume_id and self.topic_id:
+            prefix = f"{self.scope}_"
+        elif self.volume_id:
+            prefix = f"{self.scope}_t"
+        else:
+            prefix = ""
+        cursors = ParameterCursors.get_instance(self.CACHE_DIR)
+        cursors.reset(prefix)
+        cursors.save()
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            self._close_log()
+            with self._lock:
+                self._store.close()
+
+    @classmethod
+    def clear_all_instances(cls):
+        with cls._class_lock:
+            instances = list(cls._instances.values())
+            cls._instances.clear()
+        for instance in instances:
+            instance.close()
+
+
+
+class WindowedHashRegistry(UniqueHashRegistry):
+    TIMESTAMP = struct.Struct("<d")
+
+    def __init__(self, volume_id: Optional[int] = None, topic_id: Optional[str] = None):
+        self._entries: 'OrderedDict[bytes, float]' = OrderedDict()
+        self._reserved: Set[bytes] = set()
+        self._pending: List[bytes] = []
+        self._log_entries = 0
+        self._log_handle: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self.volume_id = volume_id
+        self.topic_id = topic_id
+        self.scope = self._scope_key(volume_id, topic_id)
+        self._width = self.DIGEST_SIZE
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        self._load_cache()
+
+    def _get_log_file(self) -> str:
+        return self._get_cache_base() + ".window"
+
+    def digest_width(self) -> int:
+        return self._width
+
+    def _load_cache(self):
+        log_file = self._get_log_file()
+        if not os.path.exists(log_file):
+            return
+        try:
+            with open(log_file, 'rb') as f:
+                data = f.read()
+        except IOError:
+            return
+        record = self._width + self.TIMESTAMP.size
+        for offset in range(0, len(data) - len(data) % record, record):
+            d = data[offset:offset + self._width]
+            (ts,) = self.TIMESTAMP.unpack_from(data, offset + self._width)
+            self._entries.pop(d, None)
+            self._entries[d] = ts
+            self._log_entries += 1
+        self._evict()
+        # Rewriting on load both drops a torn tail and expired entries.
+        if not self.READ_ONLY:
+            with self._io_lock:
+                self._compact()
+
+    def _evict(self):
+        cutoff = self._window_cutoff()
+        entries = self._entries
+        while entries:
+            d, ts = next(iter(entries.items()))
+            if ts >= cutoff and not (self.WINDOW_SIZE and len(entries) > self.WINDOW_SIZE):
+                break
+            entries.popitem(last=False)
+
+    def _needs_compaction(self) -> bool:
+        return self._log_entries >= max(self.COMPACT_MIN_ENTRIES, 2 * len(self._entries))
+
+    def _compact(self):
+        log_file = self._get_log_file()
+        tmp_file = log_file + ".tmp"
+        with self._lock:
+            self._evict()
+            records = [d + self.TIMESTAMP.pack(ts) for d, ts in self._entries.items()]
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(b"".join(records))
+                f.flush()
+                os.fsync(f.fileno())
+            self._close_log()
+            os.replace(tmp_file, log_file)
+        except IOError:
+            return
+        self._log_entries = len(records)
+
+    def _contains(self, d: bytes) -> bool:
+        ts = self._entries.get(d)
+        return ts is not None and ts >= self._window_cutoff()
+
+    def _insert(self, d: bytes):
+        now = time.time()
+        self._entries.pop(d, None)
+        self._entries[d] = now
+        self._evict()
+        self._pending.append(d + self.TIMESTAMP.pack(now))
+
+    def count(self) -> int:
+        with self._lock:
+            self._evict()
+            return len(self._entries)
+
+    def clear(self):
+        with self._io_lock:
+            with self._lock:
+                self._entries.clear()
+                self._reserved.clear()
+                self._pending.clear()
+            self._close_log()
+            self._log_entries = 0
+            if os.path.exists(self._get_log_file()):
+                try:
+                    os.remove(self._get_log_file())
+                except IOError:
+                    pass
+        self._reset_cursors()
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            self._close_log()
+
+
+class SQLiteHashRegistry(UniqueHashRegistry):
+    DB_NAME = "hashes.sqlite3"
+    BUSY_TIMEOUT_MS = 5000
+    PRUNE_EVERY = 100
+    RESERVATION_TTL = 600
+    BATCH_SIZE = 500
+    _local = threading.local()
+
+    def __init__(self, volume_id: Optional[int] = None, topic_id: Optional[str] = None):
+        self.volume_id = volume_id
+        self.topic_id = topic_id
+        self.scope = self._scope_key(volume_id, topic_id)
+        self._width = self.DIGEST_SIZE
+        self._inserts_since_prune = 0
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        self._import_file_cache()
+
+    @classmethod
+    def _connection(cls) -> sqlite3.Connection:
+        path = os.path.join(cls.CACHE_DIR, cls.DB_NAME)
+        conn = getattr(cls._local, "conn", None)
+        if conn is None or getattr(cls._local, "path", None) != path:
+            conn = sqlite3.connect(path, timeout=cls.BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                "scope TEXT NOT NULL, digest BLOB NOT NULL, created_at REAL NOT NULL, "
+                "reserved INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(hashes)")}
+            if "reserved" not in columns:
+                conn.execute("ALTER TABLE hashes ADD COLUMN reserved INTEGER NOT NULL DEFAULT 0")
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_hashes_scope_digest ON hashes(scope, digest)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_hashes_scope_created ON hashes(scope, created_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS migrations ("
+                "scope TEXT PRIMARY KEY, width INTEGER NOT NULL, migrated_at REAL NOT NULL)"
+            )
+            cls._local.conn = conn
+            cls._local.path = path
+        synchronous = {
+            Durability.ALWAYS: "FULL",
+            Durability.INTERVAL: "NORMAL",
+            Durability.SHUTDOWN: "OFF",
+        }[cls.DURABILITY]
+        if getattr(cls._local, "synchronous", None) != synchronous:
+            conn.execute(f"PRAGMA synchronous={synchronous}")
+            cls._local.synchronous = synchronous
+        return conn
+
+    def _import_file_cache(self):
+        # One-time migration of digests written by the file backend for this
+        # scope. It is recorded per scope, so clearing or pruning the scope
+        # later never brings the old file digests back.
+        conn = self._connection()
+        row = conn.execute("SELECT width FROM migrations WHERE scope = ?", (self.scope,)).fetchone()
+        if row is not None:
+            self._width = row[0]
+            return
+        store = DigestStore(self._get_cache_file(), self._width)
+        self._width = store.width
+        digests: List[bytes] = list(store)
+        store.close()
+        try:
+            with open(self._get_log_file(), 'rb') as f:
+                data = f.read()
+            digests.extend(
+                data[offset:offset + store.width]
+                for offset in range(0, len(data) - len(data) % store.width, store.width)
+            )
+        except IOError:
+            pass
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Scopes that already hold rows were migrated before the table
+            # existed; INSERT OR IGNORE makes concurrent imports by workers
+            # harmless.
+            empty = conn.execute("SELECT 1 FROM hashes WHERE scope = ? LIMIT 1", (self.scope,)).fetchone() is None
+            if digests and empty:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO hashes(scope, digest, created_at) VALUES (?, ?, ?)",
+                    [(self.scope, d, now) for d in digests]
+                )
+            conn.execute(
+                "INSERT OR IGNORE INTO migrations(scope, width, migrated_at) VALUES (?, ?, ?)",
+                (self.scope, self._width, now)
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def digest_width(self) -> int:
+        return self._width
+
+    def _prune(self, inserted: int):
+        if not (self.WINDOW_SIZE or self.WINDOW_DAYS):
+            return
+        self._inserts_since_prune += inserted
+        if self._inserts_since_prune < self.PRUNE_EVERY:
+            return
+        self._inserts_since_prune = 0
+        conn = self._connection()
+        if self.WINDOW_DAYS:
+            conn.execute(
+                "DELETE FROM hashes WHERE scope = ? AND created_at < ?",
+                (self.scope, self._window_cutoff())
+            )
+        if self.WINDOW_SIZE:
+            conn.execute(
+                "DELETE FROM hashes WHERE scope = ? AND created_at < ("
+                "SELECT created_at FROM hashes WHERE scope = ? "
+                "ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+                (self.scope, self.scope, self.WINDOW_SIZE - 1)
+            )
+
+    def _insert_many(self, digests: List[bytes]) -> int:
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO hashes(scope, digest, created_at) VALUES (?, ?, ?)",
+                [(self.scope, d, now) for d in digests]
+            )
+            inserted = conn.total_changes - before
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        self._prune(inserted)
+        return inserted
+
+    def _add(self, d: bytes) -> bool:
+        conn = self._connection()
+        if self.WINDOW_DAYS:
+            conn.execute(
+                "DELETE FROM hashes WHERE scope = ? AND digest = ? AND created_at < ?",
+                (self.scope, d, self._window_cutoff())
+            )
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO hashes(scope, digest, created_at) VALUES (?, ?, ?)",
+            (self.scope, d, time.time())
+        )
+        inserted = cursor.rowcount == 1
+        if inserted:
+            self._prune(1)
+        return inserted
+
+    def contains_digest(self, value: Union[str, bytes]) -> bool:
+        row = self._connection().execute(
+            "SELECT 1 FROM hashes WHERE scope = ? AND digest = ? AND created_at >= ?",
+            (self.scope, self._to_digest(value), self._window_cutoff())
+        ).fetchone()
+        return row is not None
+
+    def register_many(self, contents: Iterable[str]) -> List[str]:
+        hashes = [hashlib.md5(content.encode()).hexdigest() for content in contents]
+        if hashes:
+            self._insert_many([bytes.fromhex(h)[:self._width] for h in hashes])
+        return hashes
+
+    def _batches(self, keys: List[bytes]) -> Iterable[List[bytes]]:
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            yield keys[start:start + self.BATCH_SIZE]
+
+    def reserve(self, digests: Sequence[Union[str, bytes]]) -> List[bool]:
+        # Reservations are real rows flagged as reserved, so the unique index
+        # arbitrates between workers; rows left behind by a crashed worker
+        # expire after RESERVATION_TTL seconds.
+        keys = [self._to_digest(v) for v in digests]
+        if not keys:
+            return []
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM hashes WHERE scope = ? AND reserved = 1 AND created_at < ?",
+                (self.scope, now - self.RESERVATION_TTL)
+            )
+            if self.WINDOW_DAYS:
+                conn.execute(
+                    "DELETE FROM hashes WHERE scope = ? AND created_at < ?",
+                    (self.scope, self._window_cutoff())
+                )
+            taken: Set[bytes] = set()
+            for batch in self._batches(keys):
+                placeholders = ",".join("?" * len(batch))
+                taken.update(row[0] for row in conn.execute(
+                    f"SELECT digest FROM hashes WHERE scope = ? AND digest IN ({placeholders})",
+                    [self.scope] + batch
+                ))
+            results = []
+            for d in keys:
+                accepted = d not in taken
+                if accepted:
+                    taken.add(d)
+                results.append(accepted)
+            conn.executemany(
+                "INSERT INTO hashes(scope, digest, created_at, reserved) VALUES (?, ?, ?, 1)",
+                [(self.scope, d, now) for d, accepted in zip(keys, results) if accepted]
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def commit(self, digests: Sequence[Union[str, bytes]]):
+        keys = [self._to_digest(v) for v in digests]
+        if not keys:
+            return
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for batch in self._batches(keys):
+                placeholders = ",".join("?" * len(batch))
+                conn.execute(
+                    f"UPDATE hashes SET reserved = 0, created_at = ? "
+                    f"WHERE scope = ? AND reserved = 1 AND digest IN ({placeholders})",
+                    [now, self.scope] + batch
+                )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        self._prune(len(keys))
+
+    def abort(self, digests: Sequence[Union[str, bytes]]):
+        keys = [self._to_digest(v) for v in digests]
+        if not keys:
+            return
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for batch in self._batches(keys):
+                placeholders = ",".join("?" * len(batch))
+                conn.execute(
+                    f"DELETE FROM hashes WHERE scope = ? AND reserved = 1 AND digest IN ({placeholders})",
+                    [self.scope] + batch
+                )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def count(self) -> int:
+        row = self._connection().execute(
+            "SELECT COUNT(*) FROM hashes WHERE scope = ? AND reserved = 0 AND created_at >= ?",
+            (self.scope, self._window_cutoff())
+        ).fetchone()
+        return row[0]
+
+    def flush(self):
+        pass
+
+    def compact(self):
+        pass
+
+    def clear(self):
+        self._connection().execute("DELETE FROM hashes WHERE scope = ?", (self.scope,))
+        self._reset_cursors()
+
+    def close(self):
+        pass
+
+
+atexit.register(UniqueHashRegistry.flush_all)
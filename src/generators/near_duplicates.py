@@ -0,0 +1,297 @@
+from __future__ import annotations
+import os
+import re
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .hash_registry import UniqueHashRegistry
+from .question_templates import ContextGenerator
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+_TOKEN_RE = re.compile(r"<\w+>|\w+", re.UNICODE)
+
+
+def _entity_pattern(words: Sequence[str]) -> re.Pattern:
+    alternation = "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+
+_ENTITY_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (_entity_pattern(ContextGenerator.PEOPLE_NAMES), "<nome>"),
+    (_entity_pattern(ContextGenerator.CITIES), "<cidade>"),
+    (_entity_pattern(ContextGenerator.COMPANIES), "<empresa>"),
+    (_entity_pattern(ContextGenerator.PROFESSIONS), "<profissao>"),
+    (_entity_pattern(ContextGenerator.PRODUCTS), "<produto>"),
+]
+
+
+def _canonical_number(literal: str) -> str:
+    # "1.200" and "1200" are the same amount; "0,25" and "0.25" too.
+    if "," in literal:
+        return literal.replace(".", "").replace(",", ".")
+    if re.fullmatch(r"\d{1,3}(?:\.\d{3})+", literal):
+        return literal.replace(".", "")
+    return literal
+
+
+def normalize_statement(statement: str) -> Tuple[List[str], Tuple[str, ...]]:
+    text = statement
+    for pattern, placeholder in _ENTITY_PATTERNS:
+        text = pattern.sub(placeholder, text)
+    numbers = tuple(sorted(_canonical_number(m) for m in _NUMBER_RE.findall(text)))
+    text = _NUMBER_RE.sub("<num>", text)
+    return _TOKEN_RE.findall(text.lower()), numbers
+
+
+class NearDuplicateIndex:
+    NUM_PERM = 32
+    BANDS = 8
+    THRESHOLD = 0.85
+    SHINGLE_SIZE = 3
+    MAX_RESIDENT_INDEXES = 64
+    COMPACT_MIN_ENTRIES = 1000
+    _instances: 'OrderedDict[str, NearDuplicateIndex]' = OrderedDict()
+    _class_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, cache_dir: str, volume_id: int, topic_id: str) -> 'NearDuplicateIndex':
+        key = f"v{volume_id}_t{topic_id}"
+        evicted: List[NearDuplicateIndex] = []
+        with cls._class_lock:
+            if key in cls._instances:
+                cls._instances.move_to_end(key)
+            else:
+                path = os.path.join(cache_dir, f"minhash_v{volume_id}_t{topic_id.replace('.', '_')}.sig")
+                cls._instances[key] = cls(path)
+                while cls.MAX_RESIDENT_INDEXES and len(cls._instances) > cls.MAX_RESIDENT_INDEXES:
+                    evicted.append(cls._instances.popitem(last=False)[1])
+            instance = cls._instances[key]
+        for index in evicted:
+            index.close()
+        return instance
+
+    @classmethod
+    def clear_all_instances(cls):
+        with cls._class_lock:
+            instances = list(cls._instances.values())
+            cls._instances.clear()
+        for instance in instances:
+            instance.close()
+
+    def __init__(self, path: Optional[str] = None, match_numbers: bool = True):
+        self.path = path
+        self.match_numbers = match_numbers
+        self._rows = self.NUM_PERM // self.BANDS
+        # Fixed coefficients keep signatures stable across processes, which
+        # is what allows them to be persisted and replayed.
+        self._perms = [
+            (((i + 1) * 0x9E3779B97F4A7C15) % _MERSENNE_PRIME | 1,
+             ((i + 7) * 0xC2B2AE3D27D4EB4F) % _MERSENNE_PRIME)
+            for i in range(self.NUM_PERM)
+        ]
+        # Each record is the time it was added, the numeric fingerprint and
+        # the MinHash signature of the number-free text. Records are in
+        # insertion order, so the window only ever drops a prefix: indices
+        # below _start are expired and skipped until the next compaction.
+        self._record_len = self.NUM_PERM + 2
+        self._signatures = array('I')
+        self._start = 0
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.BANDS)]
+        self._handle = None
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def __len__(self) -> int:
+        return self._total() - self._start
+
+    def _total(self) -> int:
+        return len(self._signatures) // self._record_len
+
+    def _read(self, path: str, record_size: int) -> Tuple[bytes, int]:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except IOError:
+            return b"", 0
+        return data, len(data) - len(data) % record_size
+
+    def _load(self):
+        record_size = self._record_len * self._signatures.itemsize
+        legacy = self.path[:-len(".sig")] + ".bin" if self.path.endswith(".sig") else None
+        if not os.path.exists(self.path):
+            if legacy and os.path.exists(legacy):
+                self._load_legacy(legacy)
+            return
+        data, valid_end = self._read(self.path, record_size)
+        self._signatures.frombytes(data[:valid_end])
+        if valid_end < len(data) and not UniqueHashRegistry.READ_ONLY:
+            try:
+                with open(self.path, 'r+b') as f:
+                    f.truncate(valid_end)
+            except IOError:
+                pass
+        self._expire()
+        if self._start:
+            self._compact()
+        else:
+            for index in range(self._total()):
+                self._index(index)
+
+    def _load_legacy(self, legacy: str):
+        # Files from before the window carry no timestamps; their records
+        # count as added when the file was last written.
+        old_len = self.NUM_PERM + 1
+        data, valid_end = self._read(legacy, old_len * self._signatures.itemsize)
+        records = array('I', data[:valid_end])
+        try:
+            stamp = int(os.path.getmtime(legacy))
+        except OSError:
+            stamp = int(time.time())
+        for start in range(0, len(records), old_len):
+            self._signatures.append(stamp)
+            self._signatures.extend(records[start:start + old_len])
+        self._expire()
+        self._compact()
+        if os.path.exists(self.path) and not UniqueHashRegistry.READ_ONLY:
+            try:
+                os.remove(legacy)
+            except OSError:
+                pass
+
+    def _expire(self):
+        cutoff = UniqueHashRegistry._window_cutoff()
+        size = UniqueHashRegistry.WINDOW_SIZE
+        if not cutoff and not size:
+            return
+        total = self._total()
+        while self._start < total and (
+            self._signatures[self._start * self._record_len] < cutoff
+            or size and total - self._start > size
+        ):
+            self._start += 1
+
+    def _compact(self):
+        # Drops the expired prefix in memory, reindexes, and rewrites the
+        # file so it stays bounded by the window as well.
+        live = self._signatures[self._start * self._record_len:]
+        self._signatures = array('I', live)
+        self._start = 0
+        self._buckets = [{} for _ in range(self.BANDS)]
+        for index in range(self._total()):
+            self._index(index)
+        # Read-only processes (workers) never touch the file: the parent may
+        # hold an open append handle on it.
+        if not self.path or UniqueHashRegistry.READ_ONLY:
+            return
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(self._signatures.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self._close()
+            os.replace(tmp_path, self.path)
+        except IOError:
+            pass
+
+    def signature(self, statement: str) -> Tuple[int, ...]:
+        tokens, numbers = normalize_statement(statement)
+        fingerprint = zlib.crc32(" ".join(numbers).encode()) if self.match_numbers else 0
+        n = self.SHINGLE_SIZE
+        shingles = {
+            zlib.crc32(" ".join(tokens[i:i + n]).encode())
+            for i in range(max(1, len(tokens) - n + 1))
+        }
+        return (fingerprint,) + tuple(
+            min(((a * x + b) % _MERSENNE_PRIME) & _MAX_HASH for x in shingles)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Sequence[int]) -> List[int]:
+        # Questions only share buckets when they use the same numbers, so a
+        # renamed character collides while a new parameter draw does not.
+        fingerprint, r = signature[0], self._rows
+        return [
+            hash((fingerprint,) + tuple(signature[1 + band * r:1 + (band + 1) * r]))
+            for band in range(self.BANDS)
+        ]
+
+    def _record(self, index: int) -> Sequence[int]:
+        start = index * self._record_len + 1
+        return self._signatures[start:start + self._record_len - 1]
+
+    def _index(self, index: int):
+        for band, key in enumerate(self._band_keys(self._record(index))):
+            self._buckets[band].setdefault(key, []).append(index)
+
+    def _similarity(self, signature: Sequence[int], index: int) -> float:
+        stored = self._record(index)
+        if stored[0] != signature[0]:
+            return 0.0
+        return sum(1 for a, b in zip(signature[1:], stored[1:]) if a == b) / self.NUM_PERM
+
+    def find(self, signature: Sequence[int]) -> Optional[int]:
+        seen = set()
+        with self._lock:
+            self._expire()
+            for band, key in enumerate(self._band_keys(signature)):
+                for index in self._buckets[band].get(key, ()):
+                    if index in seen or index < self._start:
+                        continue
+                    seen.add(index)
+                    if self._similarity(signature, index) >= self.THRESHOLD:
+                        return index
+        return None
+
+    def is_near_duplicate(self, statement: str) -> bool:
+        return self.find(self.signature(statement)) is not None
+
+    def add(self, signature: Sequence[int], persist: bool = True) -> int:
+        with self._lock:
+            record = array('I', (int(time.time()),) + tuple(signature))
+            self._signatures.extend(record)
+            self._index(self._total() - 1)
+            if self.path and persist and not UniqueHashRegistry.READ_ONLY:
+                try:
+                    if self._handle is None:
+                        self._handle = open(self.path, 'ab')
+                    self._handle.write(record.tobytes())
+                    self._handle.flush()
+                except IOError:
+                    pass
+            self._expire()
+            if self._start >= max(self.COMPACT_MIN_ENTRIES, len(self)):
+                self._compact()
+            return self._total() - 1
+
+    def clear(self):
+        with self._lock:
+            self._signatures = array('I')
+            self._start = 0
+            self._buckets = [{} for _ in range(self.BANDS)]
+            self._close()
+            if self.path and os.path.exists(self.path):
+                try:
+                    os.remove(self.path)
+                except IOError:
+                    pass
+
+    def _close(self):
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except IOError:
+                pass
+            self._handle = None
+
+    def close(self):
+        with self._lock:
+            self._close()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+import math
+import random
+from itertools import accumulate
+from typing import Optional, Tuple
+
+
+# Tables are built once at import (a few milliseconds) and are immutable;
+# every picker below is a constant number of lookups plus one random draw.
+
+PRIME_LIMIT = 10_000
+TRIPLE_LIMIT = 200
+FRACTION_DENOMINATORS = (2, 3, 4, 5, 6, 8, 10, 12)
+
+
+def _sieve(limit: int) -> bytes:
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return bytes(sieve)
+
+
+def _triples(limit: int) -> Tuple[Tuple[Tuple[int, int, int], ...], Tuple[Tuple[int, int, int], ...]]:
+    primitive = []
+    for m in range(2, math.isqrt(limit) + 1):
+        for n in range(1 + m % 2, m, 2):
+            if math.gcd(m, n) == 1 and m * m + n * n <= limit:
+                a, b = sorted((m * m - n * n, 2 * m * n))
+                primitive.append((a, b, m * m + n * n))
+    scaled = [(k * a, k * b, k * c) for a, b, c in primitive for k in range(1, limit // c + 1)]
+    return tuple(sorted(primitive, key=lambda t: (t[2], t[0]))), tuple(sorted(scaled, key=lambda t: (t[2], t[0])))
+
+
+def _counts_by_hypotenuse(triples: Tuple[Tuple[int, int, int], ...], limit: int) -> Tuple[int, ...]:
+    counts = [0] * (limit + 1)
+    for _, _, c in triples:
+        counts[c] += 1
+    return tuple(accumulate(counts))
+
+
+_PRIME_SIEVE = _sieve(PRIME_LIMIT)
+PRIMES: Tuple[int, ...] = tuple(n for n, flag in enumerate(_PRIME_SIEVE) if flag)
+# PRIME_COUNTS[n] is the number of primes <= n, so the primes in [a, b]
+# are exactly PRIMES[PRIME_COUNTS[a - 1]:PRIME_COUNTS[b]].
+PRIME_COUNTS: Tuple[int, ...] = tuple(accumulate(_PRIME_SIEVE))
+
+PRIMITIVE_TRIPLES, PYTHAGOREAN_TRIPLES = _triples(TRIPLE_LIMIT)
+_PRIMITIVE_COUNTS = _counts_by_hypotenuse(PRIMITIVE_TRIPLES, TRIPLE_LIMIT)
+_TRIPLE_COUNTS = _counts_by_hypotenuse(PYTHAGOREAN_TRIPLES, TRIPLE_LIMIT)
+
+NICE_FRACTIONS: Tuple[Tuple[int, int], ...] = tuple(sorted(
+    {(n // math.gcd(n, d), d // math.gcd(n, d)) for d in FRACTION_DENOMINATORS for n in range(1, d)},
+    key=lambda f: (f[0] / f[1], f[1])
+))
+
+
+def is_prime(n: int) -> bool:
+    if n <= PRIME_LIMIT:
+        return n >= 2 and bool(_PRIME_SIEVE[n])
+    if n % 2 == 0:
+        return False
+    return all(n % d for d in range(3, math.isqrt(n) + 1, 2))
+
+
+def prime_count(n: int) -> int:
+    if n < 2:
+        return 0
+    if n > PRIME_LIMIT:
+        raise ValueError(f"prime_count is tabulated up to {PRIME_LIMIT}")
+    return PRIME_COUNTS[n]
+
+
+def pick_prime(min_val: int, max_val: int, rng: Optional[random.Random] = None) -> Optional[int]:
+    if max_val > PRIME_LIMIT:
+        primes = [p for p in range(max(min_val, 2), max_val + 1) if is_prime(p)]
+        return (rng or random).choice(primes) if primes else None
+    low = prime_count(min_val - 1)
+    high = prime_count(max_val)
+    if low >= high:
+        return None
+    return PRIMES[(rng or random).randrange(low, high)]
+
+
+def pick_with_parity(min_val: int, max_val: int, parity: int, rng: Optional[random.Random] = None) -> Optional[int]:
+    first = min_val + (min_val - parity) % 2
+    if first > max_val:
+        return None
+    return first + 2 * (rng or random).randrange((max_val - first) // 2 + 1)
+
+
+def pick_pythagorean_triple(
+    max_hypotenuse: int = 25,
+    primitive: bool = False,
+    rng: Optional[random.Random] = None
+) -> Tuple[int, int, int]:
+    if not 5 <= max_hypotenuse <= TRIPLE_LIMIT:
+        raise ValueError(f"max_hypotenuse must be between 5 and {TRIPLE_LIMIT}")
+    triples, counts = (PRIMITIVE_TRIPLES, _PRIMITIVE_COUNTS) if primitive else (PYTHAGOREAN_TRIPLES, _TRIPLE_COUNTS)
+    return triples[(rng or random).randrange(counts[max_hypotenuse])]
+
+
+def pick_nice_fraction(rng: Optional[random.Random] = None) -> Tuple[int, int]:
+    return (rng or random).choice(NICE_FRACTIONS)
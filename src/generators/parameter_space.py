@@ -0,0 +1,264 @@
+from __future__ import annotations
+import bisect
+from array import array
+import json
+import math
+import os
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: saves stay atomic, only the cross-process merge is unlocked.
+    fcntl = None
+
+
+class ParameterSpace:
+    def __init__(self, **dimensions: Sequence[Any]):
+        self.names: List[str] = list(dimensions)
+        self.values: List[List[Any]] = [list(v) for v in dimensions.values()]
+        self.size = math.prod(len(v) for v in self.values)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def params(self, index: int) -> Dict[str, Any]:
+        index %= self.size
+        result = {}
+        for name, values in zip(reversed(self.names), reversed(self.values)):
+            index, position = divmod(index, len(values))
+            result[name] = values[position]
+        return result
+
+    def columns(self, indices: Sequence[int]) -> Dict[str, Any]:
+        import numpy as np
+        remaining = np.asarray(indices, dtype=np.int64) % self.size
+        result = {}
+        for name, values in zip(reversed(self.names), reversed(self.values)):
+            remaining, position = np.divmod(remaining, len(values))
+            result[name] = np.asarray(values)[position]
+        return {name: result[name] for name in self.names}
+
+
+class ParameterUnion(ParameterSpace):
+    def __init__(self, *spaces: ParameterSpace):
+        self.spaces = list(spaces)
+        self._offsets: List[int] = []
+        total = 0
+        for space in self.spaces:
+            self._offsets.append(total)
+            total += space.size
+        self.size = total
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        index %= self.size
+        position = bisect.bisect_right(self._offsets, index) - 1
+        return position, index - self._offsets[position]
+
+    def params(self, index: int) -> Dict[str, Any]:
+        position, local = self.locate(index)
+        return self.spaces[position].params(local)
+
+    def columns(self, indices: Sequence[int]) -> Dict[str, Any]:
+        import numpy as np
+        indices = np.asarray(indices, dtype=np.int64) % self.size
+        positions = np.searchsorted(self._offsets, indices, side="right") - 1
+        parts: Dict[str, List[Any]] = {}
+        for position, space in enumerate(self.spaces):
+            mask = positions == position
+            if not mask.any():
+                continue
+            for name, column in space.columns(indices[mask] - self._offsets[position]).items():
+                parts.setdefault(name, []).append((mask, column))
+        result = {}
+        for name, pieces in parts.items():
+            column = np.zeros(len(indices), dtype=np.result_type(*(c.dtype for _, c in pieces)))
+            for mask, values in pieces:
+                column[mask] = values
+            result[name] = column
+        return result
+
+
+class ParameterSubset(ParameterSpace):
+    def __init__(self, space: ParameterSpace, predicate: Callable[[Dict[str, Any]], bool]):
+        # Constrained domains are enumerated once so draws stay O(1) and the
+        # subset still has an exact size for capacity planning.
+        self.space = space
+        self.names = space.names
+        self.indices = array('q', (i for i in range(space.size) if predicate(space.params(i))))
+        self.size = len(self.indices)
+
+    def params(self, index: int) -> Dict[str, Any]:
+        return self.space.params(self.indices[index % self.size])
+
+    def columns(self, indices: Sequence[int]) -> Dict[str, Any]:
+        import numpy as np
+        positions = np.asarray(indices, dtype=np.int64) % self.size
+        return self.space.columns(np.frombuffer(self.indices, dtype=np.int64)[positions])
+
+
+class ParameterWalk:
+    _GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+    def __init__(self, size: int, seed: int):
+        self.size = size
+        # i -> (stride*i + offset) mod size is a bijection whenever stride is
+        # coprime to size; a stride near size/phi spreads consecutive draws
+        # across the whole space.
+        stride = max(1, int(size * self._GOLDEN_RATIO)) + seed % max(1, size // 8)
+        while math.gcd(stride, size) != 1:
+            stride += 1
+        self.stride = stride
+        self.offset = seed % size
+
+    def __getitem__(self, position: int) -> int:
+        return (self.stride * position + self.offset) % self.size
+
+
+def _progress(cursor: Dict[str, int]) -> Tuple[int, int]:
+    # A new epoch (wrap or reset) supersedes any position of an older one.
+    return cursor.get("epoch", 0), cursor["position"]
+
+
+class ParameterCursors:
+    FILE_NAME = "cursors.json"
+    _instances: Dict[str, 'ParameterCursors'] = {}
+    _class_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, cache_dir: str) -> 'ParameterCursors':
+        with cls._class_lock:
+            if cache_dir not in cls._instances:
+                cls._instances[cache_dir] = cls(cache_dir)
+            return cls._instances[cache_dir]
+
+    @classmethod
+    def clear_all_instances(cls):
+        with cls._class_lock:
+            cls._instances.clear()
+
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, self.FILE_NAME)
+        self._cursors: Dict[str, Dict[str, int]] = {}
+        self._walks: Dict[str, Tuple[int, ParameterWalk]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._cursors = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+    def _walk(self, key: str, size: int, epoch: int) -> ParameterWalk:
+        cached = self._walks.get(key)
+        if cached is None or cached[0] != epoch or cached[1].size != size:
+            # Epoch 0 keeps the original seed so existing cursors stay valid.
+            seed = zlib.crc32(f"{key}#{epoch}".encode() if epoch else key.encode())
+            cached = self._walks[key] = (epoch, ParameterWalk(size, seed))
+        return cached[1]
+
+    def _cursor(self, key: str, size: int) -> Dict[str, int]:
+        cursor = self._cursors.get(key)
+        if cursor is None or cursor.get("size") != size:
+            # A changed domain invalidates the old walk; the registry still
+            # rejects anything that was already handed out.
+            cursor = {"position": 0, "size": size, "epoch": 0}
+            self._cursors[key] = cursor
+        return cursor
+
+    def next_index(self, key: str, space: ParameterSpace) -> Optional[int]:
+        with self._lock:
+            cursor = self._cursor(key, space.size)
+            if cursor["position"] >= space.size:
+                return None
+            index = self._walk(key, space.size, cursor.get("epoch", 0))[cursor["position"]]
+            cursor["position"] += 1
+            self._dirty = True
+            return index
+
+    def wrap(self, key: str, space: ParameterSpace):
+        # Starts the walk over in a new order; only worth it when the registry
+        # forgets old hashes, so draws from the last epoch can be accepted again.
+        with self._lock:
+            cursor = self._cursor(key, space.size)
+            cursor["epoch"] = cursor.get("epoch", 0) + 1
+            cursor["position"] = 0
+            self._dirty = True
+
+    def advance(self, key: str, count: int) -> int:
+        # Unbounded counter (size 0) for generators without an enumerated
+        # domain: persisted so a new process starts past the seeds earlier
+        # runs already drew, instead of replaying them.
+        with self._lock:
+            cursor = self._cursors.setdefault(key, {"position": 0, "size": 0, "epoch": 0})
+            start = cursor["position"]
+            cursor["position"] += count
+            self._dirty = True
+            return start
+
+    def remaining(self, key: str, space: ParameterSpace) -> int:
+        with self._lock:
+            return space.size - self._cursor(key, space.size)["position"]
+
+    def snapshot(self, prefix: str = "") -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                key: dict(cursor) for key, cursor in self._cursors.items()
+                if key.startswith(prefix)
+            }
+
+    def _merge_locked(self, cursors: Dict[str, Dict[str, int]]) -> bool:
+        # Cursors only move forward, so the furthest position of the latest
+        # epoch wins; a different size means the entry predates a domain
+        # change and is left alone.
+        changed = False
+        for key, cursor in cursors.items():
+            current = self._cursors.get(key)
+            if current is None or (current.get("size") == cursor.get("size")
+                                   and _progress(current) < _progress(cursor)):
+                self._cursors[key] = dict(cursor)
+                changed = True
+        return changed
+
+    def merge(self, cursors: Dict[str, Dict[str, int]]):
+        with self._lock:
+            if self._merge_locked(cursors):
+                self._dirty = True
+
+    def reset(self, prefix: str = ""):
+        # A new epoch rather than a deleted entry, so the reset also wins
+        # over the older positions other processes still have on disk.
+        with self._lock:
+            self._merge_locked(self._read())
+            for key, cursor in self._cursors.items():
+                if key.startswith(prefix):
+                    cursor["epoch"] = cursor.get("epoch", 0) + 1
+                    cursor["position"] = 0
+                    self._dirty = True
+
+    def save(self):
+        # Several processes (server, CLI, app workers) share the file: merge
+        # with what is on disk under a lock instead of overwriting it.
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = self.path + ".tmp"
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path + ".lock", 'a') as lock_file:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                    self._merge_locked(self._read())
+                    with open(tmp_path, 'w') as f:
+                        f.write(json.dumps(self._cursors))
+                    os.replace(tmp_path, self.path)
+            except IOError:
+                return
+            self._dirty = False
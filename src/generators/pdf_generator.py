@@ -1,10 +1,11 @@
 import os
 from datetime import datetime
-from typing import List, Optional
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
 from weasyprint import HTML, CSS
 from weasyprint.text.fonts import FontConfiguration
 from ..models.question import Question, QuestionSet, VolumeQuestionSet
-from ..models.curriculum import Difficulty, get_volume
+from ..models.curriculum import Difficulty, get_volume, get_topic
 
 
 class PDFGenerator:
@@ -459,12 +460,23 @@ class PDFGenerator:
         """
     
     def generate_cover_html(self, volume_set: VolumeQuestionSet) -> str:
-        total_questions = volume_set.total_count()
-        total_topics = len(volume_set.topic_sets)
-        
-        easy_count = sum(len(ts.get_easy_questions()) for ts in volume_set.topic_sets)
-        medium_count = sum(len(ts.get_medium_questions()) for ts in volume_set.topic_sets)
-        hard_count = sum(len(ts.get_hard_questions()) for ts in volume_set.topic_sets)
+        counts = {
+            difficulty: sum(len(ts.get_questions_by_difficulty(difficulty)) for ts in volume_set.topic_sets)
+            for difficulty in Difficulty
+        }
+        return self._cover_html(volume_set.volume_id, volume_set.volume_name, len(volume_set.topic_sets), counts)
+    
+    def _cover_html(
+        self, 
+        volume_id: int, 
+        volume_name: str, 
+        total_topics: int, 
+        counts: Dict[Difficulty, int]
+    ) -> str:
+        total_questions = sum(counts.values())
+        easy_count = counts.get(Difficulty.FACIL, 0)
+        medium_count = counts.get(Difficulty.MEDIO, 0)
+        hard_count = counts.get(Difficulty.DIFICIL, 0)
         
         date_str = datetime.now().strftime("%d/%m/%Y")
         
@@ -475,8 +487,8 @@ class PDFGenerator:
             
             <div class="decorative-line"></div>
             
-            <div class="cover-volume">Volume {volume_set.volume_id}</div>
-            <div class="cover-subtitle" style="font-size: 14pt;">{volume_set.volume_name}</div>
+            <div class="cover-volume">Volume {volume_id}</div>
+            <div class="cover-subtitle" style="font-size: 14pt;">{volume_name}</div>
             
             <div class="cover-description">
                 Material de estudo completo com questões organizadas por nível de dificuldade,
@@ -513,13 +525,16 @@ class PDFGenerator:
         """
     
     def generate_toc_html(self, volume_set: VolumeQuestionSet) -> str:
+        return self._toc_html([(ts.topic_id, ts.topic_name, ts.total_count()) for ts in volume_set.topic_sets])
+    
+    def _toc_html(self, entries: List[Tuple[str, str, int]]) -> str:
         toc_items = []
-        for ts in volume_set.topic_sets:
+        for topic_id, topic_name, count in entries:
             toc_items.append(f"""
             <div class="toc-item">
-                <span class="toc-item-title">{ts.topic_id} - {ts.topic_name}</span>
+                <span class="toc-item-title">{topic_id} - {topic_name}</span>
                 <span class="toc-item-dots"></span>
-                <span class="toc-item-page">{ts.total_count()} questões</span>
+                <span class="toc-item-page">{count} questões</span>
             </div>
             """)
         
@@ -632,6 +647,39 @@ class PDFGenerator:
         for topic_set in volume_set.topic_sets:
             sections += self.generate_topic_section_html(topic_set)
         
+        return self._volume_html(volume_set.volume_id, volume_set.volume_name, cover, toc, sections)
+    
+    def generate_volume_html_from_questions(
+        self, 
+        volume_id: int, 
+        questions: Iterable[Question]
+    ) -> Tuple[str, str]:
+        # Questions arrive grouped by topic; each topic is rendered as soon as
+        # it is complete and dropped, so only the HTML and the counts needed
+        # by the cover and the table of contents are kept.
+        volume = get_volume(volume_id)
+        volume_name = volume.name if volume else f"Volume {volume_id}"
+        sections: List[str] = []
+        entries: List[Tuple[str, str, int]] = []
+        counts = {difficulty: 0 for difficulty in Difficulty}
+        for topic_id, topic_questions in groupby(questions, key=lambda q: q.topic_id):
+            topic = get_topic(volume_id, topic_id)
+            topic_set = QuestionSet(
+                volume_id=volume_id,
+                topic_id=topic_id,
+                topic_name=topic.name if topic else topic_id,
+                questions=list(topic_questions)
+            )
+            sections.append(self.generate_topic_section_html(topic_set))
+            entries.append((topic_set.topic_id, topic_set.topic_name, topic_set.total_count()))
+            for question in topic_set.questions:
+                counts[question.difficulty] += 1
+        
+        cover = self._cover_html(volume_id, volume_name, len(entries), counts)
+        toc = self._toc_html(entries)
+        return self._volume_html(volume_id, volume_name, cover, toc, "".join(sections)), volume_name
+    
+    def _volume_html(self, volume_id: int, volume_name: str, cover: str, toc: str, sections: str) -> str:
         date_str = datetime.now().strftime("%d/%m/%Y às %H:%M")
         
         return f"""
@@ -639,15 +687,15 @@ class PDFGenerator:
         <html lang="pt-BR">
         <head>
             <meta charset="UTF-8">
-            <title>Volume {volume_set.volume_id} - {volume_set.volume_name}</title>
+            <title>Volume {volume_id} - {volume_name}</title>
         </head>
         <body data-date="{date_str}">
             {cover}
             {toc}
             
             <div class="section-header">
-                <h1 class="section-title">Volume {volume_set.volume_id}</h1>
-                <p class="section-subtitle">{volume_set.volume_name}</p>
+                <h1 class="section-title">Volume {volume_id}</h1>
+                <p class="section-subtitle">{volume_name}</p>
             </div>
             
             {sections}
@@ -693,9 +741,16 @@ class PDFGenerator:
     
     def generate_volume_pdf(self, volume_set: VolumeQuestionSet) -> str:
         html_content = self.generate_volume_html(volume_set)
+        return self._write_volume_pdf(volume_set.volume_id, volume_set.volume_name, html_content)
+    
+    def generate_volume_pdf_from_questions(self, volume_id: int, questions: Iterable[Question]) -> str:
+        html_content, volume_name = self.generate_volume_html_from_questions(volume_id, questions)
+        return self._write_volume_pdf(volume_id, volume_name, html_content)
+    
+    def _write_volume_pdf(self, volume_id: int, volume_name: str, html_content: str) -> str:
         css = CSS(string=self.get_css(), font_config=self.font_config)
         
-        filename = f"volume_{volume_set.volume_id}_{volume_set.volume_name.replace(' ', '_').replace(',', '')[:30]}.pdf"
+        filename = f"volume_{volume_id}_{volume_name.replace(' ', '_').replace(',', '')[:30]}.pdf"
         filepath = os.path.join(self.output_dir, filename)
         
         HTML(string=html_content).write_pdf(filepath, stylesheets=[css], font_config=self.font_config)
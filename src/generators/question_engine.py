@@ -4,8 +4,12 @@ import hashlib
 import uuid
 import json
 import os
-from typing import List, Dict, Optional, Tuple, Set
-from sympy import *
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, contextmanager
+from typing import Any, Iterator, List, Dict, Optional, Tuple, Set
 from dataclasses import dataclass
 import math
 
@@ -18,97 +22,319 @@ from .question_templates import (
     ContextGenerator, NumberGenerator, DistractorGenerator,
     StatementPatterns, format_set, format_number, format_fraction, format_expression
 )
+from .hash_registry import UniqueHashRegistry
+from .near_duplicates import NearDuplicateIndex
+from .capacity import CapacityEstimate, CapacityExhaustedError, estimate_distinct, remaining_capacity as estimate_remaining
+from .number_tables import prime_count
+from .question_ids import GENERIC_VERSION, GenerationPath, QuestionKey
+from .parameter_space import ParameterCursors, ParameterSpace, ParameterUnion
+from .generator_registry import GeneratorSpec, get_generator_spec, register_generator
+from .batch_generators import generate_ap_batch, generate_gp_batch, generate_probability_batch
+from .telemetry import GeneratorStats, GeneratorTelemetry, StatsKey
 
 
-class UniqueHashRegistry:
-    CACHE_DIR = "src/output/.cache"
-    _instances: Dict[str, 'UniqueHashRegistry'] = {}
+AP_SPACES: Dict[Difficulty, ParameterSpace] = {
+    Difficulty.FACIL: ParameterUnion(
+        ParameterSpace(question_type=["nth_term", "sum"], a1=range(1, 11), r=range(1, 6), n=range(5, 16)),
+        ParameterSpace(question_type=["ratio"], a1=range(1, 11), r=range(1, 6), n=[None]),
+    ),
+    Difficulty.MEDIO: ParameterSpace(a1=range(1, 6), r=range(2, 5), n=range(10, 21)),
+}
+
+GP_SPACES: Dict[Difficulty, ParameterSpace] = {
+    Difficulty.FACIL: ParameterUnion(
+        ParameterSpace(question_type=["nth_term", "sum"], a1=range(1, 6), q=range(2, 4), n=range(4, 8)),
+        ParameterSpace(question_type=["ratio"], a1=range(1, 6), q=range(2, 4), n=[None]),
+    ),
+    Difficulty.MEDIO: ParameterSpace(a1=range(100, 501), q=[0.5, 0.8, 0.9]),
+}
+
+
+def _generate_topic_in_worker(
+    settings: Dict[str, Any], 
+    options: Dict[str, Any], 
+    volume_id: int, 
+    topic_id: str, 
+    total: int, 
+    seed: int
+) -> Tuple[QuestionSet, List[str], Dict[str, Dict[str, int]], Dict[StatsKey, GeneratorStats]]:
+    # Reload everything from disk for each task: the parent commits between
+    # volumes, so whatever this process cached earlier may be stale.
+    UniqueHashRegistry.apply_settings(dict(settings, READ_ONLY=True))
+    NearDuplicateIndex.clear_all_instances()
+    ParameterCursors.clear_all_instances()
+    GeneratorTelemetry.reset()
+    generator = QuestionGenerator(defer_commit=True, **options)
+    question_set = generator.generate_topic_questions(volume_id, topic_id, total, seed=seed)
+    cursors = generator._get_cursors().snapshot(f"v{volume_id}_t{topic_id}_")
+    return question_set, generator.deferred_digests, cursors, GeneratorTelemetry.export()
+
+
+class QuestionGenerator:
+    CAPACITY_SAMPLE_SIZE = 200
+    CAPACITY_SAMPLE_SEED = 1_000_000
+    STREAM_CHUNK_SIZE = 25
+    GENERIC_ATTEMPTS = 10
+    BATCH_MIN_SIZE = 16
+    _capacity_cache: Dict[Tuple[str, Difficulty, bool], Tuple[CapacityEstimate, List[Tuple[str, Tuple[int, ...]]]]] = {}
+    _pool: Optional[ProcessPoolExecutor] = None
+    _pool_workers = 0
+    
+    def __init__(
+        self, 
+        global_dedup: bool = False, 
+        near_duplicate_check: bool = True,
+        on_exhausted: str = "reroute",
+        workers: Optional[int] = None,
+        defer_commit: bool = False
+    ):
+        if on_exhausted not in ("reroute", "reject"):
+            raise ValueError(f"Unknown exhaustion policy: {on_exhausted}")
+        self.generated_count = 0
+        self.near_duplicate_check = near_duplicate_check
+        self.global_dedup = global_dedup
+        self.on_exhausted = on_exhausted
+        self.workers = workers
+        # Worker processes leave registry writes to the parent: accepted
+        # digests are collected here and reconciled after the merge.
+        self.defer_commit = defer_commit
+        self.deferred_digests: List[str] = []
     
     @classmethod
-    def get_instance(cls, volume_id: Optional[int] = None, topic_id: Optional[str] = None) -> 'UniqueHashRegistry':
-        key = f"v{volume_id}_t{topic_id}" if volume_id and topic_id else f"v{volume_id}" if volume_id else "global"
-        if key not in cls._instances:
-            cls._instances[key] = cls(volume_id, topic_id)
-        return cls._instances[key]
+    def _get_pool(cls, workers: int) -> ProcessPoolExecutor:
+        if cls._pool is None or cls._pool_workers != workers:
+            cls.shutdown_pool()
+            # Spawned rather than forked: the registry flusher thread and
+            # SQLite connections must not be duplicated into children.
+            cls._pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            cls._pool_workers = workers
+        return cls._pool
     
-    def __init__(self, volume_id: Optional[int] = None, topic_id: Optional[str] = None):
-        self._hashes: Set[str] = set()
-        self.volume_id = volume_id
-        self.topic_id = topic_id
-        os.makedirs(self.CACHE_DIR, exist_ok=True)
-        self._load_cache()
+    @classmethod
+    def shutdown_pool(cls):
+        if cls._pool is not None:
+            cls._pool.shutdown()
+            cls._pool = None
+            cls._pool_workers = 0
+    
+    @staticmethod
+    def topic_seed(volume_id: int, topic_id: str) -> int:
+        return zlib.crc32(f"{volume_id}:{topic_id}".encode())
+    
+    @contextmanager
+    def _lease_registries(
+        self, 
+        volume_id: int, 
+        topic_id: str
+    ) -> Iterator[Tuple[UniqueHashRegistry, Optional[UniqueHashRegistry]]]:
+        # Leased for the whole call, not cached on the generator: the registry
+        # LRU may evict an idle topic, but never one that is still in use.
+        with ExitStack() as stack:
+            registry = stack.enter_context(UniqueHashRegistry.lease(volume_id, topic_id))
+            global_registry = stack.enter_context(UniqueHashRegistry.lease()) if self.global_dedup else None
+            yield registry, global_registry
     
-    def _get_cache_file(self) -> str:
-        if self.volume_id and self.topic_id:
-            return os.path.join(self.CACHE_DIR, f"hashes_v{self.volume_id}_t{self.topic_id.replace('.', '_')}.json")
-        elif self.volume_id:
-            return os.path.join(self.CACHE_DIR, f"hashes_v{self.volume_id}.json")
-        return os.path.join(self.CACHE_DIR, "hashes_global.json")
+    def _get_cursors(self) -> ParameterCursors:
+        return ParameterCursors.get_instance(UniqueHashRegistry.CACHE_DIR)
     
-    def _load_cache(self):
-        cache_file = self._get_cache_file()
-        if os.path.exists(cache_file):
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    loaded_hashes = set(data.get('hashes', []))
-                    self._hashes.update(loaded_hashes)
-            except (json.JSONDecodeError, IOError):
-                pass
+    def _windowed(self) -> bool:
+        return bool(UniqueHashRegistry.WINDOW_SIZE or UniqueHashRegistry.WINDOW_DAYS)
     
-    def _save_cache(self):
-        cache_file = self._get_cache_file()
-        try:
-            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
-            with open(cache_file, 'w') as f:
-                json.dump({'hashes': list(self._hashes), 'count': len(self._hashes)}, f)
-        except IOError:
-            pass
+    def _cursor_key(self, volume_id: int, topic_id: str, difficulty: Difficulty) -> str:
+        return f"v{volume_id}_t{topic_id}_{difficulty.value}"
     
-    def is_unique(self, content: str) -> bool:
-        h = hashlib.md5(content.encode()).hexdigest()
-        if h in self._hashes:
-            return False
-        self._hashes.add(h)
-        self._save_cache()
-        return True
+    def _draw_key(self, volume_id: int, topic_id: str, difficulty: Difficulty) -> str:
+        return self._cursor_key(volume_id, topic_id, difficulty) + "_draws"
     
-    def register(self, content: str) -> str:
-        h = hashlib.md5(content.encode()).hexdigest()
-        self._hashes.add(h)
-        self._save_cache()
-        return h
+    def _generic_key(self, volume_id: int, topic_id: str, difficulty: Difficulty) -> str:
+        return self._cursor_key(volume_id, topic_id, difficulty) + "_generic"
     
-    def count(self) -> int:
-        return len(self._hashes)
+    def _run_generator(
+        self, 
+        spec: Optional[GeneratorSpec], 
+        topic: Topic, 
+        difficulty: Difficulty, 
+        seed: int
+    ) -> Question:
+        if spec is None or not spec.supports(difficulty):
+            return self._generate_generic(topic, difficulty, seed)
+        question = spec.func(self, topic, difficulty, seed)
+        if question:
+            question.id = QuestionKey(topic.id, difficulty, GenerationPath.SCALAR, spec.version, seed).encode()
+        return question
+    
+    def _generate_generic(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
+        question = self._generate_generic_question(topic, difficulty, seed)
+        question.id = QuestionKey(topic.id, difficulty, GenerationPath.GENERIC, GENERIC_VERSION, seed).encode()
+        return question
+    
+    def rebuild_question(self, question_id: str) -> Question:
+        key = QuestionKey.decode(question_id)
+        topic = get_topic(key.volume_id, key.topic_id)
+        if not topic:
+            raise ValueError(f"Topic {key.topic_id} not found in volume {key.volume_id}")
+        if key.path == GenerationPath.GENERIC:
+            if key.version != GENERIC_VERSION:
+                raise ValueError(f"Question {question_id} was built by generic generator version {key.version}, current is {GENERIC_VERSION}")
+            return self._generate_generic(topic, key.difficulty, key.seed)
+        
+        spec = get_generator_spec(key.topic_id)
+        if spec is None:
+            raise ValueError(f"No generator registered for topic {key.topic_id}")
+        if spec.version != key.version:
+            raise ValueError(f"Question {question_id} was built by generator version {key.version}, current is {spec.version}")
+        if key.path == GenerationPath.BATCH:
+            if spec.batch is None:
+                raise ValueError(f"Generator for topic {key.topic_id} has no batch path")
+            return spec.batch(self, topic, key.difficulty, [key.seed])[0]
+        return self._run_generator(spec, topic, key.difficulty, key.seed)
+    
+    def _run_draws(
+        self, 
+        spec: Optional[GeneratorSpec], 
+        topic: Topic, 
+        draws: List[Tuple[int, Difficulty, int]]
+    ) -> List[Tuple[int, Optional[Question]]]:
+        results = []
+        for difficulty in Difficulty:
+            group = [(slot, seed) for slot, d, seed in draws if d == difficulty]
+            if not group:
+                continue
+            started = time.perf_counter()
+            if spec and spec.batch and spec.supports(difficulty) and len(group) >= self.BATCH_MIN_SIZE:
+                questions = spec.batch(self, topic, difficulty, [seed for _, seed in group])
+                results.extend(zip([slot for slot, _ in group], questions))
+            else:
+                if spec is None or not spec.supports(difficulty):
+                    GeneratorTelemetry.record_fallback(topic.id, difficulty, "no_generator", len(group))
+                results.extend((slot, self._run_generator(spec, topic, difficulty, seed)) for slot, seed in group)
+            GeneratorTelemetry.record_attempts(topic.id, difficulty, len(group), time.perf_counter() - started)
+        results.sort(key=lambda item: item[0])
+        return results
     
-    def clear(self):
-        self._hashes.clear()
-        cache_file = self._get_cache_file()
-        if os.path.exists(cache_file):
-            try:
-                os.remove(cache_file)
-            except IOError:
-                pass
+    def estimate_capacity(self, volume_id: int, topic_id: str, difficulty: Difficulty) -> CapacityEstimate:
+        return self._sample_capacity(volume_id, topic_id, difficulty)[0]
     
-    @classmethod
-    def clear_all_instances(cls):
-        cls._instances.clear()
-
-
-class QuestionGenerator:
-    def __init__(self):
-        self.generated_count = 0
-        self._current_registry: Optional[UniqueHashRegistry] = None
-        self._current_volume_id: Optional[int] = None
-        self._current_topic_id: Optional[str] = None
+    def _sample_capacity(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        difficulty: Difficulty
+    ) -> Tuple[CapacityEstimate, List[Tuple[str, Tuple[int, ...]]]]:
+        key = (topic_id, difficulty, self.near_duplicate_check)
+        spec = get_generator_spec(topic_id)
+        space = spec.parameter_spaces.get(difficulty) if spec else None
+        if key not in self._capacity_cache and space is not None:
+            self._capacity_cache[key] = (
+                CapacityEstimate(topic_id=topic_id, difficulty=difficulty, capacity=space.size, declared=True),
+                []
+            )
+        elif key not in self._capacity_cache:
+            topic = get_topic(volume_id, topic_id)
+            sample = [
+                self._run_generator(spec, topic, difficulty, self.CAPACITY_SAMPLE_SEED + i)
+                for i in range(self.CAPACITY_SAMPLE_SIZE)
+            ]
+            signer = NearDuplicateIndex()
+            samples = [(q.dedup_key, signer.signature(q.statement)) for q in sample if q]
+            # With the near-duplicate check on, letter shuffles and renamed
+            # characters are one question, so distinct questions are counted
+            # on the normalized statement rather than on the exact hash.
+            keys = [signature if self.near_duplicate_check else digest for digest, signature in samples]
+            declared = spec.capacity.get(difficulty) if spec else None
+            estimate = CapacityEstimate(
+                topic_id=topic_id,
+                difficulty=difficulty,
+                capacity=declared if declared is not None else estimate_distinct(keys),
+                declared=declared is not None,
+                sample_size=len(samples)
+            )
+            self._capacity_cache[key] = (estimate, samples)
+        return self._capacity_cache[key]
     
-    def _get_registry(self, volume_id: int, topic_id: str) -> UniqueHashRegistry:
-        if self._current_volume_id != volume_id or self._current_topic_id != topic_id:
-            self._current_registry = UniqueHashRegistry.get_instance(volume_id, topic_id)
-            self._current_volume_id = volume_id
-            self._current_topic_id = topic_id
-        return self._current_registry
+    def _taken(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        registry: UniqueHashRegistry, 
+        samples: List[Tuple[str, Tuple[int, ...]]]
+    ) -> List[bool]:
+        # A sample draw is used up if it is in the registry or if the
+        # near-duplicate check would reject it.
+        near_duplicates = (
+            NearDuplicateIndex.get_instance(UniqueHashRegistry.CACHE_DIR, volume_id, topic_id)
+            if self.near_duplicate_check else None
+        )
+        return [
+            registry.contains_digest(digest)
+            or near_duplicates is not None and near_duplicates.find(signature) is not None
+            for digest, signature in samples
+        ]
+    
+    def remaining_capacity(self, volume_id: int, topic_id: str, difficulty: Difficulty) -> Optional[int]:
+        spec = get_generator_spec(topic_id)
+        space = spec.parameter_spaces.get(difficulty) if spec else None
+        if space is not None:
+            remaining = self._get_cursors().remaining(self._cursor_key(volume_id, topic_id, difficulty), space)
+            return remaining + space.size if self._windowed() else remaining
+        estimate, samples = self._sample_capacity(volume_id, topic_id, difficulty)
+        with UniqueHashRegistry.lease(volume_id, topic_id) as registry:
+            return estimate_remaining(estimate.capacity, self._taken(volume_id, topic_id, registry, samples))
+    
+    def _remaining_share(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        difficulty: Difficulty, 
+        registry: UniqueHashRegistry
+    ) -> Optional[float]:
+        estimate, samples = self._sample_capacity(volume_id, topic_id, difficulty)
+        remaining = estimate_remaining(estimate.capacity, self._taken(volume_id, topic_id, registry, samples))
+        if remaining is None or not estimate.capacity:
+            return None
+        return remaining / estimate.capacity
+    
+    def plan_distribution(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        distribution: Dict[Difficulty, int]
+    ) -> Tuple[Dict[Difficulty, int], Dict[Difficulty, int]]:
+        remaining = {
+            difficulty: self.remaining_capacity(volume_id, topic_id, difficulty)
+            for difficulty in Difficulty
+        }
+        planned: Dict[Difficulty, int] = {}
+        overflow: Dict[Difficulty, int] = {}
+        for difficulty, count in distribution.items():
+            available = remaining[difficulty]
+            take = count if available is None else min(count, available)
+            planned[difficulty] = take
+            overflow[difficulty] = count - take
+            if available is not None:
+                remaining[difficulty] = available - take
+        
+        total_overflow = sum(overflow.values())
+        if total_overflow and self.on_exhausted == "reject":
+            raise CapacityExhaustedError(
+                f"Topic {topic_id} cannot produce {total_overflow} more unique questions "
+                f"(remaining: {', '.join(f'{d.value}={r}' for d, r in remaining.items())})"
+            )
+        
+        for difficulty in (Difficulty.MEDIO, Difficulty.FACIL, Difficulty.DIFICIL):
+            available = remaining[difficulty]
+            for source in overflow:
+                extra = overflow[source] if available is None else min(overflow[source], available)
+                if extra <= 0:
+                    continue
+                planned[difficulty] = planned.get(difficulty, 0) + extra
+                overflow[source] -= extra
+                if available is not None:
+                    available -= extra
+            remaining[difficulty] = available
+        return planned, overflow
     
     def generate_question(
         self, 
@@ -117,138 +343,288 @@ class QuestionGenerator:
         difficulty: Difficulty,
         attempt: int = 0
     ) -> Optional[Question]:
-        registry = self._get_registry(volume_id, topic_id)
+        questions = self.generate_questions(volume_id, topic_id, [(difficulty, attempt)])
+        return questions[0] if questions else None
+    
+    def _reserve(
+        self, 
+        registry: UniqueHashRegistry, 
+        global_registry: Optional[UniqueHashRegistry], 
+        digests: List[str]
+    ) -> List[bool]:
+        topic_accepted = registry.reserve(digests)
+        if not global_registry:
+            return topic_accepted
+        global_ok = iter(global_registry.reserve([d for d, ok in zip(digests, topic_accepted) if ok]))
+        accepted = [ok and next(global_ok) for ok in topic_accepted]
+        # Only release what this call reserved in the topic: a repeated digest
+        # rejected by the topic must not free its first copy's reservation.
+        registry.abort([
+            d for d, topic_ok, ok in zip(digests, topic_accepted, accepted) if topic_ok and not ok
+        ])
+        return accepted
+    
+    def generate_questions(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        slots: List[Tuple[Difficulty, int]],
+        fallback: Optional[str] = None
+    ) -> List[Question]:
+        # A slot that cannot get a unique question is dropped, so the result
+        # may be shorter than the slots asked for.
         topic = get_topic(volume_id, topic_id)
         if not topic:
-            return None
+            return []
+        with self._lease_registries(volume_id, topic_id) as (registry, global_registry):
+            results = self._generate_leased(volume_id, topic, slots, registry, global_registry, fallback)
+        return [question for question in results if question is not None]
+    
+    def _generate_leased(
+        self, 
+        volume_id: int, 
+        topic: Topic, 
+        slots: List[Tuple[Difficulty, int]], 
+        registry: UniqueHashRegistry, 
+        global_registry: Optional[UniqueHashRegistry],
+        fallback: Optional[str] = None
+    ) -> List[Optional[Question]]:
+        topic_id = topic.id
+        spec = get_generator_spec(topic_id)
+        near_duplicates = (
+            NearDuplicateIndex.get_instance(UniqueHashRegistry.CACHE_DIR, volume_id, topic_id)
+            if self.near_duplicate_check else None
+        )
+        # Signatures only reach the shared index once their questions are
+        # committed; until then this call's picks are checked against a
+        # private in-memory index, which an abort simply drops.
+        pending_signatures = NearDuplicateIndex() if near_duplicates is not None else None
+        signatures = []
         
-        generator_map = {
-            "1.1": self._generate_logic_question,
-            "1.2": self._generate_sets_question,
-            "1.3": self._generate_numeric_sets_question,
-            "1.4": self._generate_relations_functions_question,
-            "1.5": self._generate_linear_function_question,
-            "1.6": self._generate_quadratic_function_question,
-            "1.7": self._generate_modular_question,
-            "1.8": self._generate_composition_inverse_question,
-            "2.1": self._generate_powers_question,
-            "2.2": self._generate_radicals_question,
-            "2.3": self._generate_exponential_function_question,
-            "2.4": self._generate_logarithm_question,
-            "2.5": self._generate_log_function_question,
-            "3.1": self._generate_trig_triangle_question,
-            "3.2": self._generate_arcs_angles_question,
-            "3.3": self._generate_trig_functions_question,
-            "3.4": self._generate_trig_identities_question,
-            "3.5": self._generate_trig_equations_question,
-            "3.6": self._generate_law_sines_cosines_question,
-            "4.1": self._generate_sequences_question,
-            "4.2": self._generate_ap_question,
-            "4.3": self._generate_gp_question,
-            "4.4": self._generate_matrices_question,
-            "4.5": self._generate_determinants_question,
-            "4.6": self._generate_linear_systems_question,
-            "5.1": self._generate_counting_principle_question,
-            "5.2": self._generate_permutations_question,
-            "5.3": self._generate_arrangements_question,
-            "5.4": self._generate_combinations_question,
-            "5.5": self._generate_binomial_question,
-            "5.6": self._generate_probability_question,
-            "5.7": self._generate_conditional_prob_question,
-            "5.8": self._generate_binomial_dist_question,
-            "6.1": self._generate_complex_algebraic_question,
-            "6.2": self._generate_complex_trig_question,
-            "6.3": self._generate_polynomial_def_question,
-            "6.4": self._generate_polynomial_division_question,
-            "6.5": self._generate_polynomial_equations_question,
-            "6.6": self._generate_roots_question,
-            "7.1": self._generate_point_line_question,
-            "7.2": self._generate_relative_positions_question,
-            "7.3": self._generate_point_line_distance_question,
-            "7.4": self._generate_circle_question,
-            "7.5": self._generate_ellipse_question,
-            "7.6": self._generate_hyperbola_question,
-            "7.7": self._generate_parabola_question,
-            "8.1": self._generate_limits_intuitive_question,
-            "8.2": self._generate_limits_properties_question,
-            "8.3": self._generate_infinite_limits_question,
-            "8.4": self._generate_continuity_question,
-            "8.5": self._generate_derivative_def_question,
-            "8.6": self._generate_derivative_rules_question,
-            "8.7": self._generate_derivative_elementary_question,
-            "8.8": self._generate_derivative_applications_question,
-            "8.9": self._generate_integral_question,
-            "9.1": self._generate_geometry_fundamentals_question,
-            "9.2": self._generate_triangles_question,
-            "9.3": self._generate_congruence_question,
-            "9.4": self._generate_similarity_question,
-            "9.5": self._generate_metric_relations_question,
-            "9.6": self._generate_quadrilaterals_question,
-            "9.7": self._generate_regular_polygons_question,
-            "9.8": self._generate_circle_properties_question,
-            "9.9": self._generate_areas_question,
-            "10.1": self._generate_spatial_position_question,
-            "10.2": self._generate_perpendicularity_question,
-            "10.3": self._generate_polyhedra_question,
-            "10.4": self._generate_prisms_question,
-            "10.5": self._generate_pyramids_question,
-            "10.6": self._generate_cylinder_question,
-            "10.7": self._generate_cone_question,
-            "10.8": self._generate_sphere_question,
-            "10.9": self._generate_inscribed_circumscribed_question,
-            "11.1": self._generate_ratios_proportions_question,
-            "11.2": self._generate_rule_of_three_question,
-            "11.3": self._generate_percentage_question,
-            "11.4": self._generate_simple_interest_question,
-            "11.5": self._generate_compound_interest_question,
-            "11.6": self._generate_statistics_tables_question,
-            "11.7": self._generate_central_measures_question,
-            "11.8": self._generate_dispersion_measures_question,
-        }
+        spaces = spec.parameter_spaces if spec else {}
+        cursors = self._get_cursors()
+        results: List[Optional[Question]] = [None] * len(slots)
+        reserved: List[str] = []
+        open_slots = list(range(len(slots)))
+        exhausted: Dict[int, str] = {slot: fallback for slot in open_slots} if fallback else {}
+        generic_attempts: Dict[int, int] = {}
+        dropped: Set[int] = set()
+        wrapped: Set[Difficulty] = set()
+        shares = {
+            difficulty: self._remaining_share(volume_id, topic_id, difficulty, registry)
+            for difficulty in {difficulty for difficulty, _ in slots} if difficulty not in spaces
+        } if not fallback else {}
+        attempt = 0
+        while open_slots:
+            # Re-read every round: the budget follows the collision rate this
+            # very request is running into.
+            budgets = {
+                difficulty: GeneratorTelemetry.retry_budget(topic_id, difficulty, shares.get(difficulty))
+                for difficulty in {slots[slot][0] for slot in open_slots}
+            }
+            draws = []
+            generic_draws = []
+            offsets: Dict[Difficulty, int] = {}
+            generic_offsets: Dict[Difficulty, int] = {}
+            for slot in open_slots:
+                difficulty, seed = slots[slot]
+                space = spaces.get(difficulty)
+                if slot in exhausted:
+                    # Fallbacks go through the same reserve, near-duplicate
+                    # check and commit as everything else, with their own
+                    # persisted draw counter; a slot the generic generator
+                    # cannot fill either is dropped rather than repeated.
+                    if generic_attempts.get(slot, 0) >= self.GENERIC_ATTEMPTS:
+                        dropped.add(slot)
+                        continue
+                    generic_attempts[slot] = generic_attempts.get(slot, 0) + 1
+                    if difficulty not in generic_offsets:
+                        generic_offsets[difficulty] = cursors.advance(self._generic_key(volume_id, topic_id, difficulty), len(slots))
+                    generic_draws.append((slot, difficulty, seed + generic_offsets[difficulty]))
+                elif space is not None:
+                    # Enumerated domains are walked without replacement: a
+                    # draw only fails if an older run already produced it,
+                    # so keep advancing until the space runs out.
+                    key = self._cursor_key(volume_id, topic_id, difficulty)
+                    index = cursors.next_index(key, space)
+                    if index is None and self._windowed() and difficulty not in wrapped:
+                        # A windowed registry forgets old draws, so a walked
+                        # space starts a new epoch instead of falling back to
+                        # the generic generator for good; once per request so
+                        # a fully reserved space still terminates.
+                        wrapped.add(difficulty)
+                        cursors.wrap(key, space)
+                        index = cursors.next_index(key, space)
+                    if index is None:
+                        exhausted[slot] = "space_exhausted"
+                        continue
+                    draws.append((slot, difficulty, index))
+                elif attempt < budgets[difficulty]:
+                    # Generators are pure functions of their seed; the offset
+                    # comes from a counter persisted with the cursors, so
+                    # neither a retry nor a later process replays draws the
+                    # registry already holds. The id encodes the final seed.
+                    if difficulty not in offsets:
+                        offsets[difficulty] = cursors.advance(self._draw_key(volume_id, topic_id, difficulty), len(slots))
+                    draws.append((slot, difficulty, seed + offsets[difficulty]))
+                else:
+                    exhausted[slot] = "retries_exhausted"
+            candidates = [(slot, q) for slot, q in self._run_draws(spec, topic, draws) if q]
+            candidates.extend(
+                (slot, self._generate_generic(topic, difficulty, seed)) for slot, difficulty, seed in generic_draws
+            )
+            
+            digests = [q.dedup_key for _, q in candidates]
+            accepted = self._reserve(registry, global_registry, digests)
+            
+            rejected = []
+            outcomes: Dict[Difficulty, List[int]] = {}
+            for (slot, question), ok in zip(candidates, accepted):
+                # Generic draws stay out of the topic's collision rate, which
+                # sizes the topic's own retry budget.
+                counts = outcomes.setdefault(question.difficulty, [0, 0, 0]) if slot not in exhausted else [0, 0, 0]
+                if not ok:
+                    counts[1] += 1
+                    continue
+                if near_duplicates is not None:
+                    signature = near_duplicates.signature(question.statement)
+                    if near_duplicates.find(signature) is not None or pending_signatures.find(signature) is not None:
+                        rejected.append(question.dedup_key)
+                        counts[2] += 1
+                        continue
+                    pending_signatures.add(signature)
+                    signatures.append(signature)
+                results[slot] = question
+                reserved.append(question.dedup_key)
+                self.generated_count += 1
+                counts[0] += 1
+            for difficulty, (ok_count, collisions, near_count) in outcomes.items():
+                GeneratorTelemetry.record_outcomes(topic_id, difficulty, ok_count, collisions, near_count)
+            
+            if rejected:
+                registry.abort(rejected)
+                if global_registry:
+                    global_registry.abort(rejected)
+            open_slots = [slot for slot in open_slots if results[slot] is None and slot not in dropped]
+            attempt += 1
         
-        generator = generator_map.get(topic_id, self._generate_generic_question)
+        if self.defer_commit:
+            registry.abort(reserved)
+            if global_registry:
+                global_registry.abort(reserved)
+            self.deferred_digests.extend(reserved)
+            # Later calls in this worker still see them; the parent persists
+            # the ones that survive reconciliation.
+            for signature in signatures:
+                near_duplicates.add(signature, persist=False)
+        else:
+            registry.commit(reserved)
+            if global_registry:
+                global_registry.commit(reserved)
+            cursors.save()
+            for signature in signatures:
+                near_duplicates.add(signature)
         
-        max_attempts = 10
-        for i in range(max_attempts):
-            question = generator(topic, difficulty, attempt + i)
-            if question:
-                content_hash = f"{question.statement}{question.correct_answer}"
-                if registry.is_unique(content_hash):
-                    self.generated_count += 1
-                    return question
+        fallbacks: Dict[Tuple[Difficulty, str], int] = {}
+        for slot, reason in exhausted.items():
+            if slot not in dropped:
+                key = (slots[slot][0], reason)
+                fallbacks[key] = fallbacks.get(key, 0) + 1
+        for (difficulty, reason), count in fallbacks.items():
+            GeneratorTelemetry.record_fallback(topic_id, difficulty, reason, count)
+        for difficulty in Difficulty:
+            GeneratorTelemetry.record_dropped(topic_id, difficulty, sum(1 for slot in dropped if slots[slot][0] == difficulty))
+        return results
+    
+    def iter_topic_questions(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        total: int,
+        seed: int = 0,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Question]:
+        topic = get_topic(volume_id, topic_id)
+        if not topic:
+            raise ValueError(f"Topic {topic_id} not found in volume {volume_id}")
+        
+        distribution = calculate_question_distribution(total)
+        planned, overflow = self.plan_distribution(volume_id, topic_id, distribution)
+        slots = [
+            (difficulty, seed + i)
+            for difficulty, count in planned.items()
+            for i in range(count)
+        ]
+        # Each chunk is one reserve/commit round trip, so the first questions
+        # go out after a single chunk regardless of the total requested.
+        chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        for start in range(0, len(slots), chunk_size):
+            yield from self.generate_questions(volume_id, topic_id, slots[start:start + chunk_size])
         
-        return self._generate_generic_question(topic, difficulty, attempt)
+        # Exhausted slots go straight to the generic generator instead of
+        # spinning through retries that are known to collide.
+        overflow_slots = [
+            (difficulty, seed + i)
+            for difficulty, count in overflow.items()
+            for i in range(count)
+        ]
+        if overflow_slots:
+            yield from self.generate_questions(volume_id, topic_id, overflow_slots, fallback="capacity_exhausted")
     
     def generate_topic_questions(
         self, 
         volume_id: int, 
         topic_id: str, 
-        total: int
+        total: int,
+        seed: int = 0
     ) -> QuestionSet:
         topic = get_topic(volume_id, topic_id)
         if not topic:
             raise ValueError(f"Topic {topic_id} not found in volume {volume_id}")
         
-        distribution = calculate_question_distribution(total)
         question_set = QuestionSet(
             volume_id=volume_id,
             topic_id=topic_id,
             topic_name=topic.name,
             questions=[]
         )
-        
-        for difficulty, count in distribution.items():
-            for i in range(count):
-                question = self.generate_question(volume_id, topic_id, difficulty, i)
-                if question:
-                    question_set.add_question(question)
+        for question in self.iter_topic_questions(volume_id, topic_id, total, seed, chunk_size=max(1, total)):
+            question_set.add_question(question)
         
         return question_set
     
+    def iter_volume_questions(
+        self, 
+        volume_id: int, 
+        questions_per_topic: int = 20,
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        topic_ids: Optional[Set[str]] = None
+    ) -> Iterator[Question]:
+        volume = get_volume(volume_id)
+        if not volume:
+            raise ValueError(f"Volume {volume_id} not found")
+        topics = [t for t in volume.topics if topic_ids is None or t.id in topic_ids]
+        
+        workers = workers if workers is not None else self.workers
+        if workers and workers > 1 and len(topics) > 1:
+            for topic_set in self._iter_topics_parallel(volume_id, topics, questions_per_topic, workers):
+                yield from topic_set.questions
+            return
+        for topic in topics:
+            yield from self.iter_topic_questions(
+                volume_id, 
+                topic.id, 
+                questions_per_topic,
+                seed=self.topic_seed(volume_id, topic.id),
+                chunk_size=chunk_size
+            )
+    
     def generate_volume_questions(
         self, 
         volume_id: int, 
-        questions_per_topic: int = 20
+        questions_per_topic: int = 20,
+        workers: Optional[int] = None
     ) -> VolumeQuestionSet:
         volume = get_volume(volume_id)
         if not volume:
@@ -260,26 +636,107 @@ class QuestionGenerator:
             topic_sets=[]
         )
         
-        for topic in volume.topics:
-            topic_set = self.generate_topic_questions(
-                volume_id, 
-                topic.id, 
-                questions_per_topic
+        workers = workers if workers is not None else self.workers
+        if workers and workers > 1 and len(volume.topics) > 1:
+            topic_sets = self._iter_topics_parallel(volume_id, volume.topics, questions_per_topic, workers)
+        else:
+            topic_sets = (
+                self.generate_topic_questions(
+                    volume_id, 
+                    topic.id, 
+                    questions_per_topic,
+                    seed=self.topic_seed(volume_id, topic.id)
+                )
+                for topic in volume.topics
             )
+        for topic_set in topic_sets:
             volume_set.add_topic_set(topic_set)
         
         return volume_set
+    
+    def _iter_topics_parallel(
+        self, 
+        volume_id: int, 
+        topics: List[Topic], 
+        questions_per_topic: int, 
+        workers: int
+    ) -> Iterator[QuestionSet]:
+        # Workers read the registries from disk, so pending hashes must be
+        # written out before the fan-out.
+        UniqueHashRegistry.flush_all()
+        settings = UniqueHashRegistry.settings()
+        options = {
+            "global_dedup": self.global_dedup,
+            "near_duplicate_check": self.near_duplicate_check,
+            "on_exhausted": self.on_exhausted,
+        }
+        pool = self._get_pool(workers)
+        futures = [
+            pool.submit(
+                _generate_topic_in_worker, settings, options, volume_id, topic.id,
+                questions_per_topic, self.topic_seed(volume_id, topic.id)
+            )
+            for topic in topics
+        ]
+        
+        cursors = self._get_cursors()
+        for topic, future in zip(topics, futures):
+            question_set, digests, topic_cursors, stats = future.result()
+            GeneratorTelemetry.merge(stats)
+            cursors.merge(topic_cursors)
+            cursors.save()
+            self._reconcile_topic(
+                volume_id, topic.id, question_set, digests,
+                self.topic_seed(volume_id, topic.id) + questions_per_topic
+            )
+            yield question_set
+    
+    def _reconcile_topic(
+        self, 
+        volume_id: int, 
+        topic_id: str, 
+        question_set: QuestionSet, 
+        digests: List[str], 
+        seed: int
+    ):
+        with self._lease_registries(volume_id, topic_id) as (registry, global_registry):
+            accepted = self._reserve(registry, global_registry, digests)
+            committed = [d for d, ok in zip(digests, accepted) if ok]
+            registry.commit(committed)
+            if global_registry:
+                global_registry.commit(committed)
+        self.generated_count += len(committed)
+        if self.near_duplicate_check:
+            near_duplicates = NearDuplicateIndex.get_instance(UniqueHashRegistry.CACHE_DIR, volume_id, topic_id)
+            kept = set(committed)
+            for question in question_set.questions:
+                if question.dedup_key in kept:
+                    near_duplicates.add(near_duplicates.signature(question.statement))
+        
+        # Another process or another topic's worker got there first: only
+        # these slots are regenerated, serially and against the live registry.
+        conflicts = {d for d, ok in zip(digests, accepted) if not ok}
+        if not conflicts:
+            return
+        positions = [i for i, q in enumerate(question_set.questions) if q.dedup_key in conflicts]
+        slots = [(question_set.questions[i].difficulty, seed + k) for k, i in enumerate(positions)]
+        with self._lease_registries(volume_id, topic_id) as (registry, global_registry):
+            replacements = self._generate_leased(
+                volume_id, get_topic(volume_id, topic_id), slots, registry, global_registry
+            )
+        for i, question in zip(positions, replacements):
+            question_set.questions[i] = question
+        question_set.questions = [q for q in question_set.questions if q is not None]
 
     def _create_alternatives(
         self, 
         correct: str, 
-        distractors: List[str]
+        distractors: List[str],
+        rng: Optional[random.Random] = None
     ) -> Tuple[List[Alternative], str]:
-        all_options = [correct] + distractors[:4]
-        while len(all_options) < 5:
-            all_options.append(f"Nenhuma das alternativas anteriores")
+        all_options = DistractorGenerator.complete_options(correct, distractors)
         
-        random.shuffle(all_options)
+        (rng or random).shuffle(all_options)
         
         alternatives = []
         correct_letter = ""
@@ -294,18 +751,19 @@ class QuestionGenerator:
         
         return alternatives, correct_letter
 
+    @register_generator("1.2", version=2)
     def _generate_sets_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
         if difficulty == Difficulty.FACIL:
-            a_elements = random.sample(range(1, 10), random.randint(3, 5))
-            b_elements = random.sample(range(1, 10), random.randint(3, 5))
+            a_elements = rng.sample(range(1, 10), rng.randint(3, 5))
+            b_elements = rng.sample(range(1, 10), rng.randint(3, 5))
             set_a = set(a_elements)
             set_b = set(b_elements)
             
-            operation = random.choice(["uniao", "intersecao", "diferenca"])
+            operation = rng.choice(["uniao", "intersecao", "diferenca"])
             
-            name = ContextGenerator.get_random_name()
+            name = ContextGenerator.get_random_name(rng=rng)
             
             if operation == "uniao":
                 result = set_a | set_b
@@ -326,10 +784,10 @@ class QuestionGenerator:
                 f"Em uma aula de matemática, o professor pediu aos alunos que, dados A = {format_set(set_a)} e B = {format_set(set_b)}, calculassem o conjunto {question_text.replace('determine ', '')}. O resultado correto é:",
             ]
             
-            statement = random.choice(patterns)
+            statement = rng.choice(patterns)
             correct_answer = format_set(result)
             
-            universe = set_a | set_b | {random.randint(11, 15)}
+            universe = set_a | set_b | {rng.randint(11, 15)}
             distractors = [format_set(d) for d in DistractorGenerator.set_distractors(result, universe)]
             
             if not distractors:
@@ -338,10 +796,10 @@ class QuestionGenerator:
             resolution_full = f"{resolution} Portanto, o resultado é {correct_answer}."
             
         elif difficulty == Difficulty.MEDIO:
-            n_total = random.randint(80, 150)
-            n_a = random.randint(30, n_total - 20)
-            n_b = random.randint(30, n_total - 20)
-            n_ab = random.randint(10, min(n_a, n_b) - 5)
+            n_total = rng.randint(80, 150)
+            n_a = rng.randint(30, n_total - 20)
+            n_b = rng.randint(30, n_total - 20)
+            n_ab = rng.randint(10, min(n_a, n_b) - 5)
             n_neither = n_total - (n_a + n_b - n_ab)
             
             if n_neither < 0:
@@ -355,9 +813,9 @@ class QuestionGenerator:
                 ("participantes de uma conferência", "assistiram à palestra A", "assistiram à palestra B"),
             ]
             
-            context, desc_a, desc_b = random.choice(context_options)
+            context, desc_a, desc_b = rng.choice(context_options)
             
-            question_type = random.choice(["only_a", "only_b", "at_least_one", "neither"])
+            question_type = rng.choice(["only_a", "only_b", "at_least_one", "neither"])
             
             if question_type == "only_a":
                 correct = n_a - n_ab
@@ -374,14 +832,14 @@ class QuestionGenerator:
             
             statement = f"Em uma pesquisa com {n_total} {context}, verificou-se que {n_a} {desc_a}, {n_b} {desc_b} e {n_ab} {desc_a.replace('praticam', 'praticam').replace('falam', 'falam')} e {desc_b} simultaneamente. Quantos {context.split(' de ')[0]} {question_part}?"
             
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = str(correct)
             
             resolution_full = f"Usando a fórmula de conjuntos: n(A ∪ B) = n(A) + n(B) - n(A ∩ B). O resultado é {correct}."
             
         else:
-            n = random.randint(3, 5)
-            sets_count = random.randint(2, 3)
+            n = rng.randint(3, 5)
+            sets_count = rng.randint(2, 3)
             
             statement = f"Seja U = {{1, 2, 3, ..., {2**n}}} o conjunto universo. Se A é o conjunto dos múltiplos de 2 em U, B é o conjunto dos múltiplos de 3 em U, e C é o conjunto dos múltiplos de 5 em U, determine o número de elementos do conjunto (A ∩ B) ∪ C'."
             
@@ -393,12 +851,12 @@ class QuestionGenerator:
             result = (multiples_2 & multiples_3) | (universe - multiples_5)
             correct = len(result)
             
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = str(correct)
             
             resolution_full = f"A ∩ B são os múltiplos de 6. C' são os não-múltiplos de 5. A união tem {correct} elementos."
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -411,18 +869,19 @@ class QuestionGenerator:
             resolution=resolution_full
         )
 
+    @register_generator("1.5", version=2)
     def _generate_linear_function_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
         if difficulty == Difficulty.FACIL:
-            a = random.choice([-3, -2, -1, 1, 2, 3, 4, 5])
-            b = random.randint(-10, 10)
+            a = rng.choice([-3, -2, -1, 1, 2, 3, 4, 5])
+            b = rng.randint(-10, 10)
             
-            question_type = random.choice(["value", "zero", "coefficient"])
-            name = ContextGenerator.get_random_name()
+            question_type = rng.choice(["value", "zero", "coefficient"])
+            name = ContextGenerator.get_random_name(rng=rng)
             
             if question_type == "value":
-                x_val = random.randint(-5, 5)
+                x_val = rng.randint(-5, 5)
                 correct = a * x_val + b
                 statement = f"Seja f(x) = {a}x {'+' if b >= 0 else '-'} {abs(b)}. O valor de f({x_val}) é:"
                 resolution = f"f({x_val}) = {a} · ({x_val}) {'+' if b >= 0 else '-'} {abs(b)} = {a * x_val} {'+' if b >= 0 else '-'} {abs(b)} = {correct}"
@@ -440,15 +899,15 @@ class QuestionGenerator:
                 statement = f"Na função f(x) = {a}x {'+' if b >= 0 else '-'} {abs(b)}, o coeficiente angular vale:"
                 resolution = f"O coeficiente angular é o número que multiplica x, ou seja, {a}."
             
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = format_number(correct)
             
         elif difficulty == Difficulty.MEDIO:
-            a1, b1 = random.randint(1, 5), random.randint(-10, 10)
-            a2, b2 = random.randint(1, 5), random.randint(-10, 10)
+            a1, b1 = rng.randint(1, 5), rng.randint(-10, 10)
+            a2, b2 = rng.randint(1, 5), rng.randint(-10, 10)
             
             while a1 == a2:
-                a2 = random.randint(1, 5)
+                a2 = rng.randint(1, 5)
             
             x_intersect = (b2 - b1) / (a1 - a2)
             y_intersect = a1 * x_intersect + b1
@@ -456,25 +915,24 @@ class QuestionGenerator:
             statement = f"As funções f(x) = {a1}x {'+' if b1 >= 0 else '-'} {abs(b1)} e g(x) = {a2}x {'+' if b2 >= 0 else '-'} {abs(b2)} se interceptam no ponto P. A soma das coordenadas de P é:"
             
             correct = x_intersect + y_intersect
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = format_number(correct)
             
             resolution = f"Igualando f(x) = g(x): {a1}x {'+' if b1 >= 0 else '-'} {abs(b1)} = {a2}x {'+' if b2 >= 0 else '-'} {abs(b2)}. Resolvendo, x = {format_number(x_intersect)} e y = {format_number(y_intersect)}. Soma = {format_number(correct)}."
             
         else:
-            a = Symbol('a')
-            m = random.randint(2, 5)
-            k = random.randint(1, 10)
+            m = rng.randint(2, 5)
+            k = rng.randint(1, 10)
             
             statement = f"Seja f: R → R uma função afim tal que f(f(x)) = {m**2}x + {k * (m + 1)}. Se f é crescente, o valor de f(1) é:"
             
             correct = m + k
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = str(correct)
             
             resolution = f"Se f(x) = ax + b, então f(f(x)) = a(ax + b) + b = a²x + ab + b. Comparando: a² = {m**2}, logo a = {m}. E ab + b = {k * (m + 1)}, logo b = {k}. Portanto, f(1) = {m} + {k} = {correct}."
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -487,18 +945,19 @@ class QuestionGenerator:
             resolution=resolution
         )
 
+    @register_generator("1.6", capacity={Difficulty.DIFICIL: 1}, version=2)
     def _generate_quadratic_function_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
         if difficulty == Difficulty.FACIL:
-            r1 = random.randint(-5, 5)
-            r2 = random.randint(-5, 5)
-            a = random.choice([-2, -1, 1, 2])
+            r1 = rng.randint(-5, 5)
+            r2 = rng.randint(-5, 5)
+            a = rng.choice([-2, -1, 1, 2])
             
             b = -a * (r1 + r2)
             c = a * r1 * r2
             
-            question_type = random.choice(["roots_sum", "roots_product", "vertex_x", "discriminant"])
+            question_type = rng.choice(["roots_sum", "roots_product", "vertex_x", "discriminant"])
             
             if question_type == "roots_sum":
                 correct = r1 + r2
@@ -517,19 +976,19 @@ class QuestionGenerator:
                 statement = f"O discriminante da equação {a}x² {'+' if b >= 0 else '-'} {abs(b)}x {'+' if c >= 0 else '-'} {abs(c)} = 0 é:"
                 resolution = f"Δ = b² - 4ac = {b}² - 4·{a}·{c} = {b**2} - {4*a*c} = {correct}."
             
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = format_number(correct)
             
         elif difficulty == Difficulty.MEDIO:
-            a = random.choice([-1, 1])
-            xv = random.randint(-3, 3)
-            yv = random.randint(-10, 10)
+            a = rng.choice([-1, 1])
+            xv = rng.randint(-3, 3)
+            yv = rng.randint(-10, 10)
             
             b = -2 * a * xv
             c = a * xv**2 + yv
             
-            name = ContextGenerator.get_random_name()
-            context = random.choice([
+            name = ContextGenerator.get_random_name(rng=rng)
+            context = rng.choice([
                 f"O lucro L(x) de uma empresa, em milhares de reais, em função da quantidade x de produtos vendidos, é dado por",
                 f"A altura h(t), em metros, de um projétil lançado verticalmente, em função do tempo t, em segundos, é dada por",
                 f"A receita R(p), em reais, de uma loja em função do preço p de um produto, é dada por",
@@ -538,13 +997,12 @@ class QuestionGenerator:
             statement = f"{context} {a}x² {'+' if b >= 0 else '-'} {abs(b)}x {'+' if c >= 0 else '-'} {abs(c)}. O valor {'máximo' if a < 0 else 'mínimo'} dessa grandeza é:"
             
             correct = yv
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             correct_answer = format_number(correct)
             
             resolution = f"O valor {'máximo' if a < 0 else 'mínimo'} ocorre no vértice. y_v = -Δ/(4a) = {correct}."
             
         else:
-            m = Symbol('m')
             statement = f"Para que a função f(x) = x² - 2mx + m + 6 tenha duas raízes reais positivas e distintas, o parâmetro m deve pertencer ao intervalo:"
             
             correct_answer = "m > 3"
@@ -552,7 +1010,7 @@ class QuestionGenerator:
             
             resolution = "Para duas raízes reais positivas e distintas: Δ > 0, soma > 0 e produto > 0. Resolvendo: m > 3."
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -565,19 +1023,20 @@ class QuestionGenerator:
             resolution=resolution
         )
 
+    @register_generator("5.6", batch=generate_probability_batch, version=2)
     def _generate_probability_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
         if difficulty == Difficulty.FACIL:
-            balls_type = random.choice(["bolas coloridas", "fichas numeradas", "cartas"])
+            balls_type = rng.choice(["bolas coloridas", "fichas numeradas", "cartas"])
             
             if balls_type == "bolas coloridas":
-                red = random.randint(3, 8)
-                blue = random.randint(2, 6)
-                green = random.randint(1, 4)
+                red = rng.randint(3, 8)
+                blue = rng.randint(2, 6)
+                green = rng.randint(1, 4)
                 total = red + blue + green
                 
-                color = random.choice(["vermelha", "azul", "verde"])
+                color = rng.choice(["vermelha", "azul", "verde"])
                 count = {"vermelha": red, "azul": blue, "verde": green}[color]
                 
                 statement = f"Uma urna contém {red} bolas vermelhas, {blue} bolas azuis e {green} bolas verdes. Retirando-se uma bola ao acaso, a probabilidade de ela ser {color} é:"
@@ -585,9 +1044,9 @@ class QuestionGenerator:
                 resolution = f"P({color}) = {count}/{total} = {format_number(correct)}"
                 
             elif balls_type == "fichas numeradas":
-                n = random.randint(10, 20)
+                n = rng.randint(10, 20)
                 
-                prop = random.choice(["par", "ímpar", "múltiplo de 3", "primo"])
+                prop = rng.choice(["par", "ímpar", "múltiplo de 3", "primo"])
                 
                 if prop == "par":
                     count = n // 2
@@ -596,7 +1055,7 @@ class QuestionGenerator:
                 elif prop == "múltiplo de 3":
                     count = n // 3
                 else:
-                    count = len([p for p in range(2, n + 1) if isprime(p)])
+                    count = prime_count(n)
                 
                 statement = f"De uma caixa com fichas numeradas de 1 a {n}, retira-se uma ficha ao acaso. A probabilidade de o número ser {prop} é:"
                 correct = count / n
@@ -608,14 +1067,14 @@ class QuestionGenerator:
             
             num, den = correct.as_integer_ratio() if hasattr(correct, 'as_integer_ratio') else (int(correct * 100), 100)
             correct_answer = format_number(correct)
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             
         elif difficulty == Difficulty.MEDIO:
-            scenario = random.choice(["urna_reposicao", "dados", "comite"])
+            scenario = rng.choice(["urna_reposicao", "dados", "comite"])
             
             if scenario == "urna_reposicao":
-                white = random.randint(3, 6)
-                black = random.randint(2, 5)
+                white = rng.randint(3, 6)
+                black = rng.randint(2, 5)
                 total = white + black
                 
                 statement = f"Uma urna contém {white} bolas brancas e {black} bolas pretas. Duas bolas são retiradas, uma após a outra, sem reposição. A probabilidade de ambas serem brancas é:"
@@ -627,10 +1086,10 @@ class QuestionGenerator:
                 correct = 6 / 36
                 resolution = "Casos favoráveis: (1,6), (2,5), (3,4), (4,3), (5,2), (6,1) = 6 casos. P = 6/36 = 1/6"
             else:
-                n = random.randint(8, 12)
-                women = random.randint(3, n - 3)
+                n = rng.randint(8, 12)
+                women = rng.randint(3, n - 3)
                 men = n - women
-                k = random.randint(2, 4)
+                k = rng.randint(2, 4)
                 
                 total_ways = math.comb(n, k)
                 all_women = math.comb(women, k) if women >= k else 0
@@ -640,12 +1099,12 @@ class QuestionGenerator:
                 resolution = f"C({women},{k})/C({n},{k}) = {all_women}/{total_ways} = {format_number(correct)}"
             
             correct_answer = format_number(correct)
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             
         else:
-            n = random.randint(5, 8)
-            k = random.randint(2, 3)
-            p = random.choice([0.5, 0.6, 0.7])
+            n = rng.randint(5, 8)
+            k = rng.randint(2, 3)
+            p = rng.choice([0.5, 0.6, 0.7])
             
             statement = f"Em um experimento binomial com {n} ensaios independentes e probabilidade de sucesso {p} em cada ensaio, a probabilidade de exatamente {k} sucessos é:"
             
@@ -653,9 +1112,9 @@ class QuestionGenerator:
             resolution = f"P(X={k}) = C({n},{k}) × {p}^{k} × {1-p}^{n-k} = {format_number(correct)}"
             
             correct_answer = format_number(round(correct, 4))
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [format_number(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [format_number(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -668,15 +1127,14 @@ class QuestionGenerator:
             resolution=resolution
         )
 
+    @register_generator("4.2", capacity={Difficulty.DIFICIL: 1}, parameter_spaces=AP_SPACES, batch=generate_ap_batch, version=2)
     def _generate_ap_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
         if difficulty == Difficulty.FACIL:
-            a1 = random.randint(1, 10)
-            r = random.randint(1, 5)
-            n = random.randint(5, 15)
-            
-            question_type = random.choice(["nth_term", "sum", "ratio"])
+            params = AP_SPACES[difficulty].params(seed)
+            a1, r, n = params["a1"], params["r"], params["n"]
+            question_type = params["question_type"]
             
             if question_type == "nth_term":
                 an = a1 + (n - 1) * r
@@ -696,16 +1154,15 @@ class QuestionGenerator:
                 resolution = f"r = a_2 - a_1 = {terms[1]} - {terms[0]} = {correct}"
             
             correct_answer = str(correct)
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             
         elif difficulty == Difficulty.MEDIO:
-            a1 = random.randint(1, 5)
-            r = random.randint(2, 4)
-            n = random.randint(10, 20)
+            params = AP_SPACES[difficulty].params(seed)
+            a1, r, n = params["a1"], params["r"], params["n"]
             
             an = a1 + (n - 1) * r
             
-            name = ContextGenerator.get_random_name()
+            name = ContextGenerator.get_random_name(rng=rng)
             statement = f"{name} começou a guardar dinheiro de forma progressiva: no primeiro mês guardou R$ {a1},00, no segundo R$ {a1+r},00, no terceiro R$ {a1+2*r},00, e assim por diante. Ao final de {n} meses, quanto {name} terá guardado no total?"
             
             sn = n * (a1 + an) // 2
@@ -713,7 +1170,7 @@ class QuestionGenerator:
             resolution = f"É uma PA com a_1 = {a1} e r = {r}. S_{n} = {n}×({a1} + {an})/2 = R$ {correct},00"
             
             correct_answer = str(correct)
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             
         else:
             statement = "Se x, y e z estão em PA, x², y² e z² estão em PA e x + y + z = 21, então x × y × z vale:"
@@ -728,7 +1185,7 @@ class QuestionGenerator:
             correct_answer = "280"
             distractors = ["231", "315", "245", "294"]
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -741,15 +1198,14 @@ class QuestionGenerator:
             resolution=resolution
         )
 
+    @register_generator("4.3", capacity={Difficulty.DIFICIL: 1}, parameter_spaces=GP_SPACES, batch=generate_gp_batch, version=2)
     def _generate_gp_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
         if difficulty == Difficulty.FACIL:
-            a1 = random.randint(1, 5)
-            q = random.randint(2, 3)
-            n = random.randint(4, 7)
-            
-            question_type = random.choice(["nth_term", "sum", "ratio"])
+            params = GP_SPACES[difficulty].params(seed)
+            a1, q, n = params["a1"], params["q"], params["n"]
+            question_type = params["question_type"]
             
             if question_type == "nth_term":
                 an = a1 * (q ** (n - 1))
@@ -768,15 +1224,15 @@ class QuestionGenerator:
                 resolution = f"q = a_2 / a_1 = {terms[1]} / {terms[0]} = {correct}"
             
             correct_answer = str(correct)
-            distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+            distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
             
         elif difficulty == Difficulty.MEDIO:
-            a1 = random.randint(100, 500)
-            q = random.choice([0.5, 0.8, 0.9])
+            params = GP_SPACES[difficulty].params(seed)
+            a1, q = params["a1"], params["q"]
             
             half_value = a1 * q ** 10
             
-            name = ContextGenerator.get_random_name()
+            name = ContextGenerator.get_random_name(rng=rng)
             statement = f"Um equipamento que custou R$ {a1},00 deprecia {int((1-q)*100)}% ao ano. Após 5 anos, seu valor será aproximadamente:"
             
             correct = a1 * (q ** 5)
@@ -794,7 +1250,7 @@ class QuestionGenerator:
             correct_answer = "4"
             distractors = ["3", "6", "8", "2"]
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -807,79 +1263,11 @@ class QuestionGenerator:
             resolution=resolution
         )
 
-    def _generate_percentage_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
-        
-        if difficulty == Difficulty.FACIL:
-            value = random.randint(100, 500) * 10
-            percent = random.choice([10, 15, 20, 25, 30])
-            
-            question_type = random.choice(["find_part", "after_increase", "after_discount"])
-            name = ContextGenerator.get_random_name()
-            
-            if question_type == "find_part":
-                correct = value * percent / 100
-                statement = f"{name} possui R$ {value},00 e deseja guardar {percent}% desse valor. Quanto {name} vai guardar?"
-                resolution = f"{percent}% de R$ {value},00 = {percent}/100 × {value} = R$ {correct:.2f}"
-            elif question_type == "after_increase":
-                correct = value * (1 + percent / 100)
-                statement = f"Um produto que custava R$ {value},00 sofreu um aumento de {percent}%. O novo preço é:"
-                resolution = f"Novo preço = {value} × (1 + {percent}/100) = {value} × {1 + percent/100} = R$ {correct:.2f}"
-            else:
-                correct = value * (1 - percent / 100)
-                statement = f"Uma loja oferece {percent}% de desconto em um produto de R$ {value},00. O preço com desconto é:"
-                resolution = f"Preço final = {value} × (1 - {percent}/100) = {value} × {1 - percent/100} = R$ {correct:.2f}"
-            
-            correct_answer = f"R$ {correct:.2f}"
-            distractors = [f"R$ {correct * d:.2f}" for d in [0.9, 1.1, 0.8, 1.2]]
-            
-        elif difficulty == Difficulty.MEDIO:
-            original = random.randint(100, 300) * 10
-            increase = random.choice([20, 25, 30, 40])
-            discount = random.choice([10, 15, 20, 25])
-            
-            after_increase = original * (1 + increase / 100)
-            final = after_increase * (1 - discount / 100)
-            net_change = ((final / original) - 1) * 100
-            
-            statement = f"Um produto teve seu preço aumentado em {increase}% e, em seguida, recebeu um desconto de {discount}%. A variação percentual líquida no preço foi de:"
-            
-            correct = net_change
-            resolution = f"Fator = (1 + {increase}/100) × (1 - {discount}/100) = {1 + increase/100} × {1 - discount/100} = {(1 + increase/100) * (1 - discount/100):.4f}. Variação = {correct:.2f}%"
-            
-            correct_answer = f"{correct:.1f}%"
-            distractors = [f"{correct + d:.1f}%" for d in [-5, 5, -10, 10]]
-            
-        else:
-            statement = "Em uma eleição com dois candidatos, A obteve 60% dos votos válidos. Se os votos brancos e nulos representaram 20% do total de votos e A teve 1.200.000 votos, o total de eleitores que compareceram às urnas foi:"
-            
-            valid_votes = 1200000 / 0.6
-            total_votes = valid_votes / 0.8
-            correct = int(total_votes)
-            
-            resolution = f"Votos de A = 60% dos válidos = 1.200.000, logo válidos = 2.000.000. Válidos = 80% do total, logo total = 2.500.000"
-            
-            correct_answer = "2.500.000"
-            distractors = ["2.000.000", "2.400.000", "3.000.000", "1.800.000"]
-        
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
-        
-        return Question(
-            id=str(uuid.uuid4())[:8],
-            volume_id=11,
-            topic_id=topic.id,
-            difficulty=difficulty,
-            statement=statement,
-            alternatives=alternatives,
-            correct_answer=correct_letter,
-            resolution=resolution
-        )
-
     def _generate_generic_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        random.seed(seed + self.generated_count)
+        rng = random.Random(seed)
         
-        a = random.randint(1, 20)
-        b = random.randint(1, 20)
+        a = rng.randint(1, 20)
+        b = rng.randint(1, 20)
         
         if difficulty == Difficulty.FACIL:
             correct = a + b
@@ -895,9 +1283,9 @@ class QuestionGenerator:
             resolution = f"{a}² + {b}² = {a**2} + {b**2} = {correct}"
         
         correct_answer = str(correct)
-        distractors = DistractorGenerator.numeric_distractors(correct, difficulty)
+        distractors = DistractorGenerator.numeric_distractors(correct, difficulty, rng=rng)
         
-        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors])
+        alternatives, correct_letter = self._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
         
         return Question(
             id=str(uuid.uuid4())[:8],
@@ -909,225 +1297,3 @@ class QuestionGenerator:
             correct_answer=correct_letter,
             resolution=resolution
         )
-
-    def _generate_logic_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_numeric_sets_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_relations_functions_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_modular_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_composition_inverse_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_powers_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_radicals_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_exponential_function_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_logarithm_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_log_function_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_trig_triangle_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_arcs_angles_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_trig_functions_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_trig_identities_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_trig_equations_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_law_sines_cosines_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_sequences_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_matrices_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_determinants_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_linear_systems_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_counting_principle_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_permutations_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_arrangements_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_combinations_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_binomial_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_conditional_prob_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_binomial_dist_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_complex_algebraic_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_complex_trig_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_polynomial_def_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_polynomial_division_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_polynomial_equations_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_roots_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_point_line_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_relative_positions_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_point_line_distance_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_circle_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_ellipse_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_hyperbola_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_parabola_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_limits_intuitive_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_limits_properties_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_infinite_limits_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_continuity_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_derivative_def_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_derivative_rules_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_derivative_elementary_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_derivative_applications_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_integral_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_geometry_fundamentals_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_triangles_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_congruence_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_similarity_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_metric_relations_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_quadrilaterals_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_regular_polygons_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_circle_properties_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_areas_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_spatial_position_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_perpendicularity_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_polyhedra_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_prisms_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_pyramids_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_cylinder_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_cone_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_sphere_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_inscribed_circumscribed_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_ratios_proportions_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_rule_of_three_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_simple_interest_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_compound_interest_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_statistics_tables_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_central_measures_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
-    
-    def _generate_dispersion_measures_question(self, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
-        return self._generate_generic_question(topic, difficulty, seed)
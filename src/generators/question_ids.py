@@ -0,0 +1,57 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from enum import Enum
+
+from ..models.curriculum import Difficulty
+
+
+class GenerationPath(Enum):
+    SCALAR = "s"
+    BATCH = "b"
+    GENERIC = "g"
+
+
+GENERIC_VERSION = 2
+
+_DIFFICULTY_CODES = {
+    Difficulty.FACIL: "f",
+    Difficulty.MEDIO: "m",
+    Difficulty.DIFICIL: "d",
+}
+_DIFFICULTIES = {code: difficulty for difficulty, code in _DIFFICULTY_CODES.items()}
+_ID_RE = re.compile(r"(\d+\.\d+)-([fmd])([sbg])(\d+)-([0-9a-f]+)")
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    # "4.2-mb1-2f" is topic 4.2, medium, batch path, generator version 1,
+    # seed 0x2f: everything needed to generate the same question again.
+    topic_id: str
+    difficulty: Difficulty
+    path: GenerationPath
+    version: int
+    seed: int
+
+    @property
+    def volume_id(self) -> int:
+        return int(self.topic_id.split('.')[0])
+
+    def encode(self) -> str:
+        if self.seed < 0:
+            raise ValueError(f"Question seeds must be non-negative, got {self.seed}")
+        return f"{self.topic_id}-{_DIFFICULTY_CODES[self.difficulty]}{self.path.value}{self.version}-{self.seed:x}"
+
+    @classmethod
+    def decode(cls, question_id: str) -> 'QuestionKey':
+        match = _ID_RE.fullmatch(question_id)
+        if not match:
+            raise ValueError(f"Invalid question id: {question_id}")
+        topic_id, difficulty, path, version, seed = match.groups()
+        return cls(
+            topic_id=topic_id,
+            difficulty=_DIFFICULTIES[difficulty],
+            path=GenerationPath(path),
+            version=int(version),
+            seed=int(seed, 16)
+        )
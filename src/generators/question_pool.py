@@ -0,0 +1,204 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..models.curriculum import Difficulty, get_topic, get_volume, calculate_question_distribution
+from ..models.question import Exam, Question, QuestionSet
+from .exam_builder import ExamBuilder, ExamConstraints, QuestionBank
+from .question_engine import QuestionGenerator
+
+
+PoolKey = Tuple[int, str, Difficulty]
+
+
+class QuestionPool:
+    LOW_WATERMARK = 10
+    HIGH_WATERMARK = 40
+    REFILL_BATCH = 10
+    # Share of wall time the refill thread may spend generating; the rest
+    # is left to request threads competing for the GIL.
+    REFILL_DUTY_CYCLE = 0.25
+    MAX_DEFER_SECONDS = 2.0
+
+    def __init__(
+        self,
+        generator: QuestionGenerator,
+        low_watermark: Optional[int] = None,
+        high_watermark: Optional[int] = None,
+        refill_batch: Optional[int] = None
+    ):
+        self.generator = generator
+        self.low_watermark = low_watermark if low_watermark is not None else self.LOW_WATERMARK
+        self.high_watermark = high_watermark if high_watermark is not None else self.HIGH_WATERMARK
+        if self.low_watermark > self.high_watermark:
+            raise ValueError("Low watermark must not exceed the high watermark")
+        self.refill_batch = refill_batch or self.REFILL_BATCH
+        self._pools: Dict[PoolKey, Deque[Question]] = {}
+        self._seeds: Dict[PoolKey, int] = {}
+        self._queue: 'OrderedDict[PoolKey, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._active_requests = 0
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._refill_loop, name="question-pool-refill", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _schedule(self, key: PoolKey):
+        if key not in self._queue:
+            self._queue[key] = None
+            self._wakeup.set()
+
+    def warm(self, volume_id: int, topic_id: Optional[str] = None):
+        if topic_id is None:
+            volume = get_volume(volume_id)
+            if not volume:
+                raise ValueError(f"Volume {volume_id} not found")
+            topic_ids = [topic.id for topic in volume.topics]
+        elif get_topic(volume_id, topic_id):
+            topic_ids = [topic_id]
+        else:
+            raise ValueError(f"Topic {topic_id} not found in volume {volume_id}")
+        with self._lock:
+            for tid in topic_ids:
+                for difficulty in Difficulty:
+                    self._pools.setdefault((volume_id, tid, difficulty), deque())
+                    self._schedule((volume_id, tid, difficulty))
+        self.start()
+
+    def size(self, volume_id: int, topic_id: str, difficulty: Difficulty) -> int:
+        with self._lock:
+            return len(self._pools.get((volume_id, topic_id, difficulty), ()))
+
+    def take(self, volume_id: int, topic_id: str, difficulty: Difficulty, count: int) -> List[Question]:
+        key = (volume_id, topic_id, difficulty)
+        self._begin_request()
+        try:
+            with self._lock:
+                pool = self._pools.setdefault(key, deque())
+                taken = [pool.popleft() for _ in range(min(count, len(pool)))]
+                if len(pool) < self.low_watermark:
+                    self._schedule(key)
+            missing = count - len(taken)
+            if missing:
+                # Cold or drained pool: serve the shortfall synchronously,
+                # the refill thread catches up for the next request.
+                seed = self._next_seed(key, missing)
+                slots = [(difficulty, seed + i) for i in range(missing)]
+                taken.extend(self.generator.generate_questions(volume_id, topic_id, slots))
+        finally:
+            self._end_request()
+        self.start()
+        return taken
+
+    def take_topic(self, volume_id: int, topic_id: str, total: int) -> QuestionSet:
+        topic = get_topic(volume_id, topic_id)
+        if not topic:
+            raise ValueError(f"Topic {topic_id} not found in volume {volume_id}")
+        question_set = QuestionSet(
+            volume_id=volume_id,
+            topic_id=topic_id,
+            topic_name=topic.name,
+            questions=[]
+        )
+        for difficulty, count in calculate_question_distribution(total).items():
+            for question in self.take(volume_id, topic_id, difficulty, count):
+                question_set.add_question(question)
+        return question_set
+
+    def assemble_exam(self, constraints: ExamConstraints, title: str = "Simulado") -> Exam:
+        # Only what is already pooled is used; the lock keeps a concurrent
+        # take() from handing out the same questions while they are chosen.
+        self._begin_request()
+        try:
+            with self._lock:
+                bank = QuestionBank(q for pool in self._pools.values() for q in pool)
+                exam = ExamBuilder(bank).build(constraints, title)
+                chosen = {q.hash_signature for q in exam.questions}
+                for key, pool in self._pools.items():
+                    kept = [q for q in pool if q.hash_signature not in chosen]
+                    if len(kept) != len(pool):
+                        self._pools[key] = deque(kept)
+                        if len(kept) < self.low_watermark:
+                            self._schedule(key)
+        finally:
+            self._end_request()
+        self.start()
+        return exam
+
+    def _begin_request(self):
+        with self._lock:
+            self._active_requests += 1
+            self._idle.clear()
+
+    def _end_request(self):
+        with self._lock:
+            self._active_requests -= 1
+            if not self._active_requests:
+                self._idle.set()
+
+    def _next_seed(self, key: PoolKey, count: int) -> int:
+        with self._lock:
+            if key not in self._seeds:
+                self._seeds[key] = QuestionGenerator.topic_seed(key[0], key[1])
+            seed = self._seeds[key]
+            self._seeds[key] += count
+            return seed
+
+    def _refill_loop(self):
+        while not self._stopped:
+            self._wakeup.wait()
+            with self._lock:
+                if not self._queue:
+                    self._wakeup.clear()
+                    continue
+                key = next(iter(self._queue))
+            self._refill(key)
+
+    def _refill(self, key: PoolKey):
+        volume_id, topic_id, difficulty = key
+        while not self._stopped:
+            # Live requests go first; the refill only waits a bounded time so
+            # a steady stream of traffic cannot drain the pools for good.
+            self._idle.wait(self.MAX_DEFER_SECONDS)
+            with self._lock:
+                missing = self.high_watermark - len(self._pools.setdefault(key, deque()))
+            remaining = self.generator.remaining_capacity(volume_id, topic_id, difficulty)
+            if remaining is not None:
+                missing = min(missing, remaining)
+            if missing <= 0:
+                break
+            batch = min(missing, self.refill_batch)
+            seed = self._next_seed(key, batch)
+            started = time.monotonic()
+            # generate_questions reserves and commits every hash, so pooled
+            # questions are unique by the time they are handed out.
+            questions = self.generator.generate_questions(
+                volume_id, topic_id, [(difficulty, seed + i) for i in range(batch)]
+            )
+            with self._lock:
+                self._pools[key].extend(questions)
+            if len(questions) < batch:
+                # Not even the generic fallback had unique questions left;
+                # asking again would only spin.
+                break
+            elapsed = time.monotonic() - started
+            time.sleep(elapsed * (1 - self.REFILL_DUTY_CYCLE) / self.REFILL_DUTY_CYCLE)
+        with self._lock:
+            self._queue.pop(key, None)
@@ -1,21 +1,40 @@
 from __future__ import annotations
+import itertools
+import logging
 import random
 import math
-from typing import List, Dict, Any, Tuple, Optional
-from dataclasses import dataclass
-from sympy import *
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Sequence, Tuple, Optional, Union
+from dataclasses import dataclass, field
 from ..models.curriculum import Difficulty
+from .parameter_space import ParameterSpace
+from .number_tables import (
+    is_prime, pick_nice_fraction, pick_prime, pick_pythagorean_triple, pick_with_parity
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class QuestionTemplate:
+    # Declarative question: expressions are Python expressions over the
+    # parameter, context and derived names; patterns are str.format strings
+    # over the same names plus `answer`. See template_compiler.
     id: str
     topic_id: str
     difficulty: Difficulty
     template_type: str
-    generate_func: callable
-    contexts: List[str]
+    parameters: ParameterSpace
     statement_patterns: List[str]
+    answer: str
+    resolution: str
+    answer_format: str = "{}"
+    derived: Dict[str, str] = field(default_factory=dict)
+    constraints: List[str] = field(default_factory=list)
+    distractors: List[str] = field(default_factory=list)
+    contexts: Dict[str, Sequence[str]] = field(default_factory=dict)
 
 
 class ContextGenerator:
@@ -74,142 +93,236 @@ class ContextGenerator:
     ]
     
     @classmethod
-    def get_random_name(cls) -> str:
-        return random.choice(cls.PEOPLE_NAMES)
+    def get_random_name(cls, rng: Optional[random.Random] = None) -> str:
+        return (rng or random).choice(cls.PEOPLE_NAMES)
     
     @classmethod
-    def get_random_names(cls, n: int) -> List[str]:
-        return random.sample(cls.PEOPLE_NAMES, min(n, len(cls.PEOPLE_NAMES)))
+    def get_random_names(cls, n: int, rng: Optional[random.Random] = None) -> List[str]:
+        return (rng or random).sample(cls.PEOPLE_NAMES, min(n, len(cls.PEOPLE_NAMES)))
     
     @classmethod
-    def get_random_profession(cls) -> str:
-        return random.choice(cls.PROFESSIONS)
+    def get_random_profession(cls, rng: Optional[random.Random] = None) -> str:
+        return (rng or random).choice(cls.PROFESSIONS)
     
     @classmethod
-    def get_random_company(cls) -> str:
-        return random.choice(cls.COMPANIES)
+    def get_random_company(cls, rng: Optional[random.Random] = None) -> str:
+        return (rng or random).choice(cls.COMPANIES)
     
     @classmethod
-    def get_random_city(cls) -> str:
-        return random.choice(cls.CITIES)
+    def get_random_city(cls, rng: Optional[random.Random] = None) -> str:
+        return (rng or random).choice(cls.CITIES)
     
     @classmethod
-    def get_random_cities(cls, n: int) -> List[str]:
-        return random.sample(cls.CITIES, min(n, len(cls.CITIES)))
+    def get_random_cities(cls, n: int, rng: Optional[random.Random] = None) -> List[str]:
+        return (rng or random).sample(cls.CITIES, min(n, len(cls.CITIES)))
     
     @classmethod
-    def get_random_product(cls) -> str:
-        return random.choice(cls.PRODUCTS)
+    def get_random_product(cls, rng: Optional[random.Random] = None) -> str:
+        return (rng or random).choice(cls.PRODUCTS)
     
     @classmethod
-    def get_random_geometric_object(cls) -> str:
-        return random.choice(cls.GEOMETRIC_OBJECTS)
+    def get_random_geometric_object(cls, rng: Optional[random.Random] = None) -> str:
+        return (rng or random).choice(cls.GEOMETRIC_OBJECTS)
 
 
 class NumberGenerator:
     @staticmethod
-    def prime(min_val: int = 2, max_val: int = 50) -> int:
-        primes = [p for p in range(min_val, max_val + 1) if isprime(p)]
-        return random.choice(primes) if primes else 2
+    def prime(min_val: int = 2, max_val: int = 50, rng: Optional[random.Random] = None) -> int:
+        prime = pick_prime(min_val, max_val, rng)
+        return prime if prime is not None else 2
     
     @staticmethod
-    def integer(min_val: int, max_val: int) -> int:
-        return random.randint(min_val, max_val)
+    def integer(min_val: int, max_val: int, rng: Optional[random.Random] = None) -> int:
+        return (rng or random).randint(min_val, max_val)
     
     @staticmethod
-    def positive_integer(max_val: int = 100) -> int:
-        return random.randint(1, max_val)
+    def positive_integer(max_val: int = 100, rng: Optional[random.Random] = None) -> int:
+        return (rng or random).randint(1, max_val)
     
     @staticmethod
-    def even(min_val: int = 2, max_val: int = 100) -> int:
-        nums = [n for n in range(min_val, max_val + 1) if n % 2 == 0]
-        return random.choice(nums) if nums else 2
+    def even(min_val: int = 2, max_val: int = 100, rng: Optional[random.Random] = None) -> int:
+        n = pick_with_parity(min_val, max_val, 0, rng)
+        return n if n is not None else 2
     
     @staticmethod
-    def odd(min_val: int = 1, max_val: int = 99) -> int:
-        nums = [n for n in range(min_val, max_val + 1) if n % 2 == 1]
-        return random.choice(nums) if nums else 1
+    def odd(min_val: int = 1, max_val: int = 99, rng: Optional[random.Random] = None) -> int:
+        n = pick_with_parity(min_val, max_val, 1, rng)
+        return n if n is not None else 1
     
     @staticmethod
-    def fraction_nice() -> Tuple[int, int]:
-        denominators = [2, 3, 4, 5, 6, 8, 10, 12]
-        d = random.choice(denominators)
-        n = random.randint(1, d - 1)
-        g = math.gcd(n, d)
-        return n // g, d // g
+    def fraction_nice(rng: Optional[random.Random] = None) -> Tuple[int, int]:
+        return pick_nice_fraction(rng)
     
     @staticmethod
-    def percentage() -> int:
-        return random.choice([5, 10, 15, 20, 25, 30, 40, 50, 60, 75, 80])
+    def percentage(rng: Optional[random.Random] = None) -> int:
+        return (rng or random).choice([5, 10, 15, 20, 25, 30, 40, 50, 60, 75, 80])
     
     @staticmethod
-    def angle_notable() -> int:
-        return random.choice([30, 45, 60, 90, 120, 135, 150, 180])
+    def angle_notable(rng: Optional[random.Random] = None) -> int:
+        return (rng or random).choice([30, 45, 60, 90, 120, 135, 150, 180])
     
     @staticmethod
-    def pythagorean_triple() -> Tuple[int, int, int]:
-        triples = [
-            (3, 4, 5), (5, 12, 13), (8, 15, 17), (7, 24, 25),
-            (6, 8, 10), (9, 12, 15), (12, 16, 20), (15, 20, 25)
-        ]
-        return random.choice(triples)
+    def pythagorean_triple(
+        max_hypotenuse: int = 25, 
+        primitive: bool = False, 
+        rng: Optional[random.Random] = None
+    ) -> Tuple[int, int, int]:
+        return pick_pythagorean_triple(max_hypotenuse, primitive, rng)
+
+
+# Filler texts for option lists that still come up short after numeric
+# variants; each is used at most once so alternatives never repeat.
+FILLER_ALTERNATIVES = (
+    "Nenhuma das alternativas anteriores",
+    "Não é possível determinar com os dados apresentados",
+    "Faltam dados para responder",
+)
+
+_NUMBER_RE = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _integer_transforms(c: int, difficulty: Difficulty) -> List[int]:
+    # Typical slips: off by one, forgotten halving or doubling, sign error,
+    # carry error, swapped digits.
+    if difficulty == Difficulty.FACIL:
+        return [c + 1, c - 1, c * 2, c // 2, c + 2, c - 2, -c]
+    if difficulty == Difficulty.MEDIO:
+        return [c + 1, c - 1, c * 2, c // 2, c + 10, c - 10, -c, c + 2, c - 2, c + 3, c - 3]
+    reversed_digits = int(str(abs(c))[::-1]) * (1 if c >= 0 else -1)
+    return [c + 1, c - 1, reversed_digits, -c, c * 2, c + 5, c - 5, c % 10, c + 2, c - 2]
+
+
+def _float_transforms(c: float, difficulty: Difficulty) -> List[float]:
+    # Slips with decimals: wrong factor, complement of a probability, small
+    # shifts from rounding too early.
+    near = [c + 0.1, c - 0.1, c + 0.25, c - 0.25]
+    far = [c * 2, c / 2, c + 1, c - 1, c + 0.5, c - 0.5]
+    scaled = [c * 1.5, c * 0.75, 1 - c, -c]
+    if difficulty == Difficulty.FACIL:
+        return far + scaled + near
+    if difficulty == Difficulty.MEDIO:
+        return scaled + far + near
+    return near + scaled + far
+
+
+@lru_cache(maxsize=4096)
+def _numeric_pool(correct: float, difficulty: Difficulty, size: int) -> Tuple[Union[int, float], ...]:
+    # Misconception transforms first, then neighbours of the answer, which
+    # never run out; values are kept only when their text is new, so callers
+    # may format with str or format_number and still get distinct options.
+    integral = float(correct).is_integer()
+    if integral:
+        correct = int(correct)
+        step = 1
+        transforms: List[Any] = _integer_transforms(correct, difficulty)
+    else:
+        step = 0.01 if abs(correct) < 1 else 0.1 if abs(correct) < 100 else 1
+        transforms = [round(v, 2) for v in _float_transforms(correct, difficulty)]
+    # A hundred steps each way is enough even for a probability, where
+    # everything outside (0, 1) is filtered out.
+    ladder = (round(correct + sign * k * step, 2) for k in range(1, size + 100) for sign in (1, -1))
+    seen = {format_number(correct)}
+    pool: List[Union[int, float]] = []
+    for value in itertools.chain(transforms, ladder):
+        if correct > 0 and value <= 0 or 0 < correct < 1 and value >= 1:
+            continue
+        if not integral and float(value).is_integer():
+            value = int(value)
+        text = format_number(value)
+        if text not in seen:
+            seen.add(text)
+            pool.append(value)
+            if len(pool) == size:
+                break
+    return tuple(pool)
+
+
+def _numeric_variants(text: str, count: int) -> List[str]:
+    matches = list(_NUMBER_RE.finditer(text))
+    if not matches:
+        return []
+    match = matches[-1]
+    number = match.group()
+    decimals = len(number.partition(".")[2])
+    correct = float(number) if decimals else int(number)
+    return [
+        f"{text[:match.start()]}{value:.{decimals}f}{text[match.end():]}"
+        for value in _numeric_pool(correct, Difficulty.MEDIO, count)
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _parse_expression(source: str) -> Optional[Any]:
+    # Failures are cached too, so a bad expression is reported and paid for
+    # once instead of on every question that uses it.
+    from sympy import sympify
+    from sympy.core.sympify import SympifyError
+    try:
+        return sympify(source)
+    except SympifyError as e:
+        logger.warning("Cannot parse expression %r for distractors: %s", source, e)
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _derived_expressions(expr: Any) -> Tuple[str, ...]:
+    # Keyed by the parsed expression, whose equality is structural, so
+    # "x**2+1" and "1 + x**2" share one entry.
+    canonical = str(expr)
+    try:
+        candidates = [-expr, expr + 1, expr - 1, 2 * expr, expr / 2]
+    except TypeError:
+        # Parsed to something that is not arithmetic, e.g. a Lambda.
+        return ()
+    derived: List[str] = []
+    for candidate in candidates:
+        text = str(candidate)
+        if text != canonical and text not in derived:
+            derived.append(text)
+    return tuple(derived)
 
 
 class DistractorGenerator:
+    # Distractors are sampled from a pool this large, so the same answer does
+    # not always get the same four wrong options.
+    POOL_SIZE = 8
+
     @staticmethod
-    def numeric_distractors(correct: float, difficulty: Difficulty, count: int = 4) -> List[float]:
-        distractors = set()
-        
-        if isinstance(correct, int):
-            errors = []
-            if difficulty == Difficulty.FACIL:
-                errors = [1, -1, 2, -2, correct // 2 if correct > 1 else 1, correct * 2]
-            elif difficulty == Difficulty.MEDIO:
-                errors = [1, -1, 2, -2, 3, -3, correct + 10, correct - 10, correct * 2, correct // 2]
-            else:
-                errors = [1, -1, 2, -2, 5, -5, correct % 10 if correct > 10 else 1, 
-                         int(str(correct)[::-1]) if correct > 9 else correct + 1]
-            
-            for err in errors:
-                if isinstance(err, (int, float)):
-                    val = correct + err if random.random() > 0.5 else err
-                    if val != correct and val > 0:
-                        distractors.add(int(val))
-        else:
-            base_errors = [0.1, -0.1, 0.5, -0.5, 1, -1, 0.25, -0.25]
-            mult_errors = [2, 0.5, 1.5, 0.75]
-            
-            for err in base_errors:
-                val = round(correct + err, 2)
-                if val != correct and val > 0:
-                    distractors.add(val)
-            
-            for mult in mult_errors:
-                val = round(correct * mult, 2)
-                if val != correct and val > 0:
-                    distractors.add(val)
-        
-        distractors_list = list(distractors)
-        random.shuffle(distractors_list)
-        return distractors_list[:count]
+    def numeric_distractors(correct: float, difficulty: Difficulty, count: int = 4, rng: Optional[random.Random] = None) -> List[float]:
+        pool = _numeric_pool(correct, difficulty, max(count, DistractorGenerator.POOL_SIZE))
+        return (rng or random).sample(pool, count)
+
+    @staticmethod
+    def complete_options(correct: str, distractors: Sequence[str], total: int = 5) -> List[str]:
+        # Correct answer first, then distinct distractors; a short list is
+        # topped up with variants of the last number in the answer (or in a
+        # distractor), and only then with the filler texts.
+        options = [correct]
+        for text in distractors:
+            if text not in options:
+                options.append(text)
+                if len(options) == total:
+                    return options
+        for source in list(options):
+            for text in _numeric_variants(source, total * 2):
+                if text not in options:
+                    options.append(text)
+                    if len(options) == total:
+                        return options
+        for text in FILLER_ALTERNATIVES:
+            if text not in options:
+                options.append(text)
+                if len(options) == total:
+                    return options
+        raise ValueError(f"Cannot build {total} distinct alternatives for {correct!r}")
     
     @staticmethod
     def expression_distractors(correct_expr: str, var_symbol: str = 'x') -> List[str]:
-        x = Symbol(var_symbol)
-        try:
-            expr = sympify(correct_expr)
-            distractors = []
-            
-            distractors.append(str(-expr))
-            distractors.append(str(expr + 1))
-            distractors.append(str(expr - 1))
-            distractors.append(str(2 * expr))
-            distractors.append(str(expr / 2))
-            
-            filtered = [d for d in distractors if d != correct_expr and d != str(expr)]
-            return filtered[:4]
-        except:
+        expr = _parse_expression(correct_expr)
+        derived = [d for d in _derived_expressions(expr) if d != correct_expr] if expr is not None else []
+        if not derived:
             return [f"{var_symbol} + 1", f"{var_symbol} - 1", f"2{var_symbol}", f"-{var_symbol}"]
+        return derived[:4]
     
     @staticmethod
     def set_distractors(correct_set: set, universe: set) -> List[set]:
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.curriculum import Difficulty
+
+
+logger = logging.getLogger(__name__)
+
+StatsKey = Tuple[str, Difficulty]
+
+
+@dataclass
+class GeneratorStats:
+    attempts: int = 0
+    accepted: int = 0
+    collisions: int = 0
+    near_duplicates: int = 0
+    seconds: float = 0.0
+    fallbacks: Dict[str, int] = field(default_factory=dict)
+    dropped: int = 0
+    # Exponentially decayed over the last ~1 / (1 - DECAY) draws, so the
+    # retry budget follows the registry as it fills up.
+    recent_draws: float = 0.0
+    recent_failures: float = 0.0
+
+    @property
+    def collision_rate(self) -> Optional[float]:
+        if not self.recent_draws:
+            return None
+        return self.recent_failures / self.recent_draws
+
+    @property
+    def seconds_per_attempt(self) -> float:
+        return self.seconds / self.attempts if self.attempts else 0.0
+
+    @property
+    def wasted_seconds(self) -> float:
+        return self.seconds_per_attempt * (self.collisions + self.near_duplicates)
+
+    def merge(self, other: GeneratorStats):
+        self.attempts += other.attempts
+        self.accepted += other.accepted
+        self.collisions += other.collisions
+        self.near_duplicates += other.near_duplicates
+        self.seconds += other.seconds
+        for reason, count in other.fallbacks.items():
+            self.fallbacks[reason] = self.fallbacks.get(reason, 0) + count
+        self.dropped += other.dropped
+        self.recent_draws += other.recent_draws
+        self.recent_failures += other.recent_failures
+
+
+class GeneratorTelemetry:
+    DEFAULT_ATTEMPTS = 10
+    MIN_ATTEMPTS = 3
+    MAX_ATTEMPTS = 40
+    # Retry until at most this share of slots would still be left to the
+    # generic fallback, given the observed collision rate.
+    FAILURE_TARGET = 1e-3
+    # Past this rate retries almost never land; give up early instead of
+    # spending MAX_ATTEMPTS draws on every slot, but only once the capacity
+    # estimate agrees that at most EXHAUSTED_SHARE of the space is left.
+    # Otherwise the failures are replays or a near-duplicate streak.
+    FUTILE_RATE = 0.98
+    EXHAUSTED_SHARE = 0.05
+    DECAY = 0.99
+    MIN_OBSERVATIONS = 20
+    _stats: Dict[StatsKey, GeneratorStats] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get(cls, topic_id: str, difficulty: Difficulty) -> GeneratorStats:
+        key = (topic_id, difficulty)
+        stats = cls._stats.get(key)
+        if stats is None:
+            stats = cls._stats[key] = GeneratorStats()
+        return stats
+
+    @classmethod
+    def record_attempts(cls, topic_id: str, difficulty: Difficulty, count: int, seconds: float):
+        with cls._lock:
+            stats = cls._get(topic_id, difficulty)
+            stats.attempts += count
+            stats.seconds += seconds
+
+    @classmethod
+    def record_outcomes(
+        cls,
+        topic_id: str,
+        difficulty: Difficulty,
+        accepted: int,
+        collisions: int,
+        near_duplicates: int
+    ):
+        draws = accepted + collisions + near_duplicates
+        if not draws:
+            return
+        with cls._lock:
+            stats = cls._get(topic_id, difficulty)
+            stats.accepted += accepted
+            stats.collisions += collisions
+            stats.near_duplicates += near_duplicates
+            weight = cls.DECAY ** draws
+            stats.recent_draws = stats.recent_draws * weight + draws
+            stats.recent_failures = stats.recent_failures * weight + collisions + near_duplicates
+
+    @classmethod
+    def record_fallback(cls, topic_id: str, difficulty: Difficulty, reason: str, count: int = 1):
+        if count <= 0:
+            return
+        with cls._lock:
+            stats = cls._get(topic_id, difficulty)
+            first = reason not in stats.fallbacks
+            stats.fallbacks[reason] = stats.fallbacks.get(reason, 0) + count
+        # Warn once per cause; the running totals are in report().
+        logger.log(
+            logging.WARNING if first else logging.DEBUG,
+            "Topic %s (%s): %d generic question(s) served instead, reason: %s",
+            topic_id, difficulty.value, count, reason
+        )
+
+    @classmethod
+    def record_dropped(cls, topic_id: str, difficulty: Difficulty, count: int):
+        if count <= 0:
+            return
+        with cls._lock:
+            stats = cls._get(topic_id, difficulty)
+            first = not stats.dropped
+            stats.dropped += count
+        logger.log(
+            logging.WARNING if first else logging.DEBUG,
+            "Topic %s (%s): %d slot(s) left empty, not even the generic generator had a unique question",
+            topic_id, difficulty.value, count
+        )
+
+    @classmethod
+    def retry_budget(
+        cls,
+        topic_id: str,
+        difficulty: Difficulty,
+        remaining_share: Optional[float] = None
+    ) -> int:
+        with cls._lock:
+            stats = cls._stats.get((topic_id, difficulty))
+            rate = stats.collision_rate if stats and stats.recent_draws >= cls.MIN_OBSERVATIONS else None
+        if rate is None:
+            return cls.DEFAULT_ATTEMPTS
+        if rate >= cls.FUTILE_RATE:
+            exhausted = remaining_share is not None and remaining_share <= cls.EXHAUSTED_SHARE
+            return cls.MIN_ATTEMPTS if exhausted else cls.DEFAULT_ATTEMPTS
+        if rate <= 0:
+            return cls.MIN_ATTEMPTS
+        # A slot still fails after k independent draws with probability rate^k.
+        needed = math.ceil(math.log(cls.FAILURE_TARGET) / math.log(rate))
+        return max(cls.MIN_ATTEMPTS, min(cls.MAX_ATTEMPTS, needed))
+
+    @classmethod
+    def export(cls) -> Dict[StatsKey, GeneratorStats]:
+        with cls._lock:
+            return {key: GeneratorStats(**{**vars(stats), "fallbacks": dict(stats.fallbacks)})
+                    for key, stats in cls._stats.items()}
+
+    @classmethod
+    def merge(cls, stats: Dict[StatsKey, GeneratorStats]):
+        # Worker processes keep their own counters; the parent folds them in
+        # after each task so the report covers the whole run.
+        with cls._lock:
+            for (topic_id, difficulty), other in stats.items():
+                cls._get(topic_id, difficulty).merge(other)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._stats.clear()
+
+    @classmethod
+    def report(cls) -> List[Dict[str, Any]]:
+        rows = []
+        for (topic_id, difficulty), stats in cls.export().items():
+            rate = stats.collision_rate
+            rows.append({
+                "topic_id": topic_id,
+                "difficulty": difficulty.value,
+                "attempts": stats.attempts,
+                "accepted": stats.accepted,
+                "collisions": stats.collisions,
+                "near_duplicates": stats.near_duplicates,
+                "collision_rate": round(rate, 4) if rate is not None else None,
+                "retry_budget": cls.retry_budget(topic_id, difficulty),
+                "fallbacks": dict(stats.fallbacks),
+                "dropped": stats.dropped,
+                "ms_per_attempt": round(stats.seconds_per_attempt * 1000, 3),
+                "wasted_seconds": round(stats.wasted_seconds, 3),
+            })
+        rows.sort(key=lambda row: (-row["wasted_seconds"], -sum(row["fallbacks"].values()), row["topic_id"]))
+        return rows
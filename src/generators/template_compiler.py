@@ -0,0 +1,223 @@
+from __future__ import annotations
+import ast
+import math
+import random
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Sequence, Set
+
+from ..models.curriculum import Difficulty, Topic
+from ..models.question import Question
+from .generator_registry import register_generator
+from .parameter_space import ParameterSpace, ParameterSubset, ParameterUnion
+from .question_ids import GenerationPath, QuestionKey
+from .question_templates import QuestionTemplate
+
+if TYPE_CHECKING:
+    from .question_engine import QuestionGenerator
+
+
+Scope = Dict[str, Any]
+
+# Templates are written in this repo, not by users; the restricted globals
+# keep expressions to arithmetic and catch typos at compile time.
+_EXPRESSION_GLOBALS: Dict[str, Any] = {
+    "__builtins__": {},
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "int": int,
+    "float": float,
+    "sum": sum,
+    "range": range,
+    "len": len,
+    "math": math,
+    "sqrt": math.sqrt,
+    "gcd": math.gcd,
+}
+_FORMATTER = Formatter()
+
+
+def _free_names(tree: ast.AST) -> Set[str]:
+    loaded, stored = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            (loaded if isinstance(node.ctx, ast.Load) else stored).add(node.id)
+    return loaded - stored
+
+
+class _ScopeLookups(ast.NodeTransformer):
+    def __init__(self, names: Set[str]):
+        self.names = names
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id not in self.names:
+            return node
+        lookup = ast.Subscript(value=ast.Name(id="_s", ctx=ast.Load()), slice=ast.Constant(node.id), ctx=ast.Load())
+        return ast.copy_location(lookup, node)
+
+
+def compile_expression(source: str, names: Iterable[str], label: str) -> Callable[[Scope], Any]:
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"{label}: invalid expression {source!r}: {e.msg}") from None
+    free = _free_names(tree)
+    unknown = free - set(names) - set(_EXPRESSION_GLOBALS)
+    if unknown:
+        raise ValueError(f"{label}: unknown name(s) {', '.join(sorted(unknown))} in {source!r}")
+    # Rewritten to `lambda _s: <expr with _s["name"] lookups>` so evaluating
+    # an expression is one call into compiled bytecode.
+    body = _ScopeLookups(free & set(names)).visit(tree.body)
+    arguments = ast.arguments(
+        posonlyargs=[], args=[ast.arg(arg="_s")], kwonlyargs=[], kw_defaults=[], defaults=[]
+    )
+    function = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=arguments, body=body)))
+    return eval(compile(function, f"<{label}>", "eval"), _EXPRESSION_GLOBALS)
+
+
+def _escape_literal(text: str) -> str:
+    return (text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            .replace("{", "{{").replace("}", "}}"))
+
+
+def compile_pattern(pattern: str, names: Iterable[str], label: str) -> Callable[[Scope], str]:
+    # Split once into literal and slot segments, then emitted as a single
+    # f-string lambda so rendering never re-parses the pattern.
+    known = set(names)
+    try:
+        parsed = list(_FORMATTER.parse(pattern))
+    except ValueError as e:
+        raise ValueError(f"{label}: invalid pattern {pattern!r}: {e}") from None
+    segments = []
+    for literal, slot, spec, conversion in parsed:
+        segments.append(_escape_literal(literal))
+        if slot is None:
+            continue
+        if conversion or not slot.isidentifier() or "{" in spec:
+            raise ValueError(f"{label}: slot {{{slot}}} must be a plain name with a literal format spec")
+        if slot not in known:
+            raise ValueError(f"{label}: unknown slot {{{slot}}} in {pattern!r}")
+        segments.append(f"{{_s[{slot!r}]:{spec}}}" if spec else f"{{_s[{slot!r}]}}")
+    return eval(f'lambda _s: f"{"".join(segments)}"', _EXPRESSION_GLOBALS)
+
+
+class CompiledTemplate:
+    def __init__(self, template: QuestionTemplate):
+        label = f"template {template.id}"
+        if not template.statement_patterns:
+            raise ValueError(f"{label}: needs at least one statement pattern")
+        self.template = template
+        parameters = list(template.parameters.names)
+        self._contexts = [(name, tuple(template.contexts[name])) for name in sorted(template.contexts)]
+        names = parameters + [name for name, _ in self._contexts]
+
+        # Constraints are checked once per parameter combination here, so they
+        # can only see parameters; everything else is fixed per question.
+        self._constraints = [compile_expression(c, parameters, label) for c in template.constraints]
+        self._derived = []
+        for name, source in template.derived.items():
+            self._derived.append((name, compile_expression(source, names, f"{label}, {name}")))
+            names.append(name)
+        self._answer = compile_expression(template.answer, names, label)
+        names.append("answer")
+        self._distractors = [compile_expression(d, names, label) for d in template.distractors]
+        self._statements = [compile_pattern(p, names, label) for p in template.statement_patterns]
+        self._resolution = compile_pattern(template.resolution, names, label)
+        self._format_answer = template.answer_format.format
+
+        space = template.parameters
+        if self._constraints:
+            space = ParameterSubset(space, self._accepts)
+            if not space.size:
+                raise ValueError(f"{label}: constraints reject every parameter combination")
+        self.space = space
+
+    def _accepts(self, params: Scope) -> bool:
+        return all(constraint(params) for constraint in self._constraints)
+
+    def render(
+        self,
+        engine: QuestionGenerator,
+        topic: Topic,
+        difficulty: Difficulty,
+        seed: int,
+        key: QuestionKey,
+        params: Scope
+    ) -> Question:
+        rng = random.Random(seed)
+        scope = dict(params)
+        for name, options in self._contexts:
+            scope[name] = rng.choice(options)
+        for name, expression in self._derived:
+            scope[name] = expression(scope)
+        scope["answer"] = self._answer(scope)
+        correct_answer = self._format_answer(scope["answer"])
+
+        distractors: List[str] = []
+        for expression in self._distractors:
+            text = self._format_answer(expression(scope))
+            if text != correct_answer and text not in distractors:
+                distractors.append(text)
+
+        statements = self._statements
+        statement = statements[rng.randrange(len(statements))] if len(statements) > 1 else statements[0]
+        alternatives, correct_letter = engine._create_alternatives(correct_answer, distractors, rng)
+        return Question(
+            id=key.encode(),
+            volume_id=key.volume_id,
+            topic_id=topic.id,
+            difficulty=difficulty,
+            statement=statement(scope),
+            alternatives=alternatives,
+            correct_answer=correct_letter,
+            resolution=self._resolution(scope)
+        )
+
+
+class TemplateGenerator:
+    def __init__(self, topic_id: str, templates: Sequence[QuestionTemplate], version: int = 1):
+        self.topic_id = topic_id
+        self.version = version
+        self.templates: Dict[Difficulty, List[CompiledTemplate]] = {}
+        seen: Set[str] = set()
+        for template in templates:
+            if template.topic_id != topic_id:
+                raise ValueError(f"Template {template.id} belongs to topic {template.topic_id}, not {topic_id}")
+            if template.id in seen:
+                raise ValueError(f"Duplicate template id {template.id}")
+            seen.add(template.id)
+            self.templates.setdefault(template.difficulty, []).append(CompiledTemplate(template))
+        # Several templates for one difficulty share its seed range: the
+        # union maps each seed to one template and an index in its domain.
+        self.parameter_spaces: Dict[Difficulty, ParameterSpace] = {
+            difficulty: compiled[0].space if len(compiled) == 1 else ParameterUnion(*(c.space for c in compiled))
+            for difficulty, compiled in self.templates.items()
+        }
+
+    def __call__(self, engine: QuestionGenerator, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
+        compiled = self.templates[difficulty]
+        if len(compiled) == 1:
+            template, index = compiled[0], seed
+        else:
+            position, index = self.parameter_spaces[difficulty].locate(seed)
+            template = compiled[position]
+        key = QuestionKey(topic.id, difficulty, GenerationPath.SCALAR, self.version, seed)
+        return template.render(engine, topic, difficulty, seed, key, template.space.params(index))
+
+
+def register_templates(
+    topic_id: str,
+    templates: Sequence[QuestionTemplate],
+    cost: float = 1.0,
+    version: int = 1
+) -> TemplateGenerator:
+    generator = TemplateGenerator(topic_id, templates, version)
+    register_generator(
+        topic_id,
+        difficulties=generator.templates,
+        parameter_spaces=generator.parameter_spaces,
+        cost=cost,
+        version=version
+    )(generator)
+    return generator
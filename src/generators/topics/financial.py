@@ -0,0 +1,328 @@
+from __future__ import annotations
+import random
+import uuid
+from typing import TYPE_CHECKING, Dict
+
+from ...models.curriculum import Difficulty, Topic
+from ...models.question import Question
+from ..generator_registry import register_generator
+from ..parameter_space import ParameterSpace
+from ..question_templates import ContextGenerator, QuestionTemplate
+from ..template_compiler import register_templates
+
+if TYPE_CHECKING:
+    from ..question_engine import QuestionGenerator
+
+
+PERCENTAGE_SPACES: Dict[Difficulty, ParameterSpace] = {
+    Difficulty.FACIL: ParameterSpace(
+        question_type=["find_part", "after_increase", "after_discount"],
+        value=range(1000, 5010, 10),
+        percent=[10, 15, 20, 25, 30]
+    ),
+    Difficulty.MEDIO: ParameterSpace(increase=[20, 25, 30, 40], discount=[10, 15, 20, 25]),
+}
+
+
+@register_generator("11.3", capacity={Difficulty.DIFICIL: 1}, parameter_spaces=PERCENTAGE_SPACES)
+def generate_percentage_question(engine: QuestionGenerator, topic: Topic, difficulty: Difficulty, seed: int) -> Question:
+    rng = random.Random(seed)
+
+    if difficulty == Difficulty.FACIL:
+        params = PERCENTAGE_SPACES[difficulty].params(seed)
+        value, percent = params["value"], params["percent"]
+        question_type = params["question_type"]
+        name = ContextGenerator.get_random_name(rng=rng)
+
+        if question_type == "find_part":
+            correct = value * percent / 100
+            statement = f"{name} possui R$ {value},00 e deseja guardar {percent}% desse valor. Quanto {name} vai guardar?"
+            resolution = f"{percent}% de R$ {value},00 = {percent}/100 × {value} = R$ {correct:.2f}"
+        elif question_type == "after_increase":
+            correct = value * (1 + percent / 100)
+            statement = f"Um produto que custava R$ {value},00 sofreu um aumento de {percent}%. O novo preço é:"
+            resolution = f"Novo preço = {value} × (1 + {percent}/100) = {value} × {1 + percent/100} = R$ {correct:.2f}"
+        else:
+            correct = value * (1 - percent / 100)
+            statement = f"Uma loja oferece {percent}% de desconto em um produto de R$ {value},00. O preço com desconto é:"
+            resolution = f"Preço final = {value} × (1 - {percent}/100) = {value} × {1 - percent/100} = R$ {correct:.2f}"
+
+        correct_answer = f"R$ {correct:.2f}"
+        distractors = [f"R$ {correct * d:.2f}" for d in [0.9, 1.1, 0.8, 1.2]]
+
+    elif difficulty == Difficulty.MEDIO:
+        params = PERCENTAGE_SPACES[difficulty].params(seed)
+        original = rng.randint(100, 300) * 10
+        increase, discount = params["increase"], params["discount"]
+
+        after_increase = original * (1 + increase / 100)
+        final = after_increase * (1 - discount / 100)
+        net_change = ((final / original) - 1) * 100
+
+        statement = f"Um produto teve seu preço aumentado em {increase}% e, em seguida, recebeu um desconto de {discount}%. A variação percentual líquida no preço foi de:"
+
+        correct = net_change
+        resolution = f"Fator = (1 + {increase}/100) × (1 - {discount}/100) = {1 + increase/100} × {1 - discount/100} = {(1 + increase/100) * (1 - discount/100):.4f}. Variação = {correct:.2f}%"
+
+        correct_answer = f"{correct:.1f}%"
+        distractors = [f"{correct + d:.1f}%" for d in [-5, 5, -10, 10]]
+
+    else:
+        statement = "Em uma eleição com dois candidatos, A obteve 60% dos votos válidos. Se os votos brancos e nulos representaram 20% do total de votos e A teve 1.200.000 votos, o total de eleitores que compareceram às urnas foi:"
+
+        valid_votes = 1200000 / 0.6
+        total_votes = valid_votes / 0.8
+        correct = int(total_votes)
+
+        resolution = f"Votos de A = 60% dos válidos = 1.200.000, logo válidos = 2.000.000. Válidos = 80% do total, logo total = 2.500.000"
+
+        correct_answer = "2.500.000"
+        distractors = ["2.000.000", "2.400.000", "3.000.000", "1.800.000"]
+
+    alternatives, correct_letter = engine._create_alternatives(correct_answer, [str(d) for d in distractors], rng)
+
+    return Question(
+        id=str(uuid.uuid4())[:8],
+        volume_id=11,
+        topic_id=topic.id,
+        difficulty=difficulty,
+        statement=statement,
+        alternatives=alternatives,
+        correct_answer=correct_letter,
+        resolution=resolution
+    )
+
+
+SIMPLE_INTEREST_TEMPLATES = [
+    QuestionTemplate(
+        id="11.4-juros",
+        topic_id="11.4",
+        difficulty=Difficulty.FACIL,
+        template_type="juros_simples",
+        parameters=ParameterSpace(capital=range(1000, 10500, 500), rate=[1, 2, 3, 4, 5], months=range(2, 13)),
+        statement_patterns=[
+            "Um capital de R$ {capital},00 foi aplicado a juros simples, à taxa de {rate}% ao mês, durante {months} meses. Quanto rendeu de juros?",
+            "{name} aplicou R$ {capital},00 a juros simples de {rate}% ao mês. Após {months} meses, quanto {name} recebeu de juros?",
+        ],
+        answer="capital * rate * months / 100",
+        answer_format="R$ {:.2f}",
+        resolution="J = C · i · t = {capital} · {rate}/100 · {months} = R$ {answer:.2f}",
+        distractors=[
+            "capital + answer",
+            "capital * rate / 100",
+            "capital * (1 + rate / 100) ** months - capital",
+            "2 * answer",
+            "answer / 2",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.4-montante",
+        topic_id="11.4",
+        difficulty=Difficulty.FACIL,
+        template_type="juros_simples",
+        parameters=ParameterSpace(capital=range(1000, 10500, 500), rate=[1, 2, 3, 4, 5], months=range(2, 13)),
+        statement_patterns=[
+            "Um capital de R$ {capital},00 é aplicado a juros simples de {rate}% ao mês. Qual é o montante após {months} meses?",
+            "{name} investiu R$ {capital},00 em uma aplicação a juros simples de {rate}% ao mês. Qual será o montante ao final de {months} meses?",
+        ],
+        derived={"interest": "capital * rate * months / 100"},
+        answer="capital + interest",
+        answer_format="R$ {:.2f}",
+        resolution="J = {capital} · {rate}/100 · {months} = R$ {interest:.2f}. M = C + J = {capital} + {interest:.2f} = R$ {answer:.2f}",
+        distractors=[
+            "interest",
+            "capital * (1 + rate / 100) ** months",
+            "capital * (1 + rate / 100)",
+            "answer + capital * rate / 100",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.4-taxa",
+        topic_id="11.4",
+        difficulty=Difficulty.MEDIO,
+        template_type="juros_simples",
+        parameters=ParameterSpace(capital=range(1000, 21000, 1000), rate=range(1, 11), months=[2, 3, 4, 5, 6, 8, 10, 12]),
+        statement_patterns=[
+            "Um capital de R$ {capital},00, aplicado a juros simples durante {months} meses, rendeu R$ {interest:.2f} de juros. Qual foi a taxa mensal?",
+            "{name} emprestou R$ {capital},00 a juros simples e, após {months} meses, recebeu R$ {interest:.2f} de juros. A taxa mensal cobrada foi de:",
+        ],
+        derived={"interest": "capital * rate * months / 100"},
+        answer="rate",
+        answer_format="{:g}% ao mês",
+        resolution="J = C · i · t ⇒ i = J / (C · t) = {interest:.2f} / ({capital} · {months}) = {answer}% ao mês",
+        distractors=[
+            "rate * months",
+            "rate + 1",
+            "2 * rate",
+            "rate * 12",
+            "rate + 2",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.4-capital",
+        topic_id="11.4",
+        difficulty=Difficulty.MEDIO,
+        template_type="juros_simples",
+        parameters=ParameterSpace(capital=range(1000, 21000, 1000), rate=range(1, 11), months=[2, 3, 4, 5, 6, 8, 10, 12]),
+        statement_patterns=[
+            "Qual capital, aplicado a juros simples de {rate}% ao mês durante {months} meses, rende R$ {interest:.2f} de juros?",
+            "{name} quer obter R$ {interest:.2f} de juros em {months} meses, em uma aplicação a juros simples de {rate}% ao mês. Quanto deve aplicar?",
+        ],
+        derived={"interest": "capital * rate * months / 100"},
+        answer="capital",
+        answer_format="R$ {:.2f}",
+        resolution="C = J / (i · t) = {interest:.2f} / ({rate}/100 · {months}) = R$ {answer:.2f}",
+        distractors=[
+            "interest * 100 / rate",
+            "interest * 100 / months",
+            "capital + interest",
+            "capital - interest",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.4-desconto",
+        topic_id="11.4",
+        difficulty=Difficulty.DIFICIL,
+        template_type="desconto_simples",
+        parameters=ParameterSpace(face=range(2000, 20500, 500), rate=[1, 1.5, 2, 2.5, 3, 4], months=[2, 3, 4, 5, 6]),
+        constraints=["rate * months <= 15"],
+        statement_patterns=[
+            "Um título de R$ {face},00 foi descontado {months} meses antes do vencimento, com desconto comercial simples à taxa de {rate:g}% ao mês. Qual o valor recebido?",
+            "A empresa {company} antecipou o resgate de uma duplicata de R$ {face},00 em {months} meses. Com desconto comercial simples de {rate:g}% ao mês, quanto a empresa recebeu?",
+        ],
+        derived={"discount": "face * rate * months / 100"},
+        answer="face - discount",
+        answer_format="R$ {:.2f}",
+        resolution="d = N · i · t = {face} · {rate:g}/100 · {months} = R$ {discount:.2f}. A = N - d = {face} - {discount:.2f} = R$ {answer:.2f}",
+        distractors=[
+            "discount",
+            "face / (1 + rate * months / 100)",
+            "face * (1 - rate / 100) ** months",
+            "face - face * rate / 100",
+            "face + discount",
+        ],
+        contexts={"company": ContextGenerator.COMPANIES},
+    ),
+]
+
+COMPOUND_INTEREST_TEMPLATES = [
+    QuestionTemplate(
+        id="11.5-montante",
+        topic_id="11.5",
+        difficulty=Difficulty.FACIL,
+        template_type="juros_compostos",
+        parameters=ParameterSpace(capital=range(1000, 20500, 500), rate=[2, 5, 10, 20], months=[2, 3, 4]),
+        statement_patterns=[
+            "Um capital de R$ {capital},00 é aplicado a juros compostos de {rate}% ao mês. Qual é o montante após {months} meses?",
+            "{name} aplicou R$ {capital},00 a juros compostos de {rate}% ao mês. Qual será o montante depois de {months} meses?",
+        ],
+        derived={"factor": "(1 + rate / 100) ** months"},
+        answer="capital * factor",
+        answer_format="R$ {:.2f}",
+        resolution="M = C · (1 + i)^t = {capital} · (1 + {rate}/100)^{months} = {capital} · {factor:.4f} = R$ {answer:.2f}",
+        distractors=[
+            "capital * (1 + rate * months / 100)",
+            "answer - capital",
+            "answer * (1 + rate / 100)",
+            "answer / (1 + rate / 100)",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.5-juros",
+        topic_id="11.5",
+        difficulty=Difficulty.FACIL,
+        template_type="juros_compostos",
+        parameters=ParameterSpace(capital=range(1000, 20500, 500), rate=[2, 5, 10, 20], months=[2, 3, 4]),
+        statement_patterns=[
+            "Quanto rendem de juros R$ {capital},00 aplicados a juros compostos de {rate}% ao mês durante {months} meses?",
+            "{name} deixou R$ {capital},00 aplicados a juros compostos de {rate}% ao mês por {months} meses. Quanto recebeu de juros?",
+        ],
+        derived={"amount": "capital * (1 + rate / 100) ** months"},
+        answer="amount - capital",
+        answer_format="R$ {:.2f}",
+        resolution="M = {capital} · (1 + {rate}/100)^{months} = R$ {amount:.2f}. J = M - C = {amount:.2f} - {capital} = R$ {answer:.2f}",
+        distractors=[
+            "capital * rate * months / 100",
+            "amount",
+            "capital * rate / 100",
+            "answer * (1 + rate / 100)",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.5-taxa-equivalente",
+        topic_id="11.5",
+        difficulty=Difficulty.MEDIO,
+        template_type="taxa_equivalente",
+        parameters=ParameterSpace(rate=[0.5, 1, 1.5, 2, 2.5, 3, 4, 5], periods=[2, 3, 6, 12]),
+        statement_patterns=[
+            "Uma aplicação rende {rate:g}% ao mês no regime de juros compostos. Qual é a taxa equivalente para {periods} meses?",
+            "{name} encontrou um investimento que rende {rate:g}% ao mês, com capitalização composta. Qual a taxa acumulada em {periods} meses?",
+        ],
+        answer="((1 + rate / 100) ** periods - 1) * 100",
+        answer_format="{:.2f}%",
+        resolution="(1 + i_eq) = (1 + {rate:g}/100)^{periods} ⇒ i_eq = {answer:.2f}%",
+        distractors=[
+            "rate * periods",
+            "((1 + rate / 100) ** (periods + 1) - 1) * 100",
+            "((1 + rate / 100) ** (periods - 1) - 1) * 100",
+            "(1 + rate / 100) ** periods * 100",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.5-capital",
+        topic_id="11.5",
+        difficulty=Difficulty.MEDIO,
+        template_type="juros_compostos",
+        parameters=ParameterSpace(capital=range(1000, 10500, 500), rate=[2, 5, 10], months=[2, 3]),
+        statement_patterns=[
+            "Qual capital deve ser aplicado hoje, a juros compostos de {rate}% ao mês, para se obter um montante de R$ {amount:.2f} em {months} meses?",
+            "{name} precisa ter R$ {amount:.2f} daqui a {months} meses. Aplicando a juros compostos de {rate}% ao mês, quanto deve investir hoje?",
+        ],
+        derived={"amount": "capital * (1 + rate / 100) ** months"},
+        answer="capital",
+        answer_format="R$ {:.2f}",
+        resolution="C = M / (1 + i)^t = {amount:.2f} / (1 + {rate}/100)^{months} = R$ {answer:.2f}",
+        distractors=[
+            "amount / (1 + rate * months / 100)",
+            "amount * (1 - rate / 100) ** months",
+            "amount - capital",
+            "amount / (1 + rate / 100)",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+    QuestionTemplate(
+        id="11.5-prazo",
+        topic_id="11.5",
+        difficulty=Difficulty.DIFICIL,
+        template_type="prazo_composto",
+        parameters=ParameterSpace(capital=range(1000, 11000, 1000), rate=[2, 3, 4, 5, 6, 8, 10, 12], multiple=[2, 3]),
+        statement_patterns=[
+            "Um capital de R$ {capital},00 é aplicado a juros compostos de {rate}% ao mês. Qual o menor número inteiro de meses para que o montante seja pelo menos {multiple} vezes o capital inicial?",
+            "{name} aplicou R$ {capital},00 a juros compostos de {rate}% ao mês e quer resgatar pelo menos R$ {target},00. Qual o menor número inteiro de meses de espera?",
+        ],
+        derived={
+            "target": "capital * multiple",
+            "exact": "math.log(multiple) / math.log(1 + rate / 100)",
+        },
+        answer="math.ceil(exact)",
+        answer_format="{} meses",
+        resolution="(1 + {rate}/100)^t ≥ {multiple} ⇒ t ≥ log {multiple} / log (1 + {rate}/100) ≈ {exact:.2f}, logo t = {answer} meses",
+        distractors=[
+            "answer - 1",
+            "answer + 1",
+            "math.ceil((multiple - 1) * 100 / rate)",
+            "answer + 2",
+        ],
+        contexts={"name": ContextGenerator.PEOPLE_NAMES},
+    ),
+]
+
+register_templates("11.4", SIMPLE_INTEREST_TEMPLATES, version=2)
+register_templates("11.5", COMPOUND_INTEREST_TEMPLATES, version=2)
@@ -3,4 +3,4 @@ from .curriculum import (
     get_volume, get_all_volumes, get_topic, 
     get_all_topics_for_volume, calculate_question_distribution
 )
-from .question import Question, Alternative, QuestionSet, VolumeQuestionSet
+from .question import Question, Alternative, QuestionSet, VolumeQuestionSet, Exam
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 import random
 import hashlib
@@ -676,6 +676,13 @@ CURRICULUM = {
 }
 
 
+TOPIC_INDEX: Dict[Tuple[int, str], Topic] = {
+    (volume.id, topic.id): topic
+    for volume in CURRICULUM.values()
+    for topic in volume.topics
+}
+
+
 def get_volume(volume_id: int) -> Optional[Volume]:
     return CURRICULUM.get(volume_id)
 
@@ -685,12 +692,7 @@ def get_all_volumes() -> Dict[int, Volume]:
 
 
 def get_topic(volume_id: int, topic_id: str) -> Optional[Topic]:
-    volume = get_volume(volume_id)
-    if volume:
-        for topic in volume.topics:
-            if topic.id == topic_id:
-                return topic
-    return None
+    return TOPIC_INDEX.get((volume_id, topic_id))
 
 
 def get_all_topics_for_volume(volume_id: int) -> List[Topic]:
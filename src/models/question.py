@@ -38,6 +38,12 @@ class Question:
         content = f"{self.statement}{self.correct_answer}{self.resolution}"
         return hashlib.md5(content.encode()).hexdigest()
     
+    @property
+    def dedup_key(self) -> str:
+        # What the hash registries have always stored, so caches written by
+        # earlier versions (including the old JSON files) keep matching.
+        return hashlib.md5(f"{self.statement}{self.correct_answer}".encode()).hexdigest()
+    
     def get_formatted_alternatives(self) -> str:
         lines = []
         for alt in self.alternatives:
@@ -61,6 +67,25 @@ class Question:
             "source_inspiration": self.source_inspiration,
             "hash_signature": self.hash_signature
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Question':
+        return cls(
+            id=data["id"],
+            volume_id=data["volume_id"],
+            topic_id=data["topic_id"],
+            difficulty=Difficulty(data["difficulty"]),
+            statement=data["statement"],
+            alternatives=[
+                Alternative(letter=a["letter"], text=a["text"], is_correct=a["is_correct"])
+                for a in data["alternatives"]
+            ],
+            correct_answer=data["correct_answer"],
+            resolution=data["resolution"],
+            context=data.get("context"),
+            source_inspiration=data.get("source_inspiration"),
+            hash_signature=data.get("hash_signature", "")
+        )
 
 
 @dataclass
@@ -106,3 +131,24 @@ class VolumeQuestionSet:
     
     def total_count(self) -> int:
         return sum(ts.total_count() for ts in self.topic_sets)
+
+
+@dataclass
+class Exam:
+    title: str
+    questions: List[Question] = field(default_factory=list)
+    
+    @property
+    def answer_key(self) -> str:
+        return "".join(q.correct_answer for q in self.questions)
+    
+    def total_count(self) -> int:
+        return len(self.questions)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "title": self.title,
+            "total": len(self.questions),
+            "answer_key": self.answer_key,
+            "questions": [q.to_dict() for q in self.questions]
+        }
@@ -0,0 +1,24 @@
+import pytest
+
+from src.generators.hash_registry import UniqueHashRegistry
+from src.generators.near_duplicates import NearDuplicateIndex
+from src.generators.parameter_space import ParameterCursors
+from src.generators.telemetry import GeneratorTelemetry
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    # Every test gets its own registry directory and fresh class-level state.
+    UniqueHashRegistry.clear_all_instances()
+    path = str(tmp_path / "cache")
+    for name, value in UniqueHashRegistry.settings().items():
+        monkeypatch.setattr(UniqueHashRegistry, name, value)
+    monkeypatch.setattr(UniqueHashRegistry, "CACHE_DIR", path)
+    monkeypatch.setenv("HASH_REGISTRY_CACHE_DIR", path)
+    NearDuplicateIndex.clear_all_instances()
+    ParameterCursors.clear_all_instances()
+    GeneratorTelemetry.reset()
+    yield path
+    UniqueHashRegistry.clear_all_instances()
+    NearDuplicateIndex.clear_all_instances()
+    ParameterCursors.clear_all_instances()
@@ -0,0 +1,58 @@
+import gc
+
+import pytest
+
+from src.generators.batch_generators import _gc_paused
+from src.generators.generator_registry import get_generator_spec
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import get_topic
+
+
+@pytest.fixture
+def gc_enabled():
+    gc.enable()
+    yield
+    gc.enable()
+
+
+def test_overlapping_pauses_reenable_gc_once(gc_enabled):
+    first, second = _gc_paused(), _gc_paused()
+    first.__enter__()
+    second.__enter__()
+    first.__exit__(None, None, None)
+    assert not gc.isenabled()
+    second.__exit__(None, None, None)
+    assert gc.isenabled()
+
+
+def test_pause_keeps_gc_off_if_it_was_off(gc_enabled):
+    gc.disable()
+    with _gc_paused():
+        pass
+    assert not gc.isenabled()
+
+
+@pytest.mark.parametrize("topic_id", ["4.2", "4.3", "5.6"])
+def test_batch_rows_depend_only_on_their_seed(topic_id):
+    generator = QuestionGenerator()
+    spec = get_generator_spec(topic_id)
+    topic = get_topic(int(topic_id.split(".")[0]), topic_id)
+    for difficulty in spec.difficulties:
+        batch = spec.batch(generator, topic, difficulty, list(range(100, 120)))
+        [alone] = spec.batch(generator, topic, difficulty, [105])
+        assert alone.hash_signature == batch[5].hash_signature
+        assert alone.id == batch[5].id
+        rebuilt = generator.rebuild_question(batch[7].id)
+        assert rebuilt.hash_signature == batch[7].hash_signature
+
+
+@pytest.mark.parametrize("topic_id", ["4.2", "4.3", "5.6"])
+def test_batch_questions_are_well_formed(topic_id):
+    generator = QuestionGenerator()
+    spec = get_generator_spec(topic_id)
+    topic = get_topic(int(topic_id.split(".")[0]), topic_id)
+    for difficulty in spec.difficulties:
+        for question in spec.batch(generator, topic, difficulty, list(range(50))):
+            texts = [a.text for a in question.alternatives]
+            assert len(texts) == 5 and len(set(texts)) == 5
+            assert [a.letter for a in question.alternatives if a.is_correct] == [question.correct_answer]
@@ -0,0 +1,39 @@
+from src.generators.capacity import estimate_distinct, remaining_capacity
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import Difficulty
+
+
+def test_estimate_distinct_unbounded_without_repeats():
+    assert estimate_distinct(list(range(50))) is None
+
+
+def test_estimate_distinct_saturated_sample():
+    assert estimate_distinct([1, 2, 3] * 20) == 3
+
+
+def test_estimate_distinct_chao1():
+    # 2 singletons, 1 doubleton: 3 + 2 * 2 / 2
+    assert estimate_distinct([1, 2, 3, 3]) == 5
+
+
+def test_remaining_capacity_scales_with_taken_share():
+    assert remaining_capacity(None, [True]) is None
+    assert remaining_capacity(100, []) == 100
+    assert remaining_capacity(100, [True, False, False, False]) == 75
+
+
+def test_capacity_counts_near_duplicates_once():
+    # 1.2 DIFICIL has three statements, each with shuffled alternatives.
+    generator = QuestionGenerator()
+    assert generator.estimate_capacity(1, "1.2", Difficulty.DIFICIL).capacity == 3
+    exact = QuestionGenerator(near_duplicate_check=False)
+    assert exact.estimate_capacity(1, "1.2", Difficulty.DIFICIL).capacity > 3
+
+
+def test_exhausted_difficulty_is_rerouted():
+    generator = QuestionGenerator()
+    generator.generate_questions(1, "1.2", [(Difficulty.DIFICIL, i) for i in range(6)])
+    assert generator.remaining_capacity(1, "1.2", Difficulty.DIFICIL) == 0
+    planned, overflow = generator.plan_distribution(1, "1.2", {Difficulty.DIFICIL: 4})
+    assert planned[Difficulty.DIFICIL] == 0
+    assert sum(planned.values()) == 4 and not any(overflow.values())
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.cli import Checkpoint, parse_volumes
+from src.models.curriculum import get_all_volumes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_parse_volumes_all():
+    assert parse_volumes("all") == sorted(get_all_volumes())
+
+
+def test_parse_volumes_ranges():
+    assert parse_volumes("1,3,5-7") == [1, 3, 5, 6, 7]
+
+
+def test_parse_volumes_unknown():
+    with pytest.raises(ValueError):
+        parse_volumes("99")
+
+
+def _main(cache_dir, *args):
+    return subprocess.run(
+        [sys.executable, "main.py", *args],
+        cwd=ROOT, capture_output=True, text=True, timeout=600,
+        env=dict(os.environ, HASH_REGISTRY_CACHE_DIR=cache_dir)
+    )
+
+
+def test_generate_default_volumes(tmp_path, cache_dir):
+    # Default worker count, i.e. the process-pool path.
+    output = str(tmp_path / "bank")
+    result = _main(cache_dir, "generate", "--per-topic", "1", "--output", output)
+    assert result.returncode == 0, result.stderr
+    with open(os.path.join(output, Checkpoint.FILE_NAME)) as f:
+        completed = json.load(f)["completed"]
+    expected = {f"{v.id}/{t.id}" for v in get_all_volumes().values() for t in v.topics}
+    assert set(completed) == expected
+
+
+def test_generate_resume_and_exam(tmp_path, cache_dir):
+    output = str(tmp_path / "bank")
+    args = ("generate", "--volumes", "1", "--per-topic", "10", "--workers", "2", "--output", output)
+    assert _main(cache_dir, *args).returncode == 0
+    assert _main(cache_dir, *args).returncode == 2
+    assert _main(cache_dir, *args, "--resume").returncode == 0
+    first = str(tmp_path / "first.json")
+    result = _main(cache_dir, "exam", "--bank", output, "--total", "20", "--output", first)
+    assert result.returncode == 0, result.stderr
+    second = str(tmp_path / "second.json")
+    result = _main(cache_dir, "exam", "--bank", output, "--total", "20", "--exclude", first, "--output", second)
+    assert result.returncode == 0, result.stderr
+    exams = []
+    for path in (first, second):
+        with open(path) as f:
+            exams.append({q["hash_signature"] for q in json.load(f)["questions"]})
+    assert len(exams[0]) == len(exams[1]) == 20
+    assert not exams[0] & exams[1]
@@ -0,0 +1,49 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.generators.batch_generators import _RowRandom, _distractors
+from src.generators.question_templates import (
+    FILLER_ALTERNATIVES, DistractorGenerator, _numeric_pool, format_number
+)
+from src.models.curriculum import Difficulty
+
+
+@pytest.mark.parametrize("correct", [0, 1, 2, 7, 10, 99, -3, 1000, 0.5, 0.05, 0.99, 3.14, 150.5])
+@pytest.mark.parametrize("difficulty", list(Difficulty))
+def test_numeric_pool_is_distinct_and_excludes_the_answer(correct, difficulty):
+    pool = _numeric_pool(correct, difficulty, DistractorGenerator.POOL_SIZE)
+    texts = [format_number(v) for v in pool]
+    assert len(texts) == DistractorGenerator.POOL_SIZE
+    assert len(set(texts)) == len(texts)
+    assert format_number(correct) not in texts
+    if 0 < correct < 1:
+        assert all(0 < v < 1 for v in pool)
+    elif correct > 0:
+        assert all(v > 0 for v in pool)
+
+
+def test_numeric_distractors_follow_the_rng():
+    first = DistractorGenerator.numeric_distractors(12, Difficulty.MEDIO, rng=random.Random(5))
+    second = DistractorGenerator.numeric_distractors(12, Difficulty.MEDIO, rng=random.Random(5))
+    assert first == second and len(set(first)) == 4
+
+
+def test_complete_options_tops_up_short_lists():
+    options = DistractorGenerator.complete_options("x = 5", ["x = 5", "x = 6"])
+    assert len(options) == len(set(options)) == 5
+    assert options[:2] == ["x = 5", "x = 6"]
+    options = DistractorGenerator.complete_options("sim", ["não"])
+    assert options == ["sim", "não"] + list(FILLER_ALTERNATIVES)
+
+
+def test_batch_distractors_come_from_the_shared_pools():
+    correct = np.array([10, 10, 3, 250])
+    rows = _distractors(_RowRandom([1, 2, 3, 4]), correct, Difficulty.FACIL, format_number)
+    for value, row in zip(correct.tolist(), rows):
+        pool = [format_number(v) for v in _numeric_pool(value, Difficulty.FACIL, DistractorGenerator.POOL_SIZE)]
+        assert len(row) == len(set(row)) == 4
+        assert set(row) <= set(pool)
+    [alone] = _distractors(_RowRandom([3]), correct[2:3], Difficulty.FACIL, format_number)
+    assert alone == rows[2]
@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+from src.generators.exam_builder import ExamBuilder, ExamConstraints, QuestionBank, _repair_letter_runs, apportion
+from src.models.curriculum import Difficulty
+from src.models.question import Alternative, Question
+
+
+def _question(topic_id, difficulty, n, letter=None):
+    letter = letter or "ABCDE"[n % 5]
+    return Question(
+        id=f"{topic_id}-{difficulty.value}-{n}",
+        volume_id=int(topic_id.split(".")[0]),
+        topic_id=topic_id,
+        difficulty=difficulty,
+        statement=f"{topic_id} {difficulty.value} {n}",
+        alternatives=[Alternative(letter=l, text=l, is_correct=l == letter) for l in "ABCDE"],
+        correct_answer=letter,
+        resolution=""
+    )
+
+
+def _bank(sizes):
+    return QuestionBank(
+        _question(topic_id, difficulty, n)
+        for (topic_id, difficulty), size in sizes.items()
+        for n in range(size)
+    )
+
+
+def test_apportion_uses_largest_remainders():
+    assert apportion(10, {"a": 1, "b": 1, "c": 1}, {"a": 10, "b": 10, "c": 10}) == {"a": 4, "b": 3, "c": 3}
+
+
+def test_apportion_shares_out_what_a_capped_key_cannot_take():
+    assert apportion(10, {"a": 3, "b": 1}, {"a": 2, "b": 20}) == {"a": 2, "b": 8}
+    with pytest.raises(ValueError):
+        apportion(10, {"a": 1, "b": 1}, {"a": 2, "b": 3})
+
+
+def test_exam_meets_topic_and_difficulty_quotas():
+    bank = _bank({(t, d): 20 for t in ("1.1", "1.2", "2.1") for d in Difficulty})
+    exam = ExamBuilder(bank).build(ExamConstraints(total=30, topic_weights={"1.1": 2, "1.2": 1, "2.1": 0}))
+    assert len(exam.questions) == 30
+    assert len({q.hash_signature for q in exam.questions}) == 30
+    assert sum(q.topic_id == "1.1" for q in exam.questions) == 20
+    assert not any(q.topic_id == "2.1" for q in exam.questions)
+    counts = {d: sum(q.difficulty == d for q in exam.questions) for d in Difficulty}
+    assert counts == {Difficulty.FACIL: 12, Difficulty.MEDIO: 12, Difficulty.DIFICIL: 6}
+
+
+def test_max_flow_repairs_rounding_across_sparse_cells():
+    # Proportional rounding alone would ask 1.1 for hard questions it lacks.
+    bank = _bank({
+        ("1.1", Difficulty.FACIL): 10, ("1.1", Difficulty.MEDIO): 10,
+        ("1.2", Difficulty.FACIL): 2, ("1.2", Difficulty.MEDIO): 2, ("1.2", Difficulty.DIFICIL): 10,
+    })
+    exam = ExamBuilder(bank).build(ExamConstraints(total=10, topic_weights={"1.1": 1, "1.2": 1}))
+    assert sum(q.topic_id == "1.1" for q in exam.questions) == 5
+    assert sum(q.difficulty == Difficulty.DIFICIL for q in exam.questions) == 2
+
+
+def test_conflicting_quotas_are_rejected():
+    bank = _bank({("1.1", Difficulty.FACIL): 10, ("1.2", Difficulty.DIFICIL): 10})
+    constraints = ExamConstraints(total=10, topic_weights={"1.1": 1, "1.2": 0.01})
+    with pytest.raises(ValueError):
+        ExamBuilder(bank).build(constraints)
+
+
+def test_excluded_questions_are_never_picked():
+    bank = _bank({("1.1", d): 10 for d in Difficulty})
+    excluded = {q.hash_signature for q in bank.cell("1.1", Difficulty.FACIL)[:6]}
+    exam = ExamBuilder(bank).build(ExamConstraints(total=10, excluded_hashes=excluded))
+    assert not excluded & {q.hash_signature for q in exam.questions}
+
+
+@pytest.mark.parametrize("max_run", [1, 2])
+def test_letter_runs_are_repaired(max_run):
+    letters = list("A" * 14 + "B" * 10 + "C" * 6)
+    random.Random(max_run).shuffle(letters)
+    questions = [_question("1.1", Difficulty.FACIL, n, letter) for n, letter in enumerate(letters)]
+    _repair_letter_runs(questions, max_run)
+    repaired = "".join(q.correct_answer for q in questions)
+    assert sorted(repaired) == sorted(letters)
+    assert not any(letter * (max_run + 1) in repaired for letter in "ABC")
+
+
+def test_unbalanced_letters_cannot_be_repaired():
+    questions = [_question("1.1", Difficulty.FACIL, n, "A") for n in range(5)]
+    with pytest.raises(ValueError):
+        _repair_letter_runs(questions, 1)
+
+
+def test_same_seed_builds_the_same_exam():
+    bank = _bank({(t, d): 15 for t in ("1.1", "1.2") for d in Difficulty})
+    build = lambda: [q.id for q in ExamBuilder(bank).build(ExamConstraints(total=20, seed=7)).questions]
+    assert build() == build()
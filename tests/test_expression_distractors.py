@@ -0,0 +1,29 @@
+import logging
+
+from src.generators.question_templates import DistractorGenerator, _derived_expressions, _parse_expression
+
+
+def setup_function():
+    _parse_expression.cache_clear()
+    _derived_expressions.cache_clear()
+
+
+def test_expression_distractors_are_distinct_variations():
+    distractors = DistractorGenerator.expression_distractors("x**2 + 1")
+    assert len(distractors) == len(set(distractors)) == 4
+    assert "x**2 + 1" not in distractors
+
+
+def test_equivalent_forms_share_the_derived_cache():
+    first = DistractorGenerator.expression_distractors("x**2+1")
+    second = DistractorGenerator.expression_distractors("1 + x**2")
+    assert first == second
+    assert _parse_expression.cache_info().misses == 2
+    assert _derived_expressions.cache_info().hits == 1
+
+
+def test_invalid_expression_warns_once(caplog):
+    with caplog.at_level(logging.WARNING):
+        for _ in range(3):
+            assert DistractorGenerator.expression_distractors("x +* ", "y") == ["y + 1", "y - 1", "2y", "-y"]
+    assert len([r for r in caplog.records if "Cannot parse expression" in r.message]) == 1
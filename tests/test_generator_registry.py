@@ -0,0 +1,41 @@
+from dataclasses import replace
+
+import pytest
+
+from src.generators import generator_registry
+from src.generators.generator_registry import get_generator_spec, register_generator, registered_topics
+from src.generators.question_engine import QuestionGenerator
+from src.generators.question_ids import GenerationPath, QuestionKey
+from src.generators.telemetry import GeneratorTelemetry
+from src.models.curriculum import Difficulty, get_all_volumes
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(generator_registry, "_GENERATORS", dict(generator_registry._GENERATORS))
+    monkeypatch.setattr(generator_registry, "_LAZY_MODULES", dict(generator_registry._LAZY_MODULES))
+
+
+def test_registered_topics_exist_in_the_curriculum():
+    topics = {t.id for v in get_all_volumes().values() for t in v.topics}
+    assert set(registered_topics()) <= topics
+
+
+def test_lazy_modules_register_on_first_lookup():
+    spec = get_generator_spec("11.4")
+    assert spec is not None and spec.topic_id == "11.4"
+
+
+def test_topic_cannot_be_registered_twice(registry):
+    register_generator("99.1")(lambda *args: None)
+    with pytest.raises(ValueError):
+        register_generator("99.1")(lambda *args: None)
+
+
+def test_unsupported_difficulty_uses_the_generic_generator(registry):
+    spec = get_generator_spec("1.5")
+    generator_registry._GENERATORS["1.5"] = replace(spec, difficulties=(Difficulty.FACIL,))
+    [question] = QuestionGenerator().generate_questions(1, "1.5", [(Difficulty.DIFICIL, 0)])
+    assert QuestionKey.decode(question.id).path == GenerationPath.GENERIC
+    [stats] = GeneratorTelemetry.report()
+    assert stats["fallbacks"] == {"no_generator": 1}
@@ -0,0 +1,172 @@
+import glob
+import hashlib
+import json
+import os
+import time
+
+from src.generators.hash_registry import BloomFilter, DigestStore, Durability, UniqueHashRegistry
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import Difficulty
+
+
+def test_legacy_json_cache_still_matches(cache_dir):
+    questions = QuestionGenerator().generate_questions(1, "1.5", [(Difficulty.FACIL, i) for i in range(5)])
+    UniqueHashRegistry.clear_all_instances()
+    for path in glob.glob(os.path.join(cache_dir, "hashes_v1_t1_5*")):
+        os.remove(path)
+    # The JSON files from before the binary store hold md5(statement + answer).
+    legacy = os.path.join(cache_dir, "hashes_v1_t1_5.json")
+    with open(legacy, 'w') as f:
+        json.dump({"hashes": [q.dedup_key for q in questions]}, f)
+    with UniqueHashRegistry.lease(1, "1.5") as registry:
+        assert registry.count() == len(questions)
+        for question in questions:
+            assert not registry.is_unique(f"{question.statement}{question.correct_answer}")
+    assert not os.path.exists(legacy)
+
+
+def _reopen(volume_id=1, topic_id="1.1"):
+    # A new process only sees what was written to disk.
+    UniqueHashRegistry.clear_all_instances()
+    return UniqueHashRegistry.get_instance(volume_id, topic_id)
+
+
+def _path(cache_dir, suffix):
+    return os.path.join(cache_dir, f"hashes_v1_t1_1{suffix}")
+
+
+def test_registered_hashes_are_appended_to_the_log(cache_dir):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    assert registry.is_unique("a") and registry.is_unique("b")
+    assert not registry.is_unique("a")
+    registry.flush()
+    assert os.path.getsize(_path(cache_dir, ".delta")) == 2 * registry.digest_width()
+    registry = _reopen()
+    assert registry.count() == 2
+    assert registry.contains("a") and registry.contains("b")
+
+
+def test_torn_log_record_is_dropped(cache_dir):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register_many(["a", "b"])
+    registry.flush()
+    with open(_path(cache_dir, ".delta"), 'ab') as f:
+        f.write(b"\x01\x02\x03")
+    registry = _reopen()
+    assert registry.count() == 2
+    assert os.path.getsize(_path(cache_dir, ".delta")) == 2 * registry.digest_width()
+    registry.register("c")
+    registry = _reopen()
+    assert registry.contains("c")
+
+
+def _logged(cache_dir) -> int:
+    path = _path(cache_dir, ".delta")
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def test_always_durability_writes_on_every_add(cache_dir, monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "DURABILITY", Durability.ALWAYS)
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register("a")
+    assert _logged(cache_dir) == registry.digest_width()
+
+
+def test_shutdown_durability_writes_only_on_flush(cache_dir, monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "DURABILITY", Durability.SHUTDOWN)
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register_many(["a", "b"])
+    assert _logged(cache_dir) == 0
+    UniqueHashRegistry.flush_all()
+    assert _logged(cache_dir) == 2 * registry.digest_width()
+
+
+def test_interval_durability_flushes_in_the_background(cache_dir, monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "FLUSH_INTERVAL_MS", 10)
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register("a")
+    deadline = time.time() + 5
+    while not _logged(cache_dir) and time.time() < deadline:
+        time.sleep(0.01)
+    assert _logged(cache_dir) == registry.digest_width()
+
+
+def test_compaction_merges_the_log_into_the_sorted_store(cache_dir):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register_many(["a", "b", "c"])
+    registry.compact()
+    registry.register_many(["d", "a"])
+    registry.compact()
+    assert _logged(cache_dir) == 0
+    with open(_path(cache_dir, ".bin"), 'rb') as f:
+        assert f.read(4) == DigestStore.MAGIC
+    store = DigestStore(_path(cache_dir, ".bin"), registry.digest_width())
+    digests = list(store)
+    store.close()
+    assert digests == sorted(registry.digest(c) for c in "abcd")
+    registry = _reopen()
+    assert registry.count() == 4
+    assert all(registry.contains(c) for c in "abcd")
+    assert not registry.contains("e")
+
+
+def test_store_keeps_the_width_it_was_written_with(cache_dir, monkeypatch):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register("a")
+    registry.compact()
+    monkeypatch.setattr(UniqueHashRegistry, "DIGEST_SIZE", 16)
+    registry = _reopen()
+    assert registry.digest_width() == 8
+    assert registry.contains("a")
+
+
+def test_bloom_filter_has_no_false_negatives(tmp_path):
+    bloom = BloomFilter(1000, 0.01)
+    digests = [hashlib.md5(str(i).encode()).digest()[:8] for i in range(1000)]
+    for d in digests:
+        bloom.add(d)
+    path = str(tmp_path / "filter.bloom")
+    bloom.save(path, covers=len(digests))
+    loaded, covers = BloomFilter.load(path)
+    assert covers == len(digests)
+    assert all(d in loaded for d in digests)
+    others = [hashlib.md5(f"x{i}".encode()).digest()[:8] for i in range(1000)]
+    assert sum(d in loaded for d in others) < 50
+
+
+def test_stale_bloom_filter_is_rebuilt(cache_dir):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register_many(["a", "b"])
+    registry.compact()
+    # A filter written for another snapshot must not be trusted.
+    BloomFilter(10, UniqueHashRegistry.BLOOM_FP_RATE).save(_path(cache_dir, ".bloom"), covers=1)
+    registry = _reopen()
+    assert registry.contains("a") and registry.contains("b")
+    assert BloomFilter.load(_path(cache_dir, ".bloom"))[1] == 2
+
+
+def test_reserve_commit_abort(cache_dir):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    a, b, c = (registry.digest(x).hex() for x in "abc")
+    assert registry.reserve([a, b, a]) == [True, True, False]
+    assert registry.reserve([a]) == [False]
+    registry.abort([a])
+    registry.commit([b])
+    assert registry.reserve([a, b, c]) == [True, False, True]
+    registry.abort([a, c])
+    registry = _reopen()
+    assert registry.contains_digest(b)
+    assert not registry.contains_digest(a) and not registry.contains_digest(c)
+
+
+def test_global_rejection_only_releases_this_call(cache_dir):
+    generator = QuestionGenerator(global_dedup=True)
+    topic = UniqueHashRegistry.get_instance(1, "1.1")
+    shared = UniqueHashRegistry.get_instance()
+    a, b = (topic.digest(x).hex() for x in "ab")
+    shared.reserve([b])
+    assert topic.reserve([a]) == [True]
+    # a is already reserved in the topic by someone else, b is taken globally.
+    assert generator._reserve(topic, shared, [a, b]) == [False, False]
+    assert topic.reserve([a]) == [False]
+    assert topic.reserve([b]) == [True]
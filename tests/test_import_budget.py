@@ -0,0 +1,10 @@
+import pytest
+
+from scripts.check_import_budget import BUDGETS_MS, measure
+
+
+@pytest.mark.parametrize("module", list(BUDGETS_MS))
+def test_entry_points_do_not_import_heavy_dependencies(module):
+    # Timing is left to the script itself; it is too noisy for the suite.
+    _, loaded = measure(module)
+    assert loaded == []
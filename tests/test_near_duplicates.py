@@ -0,0 +1,77 @@
+import os
+
+from src.generators.hash_registry import UniqueHashRegistry
+from src.generators.near_duplicates import NearDuplicateIndex, normalize_statement
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import Difficulty
+
+STATEMENT = "Ana comprou 3 cadernos por R$ 12,50 cada. Quanto Ana gastou no total?"
+
+
+def _index(cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    return NearDuplicateIndex(os.path.join(cache_dir, "minhash_test.sig"))
+
+
+def test_normalize_replaces_names_and_numbers():
+    tokens, numbers = normalize_statement(STATEMENT)
+    assert "<nome>" in tokens and "ana" not in tokens
+    assert numbers == ("12.50", "3")
+
+
+def test_renamed_character_is_a_near_duplicate(cache_dir):
+    index = _index(cache_dir)
+    index.add(index.signature(STATEMENT))
+    assert index.is_near_duplicate(STATEMENT.replace("Ana", "Pedro"))
+    assert not index.is_near_duplicate(STATEMENT.replace("3 cadernos", "4 cadernos"))
+
+
+def test_signatures_survive_a_reload(cache_dir):
+    index = _index(cache_dir)
+    index.add(index.signature(STATEMENT))
+    index.close()
+    assert _index(cache_dir).is_near_duplicate(STATEMENT)
+
+
+def test_window_drops_and_compacts_old_signatures(cache_dir, monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "WINDOW_SIZE", 5)
+    monkeypatch.setattr(NearDuplicateIndex, "COMPACT_MIN_ENTRIES", 5)
+    index = _index(cache_dir)
+    statements = [f"Uma caixa tem {n} bolas. Quantas bolas há em {n} caixas?" for n in range(20)]
+    for statement in statements:
+        index.add(index.signature(statement))
+    assert len(index) == 5
+    assert not index.is_near_duplicate(statements[0])
+    assert index.is_near_duplicate(statements[-1])
+    index.close()
+    assert os.path.getsize(index.path) <= 10 * index._record_len * 4
+
+
+def test_read_only_index_never_writes(cache_dir, monkeypatch):
+    index = _index(cache_dir)
+    index.add(index.signature(STATEMENT))
+    index.close()
+    size = os.path.getsize(index.path)
+    monkeypatch.setattr(UniqueHashRegistry, "READ_ONLY", True)
+    reader = _index(cache_dir)
+    reader.add(reader.signature(STATEMENT.replace("3", "5")))
+    assert os.path.getsize(index.path) == size
+
+
+def _persisted(cache_dir, topic_id):
+    path = os.path.join(cache_dir, f"minhash_v1_t{topic_id.replace('.', '_')}.sig")
+    return len(NearDuplicateIndex(path)) if os.path.exists(path) else 0
+
+
+def test_deferred_generation_does_not_persist_signatures(cache_dir):
+    generator = QuestionGenerator(defer_commit=True)
+    questions = generator.generate_questions(1, "1.5", [(Difficulty.MEDIO, i) for i in range(10)])
+    NearDuplicateIndex.clear_all_instances()
+    assert len(questions) == 10 and generator.deferred_digests
+    assert _persisted(cache_dir, "1.5") == 0
+
+
+def test_committed_questions_are_indexed(cache_dir):
+    questions = QuestionGenerator().generate_questions(1, "1.5", [(Difficulty.MEDIO, i) for i in range(10)])
+    NearDuplicateIndex.clear_all_instances()
+    assert _persisted(cache_dir, "1.5") == len(questions)
@@ -0,0 +1,49 @@
+import math
+import random
+
+import pytest
+
+from src.generators.number_tables import (
+    NICE_FRACTIONS, PRIME_LIMIT, PRIMES, PRIMITIVE_TRIPLES, PYTHAGOREAN_TRIPLES, TRIPLE_LIMIT,
+    is_prime, pick_prime, pick_pythagorean_triple, pick_with_parity, prime_count
+)
+
+
+def _is_prime(n):
+    return n >= 2 and all(n % d for d in range(2, math.isqrt(n) + 1))
+
+
+def test_primes_match_trial_division():
+    assert list(PRIMES) == [n for n in range(PRIME_LIMIT + 1) if _is_prime(n)]
+    assert all(is_prime(n) == _is_prime(n) for n in range(PRIME_LIMIT - 50, PRIME_LIMIT + 200))
+    assert prime_count(100) == 25
+
+
+def test_pick_prime_stays_in_range():
+    rng = random.Random(0)
+    assert {pick_prime(10, 30, rng) for _ in range(500)} == {11, 13, 17, 19, 23, 29}
+    assert pick_prime(24, 28, rng) is None
+    assert _is_prime(pick_prime(PRIME_LIMIT - 100, PRIME_LIMIT + 100, rng))
+
+
+def test_pick_with_parity():
+    rng = random.Random(0)
+    assert {pick_with_parity(3, 11, 0, rng) for _ in range(200)} == {4, 6, 8, 10}
+    assert {pick_with_parity(3, 11, 1, rng) for _ in range(200)} == {3, 5, 7, 9, 11}
+    assert pick_with_parity(4, 4, 1, rng) is None
+
+
+def test_pythagorean_triples():
+    for a, b, c in PYTHAGOREAN_TRIPLES:
+        assert a * a + b * b == c * c and a < b and c <= TRIPLE_LIMIT
+    assert all(math.gcd(a, b) == 1 for a, b, _ in PRIMITIVE_TRIPLES)
+    rng = random.Random(0)
+    assert {pick_pythagorean_triple(13, rng=rng) for _ in range(200)} == {(3, 4, 5), (6, 8, 10), (5, 12, 13)}
+    assert {pick_pythagorean_triple(13, primitive=True, rng=rng) for _ in range(200)} == {(3, 4, 5), (5, 12, 13)}
+    with pytest.raises(ValueError):
+        pick_pythagorean_triple(TRIPLE_LIMIT + 1)
+
+
+def test_nice_fractions_are_reduced_and_proper():
+    assert all(math.gcd(n, d) == 1 and 0 < n < d for n, d in NICE_FRACTIONS)
+    assert len(set(NICE_FRACTIONS)) == len(NICE_FRACTIONS)
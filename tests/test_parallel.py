@@ -0,0 +1,42 @@
+from collections import defaultdict
+
+import pytest
+
+from src.generators.hash_registry import UniqueHashRegistry
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import Difficulty
+
+
+@pytest.fixture
+def pool():
+    yield
+    QuestionGenerator.shutdown_pool()
+
+
+def test_parallel_runs_stay_unique_per_topic(pool):
+    keys = defaultdict(list)
+    for workers in (2, 1):
+        volume = QuestionGenerator().generate_volume_questions(1, questions_per_topic=10, workers=workers)
+        for topic_set in volume.topic_sets:
+            keys[topic_set.topic_id].extend(q.dedup_key for q in topic_set.questions)
+    UniqueHashRegistry.flush_all()
+    for topic_id, digests in keys.items():
+        assert len(digests) == len(set(digests)), topic_id
+        with UniqueHashRegistry.lease(1, topic_id) as registry:
+            assert all(registry.contains_digest(d) for d in digests)
+
+
+def test_reconcile_regenerates_conflicting_questions():
+    worker = QuestionGenerator(defer_commit=True)
+    question_set = worker.generate_topic_questions(1, "1.5", 5)
+    taken = question_set.questions[0].dedup_key
+    with UniqueHashRegistry.lease(1, "1.5") as registry:
+        # Another process commits the same question before the parent does.
+        assert registry.reserve([taken]) == [True]
+        registry.commit([taken])
+    QuestionGenerator()._reconcile_topic(1, "1.5", question_set, worker.deferred_digests, seed=100)
+    digests = [q.dedup_key for q in question_set.questions]
+    assert len(digests) == len(set(digests)) == 5
+    assert digests.count(taken) == 0
+    with UniqueHashRegistry.lease(1, "1.5") as registry:
+        assert all(registry.contains_digest(d) for d in digests)
@@ -0,0 +1,103 @@
+import pytest
+
+from src.generators.hash_registry import UniqueHashRegistry
+from src.generators.parameter_space import (
+    ParameterCursors, ParameterSpace, ParameterSubset, ParameterUnion, ParameterWalk
+)
+from src.generators.question_engine import QuestionGenerator
+from src.generators.question_ids import GenerationPath, QuestionKey
+from src.models.curriculum import Difficulty
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 12, 64, 97, 360, 1000])
+@pytest.mark.parametrize("seed", [0, 1, 12345])
+def test_walk_is_a_permutation(size, seed):
+    walk = ParameterWalk(size, seed)
+    assert sorted(walk[i] for i in range(size)) == list(range(size))
+
+
+def test_space_params_and_columns_agree():
+    space = ParameterUnion(
+        ParameterSpace(a=range(3), b="xy"),
+        ParameterSubset(ParameterSpace(a=range(10, 15), b="z"), lambda p: p["a"] % 2 == 0),
+    )
+    assert space.size == 6 + 3
+    columns = space.columns(range(space.size))
+    params = [space.params(i) for i in range(space.size)]
+    assert [p["a"] for p in params] == columns["a"].tolist()
+    assert [p["b"] for p in params] == columns["b"].tolist()
+    assert len({(p["a"], p["b"]) for p in params}) == space.size
+
+
+def test_cursor_walks_without_replacement(cache_dir):
+    space = ParameterSpace(a=range(5), b=range(4))
+    cursors = ParameterCursors(cache_dir)
+    drawn = [cursors.next_index("k", space) for _ in range(space.size)]
+    assert sorted(drawn) == list(range(space.size))
+    assert cursors.next_index("k", space) is None
+    assert cursors.remaining("k", space) == 0
+
+
+def test_wrap_starts_a_new_order(cache_dir):
+    space = ParameterSpace(a=range(50))
+    cursors = ParameterCursors(cache_dir)
+    first = [cursors.next_index("k", space) for _ in range(space.size)]
+    cursors.wrap("k", space)
+    second = [cursors.next_index("k", space) for _ in range(space.size)]
+    assert sorted(second) == list(range(space.size))
+    assert second != first
+
+
+def test_save_merges_with_other_processes(cache_dir):
+    space = ParameterSpace(a=range(10))
+    ours, theirs = ParameterCursors(cache_dir), ParameterCursors(cache_dir)
+    for _ in range(3):
+        ours.next_index("k", space)
+    theirs.next_index("k", space)
+    theirs.advance("draws", 7)
+    theirs.save()
+    ours.save()
+    on_disk = ParameterCursors(cache_dir).snapshot()
+    assert on_disk["k"]["position"] == 3
+    assert on_disk["draws"]["position"] == 7
+
+
+def test_newer_epoch_wins_over_further_position(cache_dir):
+    space = ParameterSpace(a=range(10))
+    ours, theirs = ParameterCursors(cache_dir), ParameterCursors(cache_dir)
+    for _ in range(5):
+        ours.next_index("v1_t1.1_facil", space)
+    theirs.next_index("v1_t1.1_facil", space)
+    theirs.save()
+    theirs.reset("v1_t1.1_")
+    theirs.save()
+    ours.save()
+    cursor = ParameterCursors(cache_dir).snapshot()["v1_t1.1_facil"]
+    assert (cursor["epoch"], cursor["position"]) == (1, 0)
+
+
+def test_changed_domain_restarts_the_walk(cache_dir):
+    cursors = ParameterCursors(cache_dir)
+    cursors.next_index("k", ParameterSpace(a=range(3)))
+    assert cursors.remaining("k", ParameterSpace(a=range(4))) == 4
+
+
+def _paths(questions):
+    return [QuestionKey.decode(q.id).path for q in questions]
+
+
+def test_walked_space_falls_back_once_exhausted():
+    generator = QuestionGenerator(near_duplicate_check=False)
+    questions = generator.generate_questions(4, "4.3", [(Difficulty.FACIL, i) for i in range(90)])
+    assert len(questions) == 90
+    assert GenerationPath.GENERIC not in _paths(questions)
+    [extra] = generator.generate_questions(4, "4.3", [(Difficulty.FACIL, 0)])
+    assert _paths([extra]) == [GenerationPath.GENERIC]
+
+
+def test_windowed_registry_wraps_the_walk(monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "WINDOW_SIZE", 10)
+    generator = QuestionGenerator(near_duplicate_check=False)
+    generator.generate_questions(4, "4.3", [(Difficulty.FACIL, i) for i in range(90)])
+    [extra] = generator.generate_questions(4, "4.3", [(Difficulty.FACIL, 0)])
+    assert _paths([extra]) != [GenerationPath.GENERIC]
@@ -0,0 +1,99 @@
+import pytest
+
+from src.generators.hash_registry import UniqueHashRegistry
+from src.generators.near_duplicates import NearDuplicateIndex
+from src.generators.parameter_space import ParameterCursors
+from src.generators.question_engine import QuestionGenerator
+from src.generators.question_ids import GenerationPath, QuestionKey
+from src.generators.telemetry import GeneratorTelemetry
+from src.models.curriculum import Difficulty
+
+
+def _restart():
+    # What a new process sees: only what previous runs wrote to disk.
+    UniqueHashRegistry.flush_all()
+    UniqueHashRegistry.clear_all_instances()
+    NearDuplicateIndex.clear_all_instances()
+    ParameterCursors.clear_all_instances()
+    return QuestionGenerator()
+
+
+def _seeds(questions):
+    keys = [QuestionKey.decode(q.id) for q in questions]
+    return {k.seed for k in keys if k.path != GenerationPath.GENERIC}
+
+
+def test_new_process_does_not_replay_draws():
+    slots = [(Difficulty.MEDIO, i) for i in range(20)]
+    first = QuestionGenerator().generate_questions(1, "1.5", slots)
+    GeneratorTelemetry.reset()
+    second = _restart().generate_questions(1, "1.5", slots)
+    assert _seeds(first)
+    assert not _seeds(first) & _seeds(second)
+    [stats] = GeneratorTelemetry.report()
+    assert stats["collisions"] == 0
+
+
+def test_draw_counter_is_persisted(cache_dir):
+    QuestionGenerator().generate_questions(1, "1.5", [(Difficulty.FACIL, 0)] * 4)
+    cursors = ParameterCursors(cache_dir).snapshot("v1_t1.5_")
+    assert cursors["v1_t1.5_facil_draws"]["position"] >= 4
+
+
+def test_questions_rebuild_from_their_id():
+    generator = QuestionGenerator()
+    questions = generator.generate_questions(1, "1.5", [(d, 7) for d in Difficulty])
+    for question in questions:
+        rebuilt = generator.rebuild_question(question.id)
+        assert rebuilt.statement == question.statement
+        assert rebuilt.hash_signature == question.hash_signature
+
+
+def test_generic_fallbacks_are_reserved_and_committed():
+    slots = [(Difficulty.FACIL, i) for i in range(30)]
+    first = QuestionGenerator().generate_questions(1, "1.5", slots, fallback="capacity_exhausted")
+    second = _restart().generate_questions(1, "1.5", slots, fallback="capacity_exhausted")
+    assert all(QuestionKey.decode(q.id).path == GenerationPath.GENERIC for q in first + second)
+    digests = [q.dedup_key for q in first + second]
+    assert len(digests) == len(set(digests)) == 60
+    with UniqueHashRegistry.lease(1, "1.5") as registry:
+        assert all(registry.contains_digest(d) for d in digests)
+
+
+def test_deferred_fallbacks_are_handed_to_the_parent():
+    generator = QuestionGenerator(defer_commit=True)
+    questions = generator.generate_questions(1, "1.5", [(Difficulty.MEDIO, i) for i in range(5)], fallback="capacity_exhausted")
+    assert sorted(generator.deferred_digests) == sorted(q.dedup_key for q in questions)
+
+
+def test_slots_without_a_unique_question_are_dropped(monkeypatch):
+    generator = QuestionGenerator()
+    original = generator._generate_generic_question
+    monkeypatch.setattr(generator, "_generate_generic_question", lambda topic, difficulty, seed: original(topic, difficulty, 0))
+    questions = generator.generate_questions(1, "1.5", [(Difficulty.FACIL, i) for i in range(3)], fallback="capacity_exhausted")
+    assert len(questions) == 1
+    [stats] = GeneratorTelemetry.report()
+    assert stats["dropped"] == 2
+
+
+@pytest.mark.parametrize("path", list(GenerationPath))
+@pytest.mark.parametrize("difficulty", list(Difficulty))
+def test_question_key_round_trip(path, difficulty):
+    key = QuestionKey("11.4", difficulty, path, 3, 0xBEEF)
+    assert QuestionKey.decode(key.encode()) == key
+    assert key.volume_id == 11
+
+
+@pytest.mark.parametrize("question_id", ["", "abc", "1.5-xs1-2f", "1.5-fs1-", "1.5-fs-2f"])
+def test_invalid_question_ids_are_rejected(question_id):
+    with pytest.raises(ValueError):
+        QuestionKey.decode(question_id)
+
+
+def test_stale_generator_version_is_rejected():
+    generator = QuestionGenerator()
+    [question] = generator.generate_questions(1, "1.5", [(Difficulty.FACIL, 0)])
+    key = QuestionKey.decode(question.id)
+    stale = QuestionKey(key.topic_id, key.difficulty, key.path, key.version + 1, key.seed)
+    with pytest.raises(ValueError):
+        generator.rebuild_question(stale.encode())
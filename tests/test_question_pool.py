@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from src.generators.exam_builder import ExamConstraints
+from src.generators.question_engine import QuestionGenerator
+from src.generators.question_pool import QuestionPool
+from src.models.curriculum import Difficulty
+
+
+@pytest.fixture
+def pool():
+    pool = QuestionPool(QuestionGenerator(), low_watermark=2, high_watermark=6, refill_batch=3)
+    yield pool
+    pool.stop()
+
+
+def _wait_for(condition, timeout=30):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_cold_take_is_served_synchronously(pool):
+    questions = pool.take(1, "1.1", Difficulty.FACIL, 4)
+    assert len(questions) == 4
+    assert len({q.dedup_key for q in questions}) == 4
+
+
+def test_warm_fills_every_difficulty(pool):
+    pool.warm(1, "1.1")
+    for difficulty in Difficulty:
+        assert _wait_for(lambda: pool.size(1, "1.1", difficulty) == pool.high_watermark)
+    taken = pool.take(1, "1.1", Difficulty.MEDIO, 5)
+    assert len(taken) == 5
+    assert _wait_for(lambda: pool.size(1, "1.1", Difficulty.MEDIO) == pool.high_watermark)
+
+
+def test_exam_questions_leave_the_pool(pool):
+    pool.warm(1, "1.1")
+    assert _wait_for(lambda: all(pool.size(1, "1.1", d) == pool.high_watermark for d in Difficulty))
+    exam = pool.assemble_exam(ExamConstraints(total=6, max_letter_run=None))
+    pool.stop()
+    chosen = {q.dedup_key for q in exam.questions}
+    remaining = pool.take(1, "1.1", Difficulty.FACIL, pool.high_watermark)
+    assert not chosen & {q.dedup_key for q in remaining}
+
+
+def test_refill_stops_when_generation_comes_back_short(pool, monkeypatch):
+    calls = []
+    monkeypatch.setattr(pool.generator, "generate_questions", lambda *args: calls.append(args) or [])
+    pool._queue[(1, "1.1", Difficulty.FACIL)] = None
+    pool._refill((1, "1.1", Difficulty.FACIL))
+    assert len(calls) == 1
+    assert not pool._queue
@@ -0,0 +1,28 @@
+import random
+
+import pytest
+
+from src.generators.generator_registry import get_generator_spec, registered_topics
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import Difficulty, get_topic
+
+
+@pytest.mark.parametrize("topic_id", registered_topics())
+def test_generators_are_pure_functions_of_the_seed(topic_id):
+    generator = QuestionGenerator()
+    topic = get_topic(int(topic_id.split(".")[0]), topic_id)
+    spec = get_generator_spec(topic_id)
+    state = random.getstate()
+    for difficulty in spec.difficulties:
+        first = generator._run_generator(spec, topic, difficulty, 42)
+        random.seed(0)
+        second = generator._run_generator(spec, topic, difficulty, 42)
+        assert first.hash_signature == second.hash_signature
+        assert first.id == second.id
+    random.setstate(state)
+
+
+def test_generation_leaves_the_global_random_state_alone():
+    state = random.getstate()
+    QuestionGenerator().generate_questions(1, "1.2", [(d, 3) for d in Difficulty])
+    assert random.getstate() == state
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from src.generators.hash_registry import SQLiteHashRegistry, UniqueHashRegistry
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch):
+    UniqueHashRegistry.clear_all_instances()
+    monkeypatch.setattr(UniqueHashRegistry, "BACKEND", "sqlite")
+
+
+def _in_thread(func):
+    # Each thread opens its own connection, like another worker would.
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_file_cache_is_imported_once(cache_dir, monkeypatch):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register_many(["a", "b"])
+    registry.compact()
+    registry.register("c")
+    UniqueHashRegistry.clear_all_instances()
+    monkeypatch.setattr(UniqueHashRegistry, "BACKEND", "sqlite")
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    assert isinstance(registry, SQLiteHashRegistry)
+    assert registry.count() == 3
+    registry.clear()
+    UniqueHashRegistry.clear_all_instances()
+    assert UniqueHashRegistry.get_instance(1, "1.1").count() == 0
+
+
+def test_reservations_are_shared_between_connections(sqlite_backend):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    digests = [registry.digest(c) for c in "ab"]
+    assert registry.reserve(digests) == [True, True]
+    assert _in_thread(lambda: registry.reserve(digests)) == [False, False]
+    registry.abort(digests[:1])
+    assert _in_thread(lambda: registry.reserve(digests)) == [True, False]
+    registry.commit(digests[1:])
+    assert registry.count() == 1
+    assert _in_thread(lambda: registry.contains_digest(digests[1]))
+
+
+def test_stale_reservations_expire(sqlite_backend, monkeypatch):
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    digests = [registry.digest("a")]
+    registry.reserve(digests)
+    monkeypatch.setattr(SQLiteHashRegistry, "RESERVATION_TTL", -1)
+    assert registry.reserve(digests) == [True]
+
+
+def test_scopes_are_independent(sqlite_backend):
+    topic = UniqueHashRegistry.get_instance(1, "1.1")
+    other = UniqueHashRegistry.get_instance(1, "1.2")
+    assert topic.is_unique("a")
+    assert other.is_unique("a")
+    assert not topic.is_unique("a")
@@ -0,0 +1,26 @@
+from itertools import islice
+
+from src.generators.question_engine import QuestionGenerator
+from src.models.curriculum import calculate_question_distribution, get_volume
+
+
+def test_topic_stream_generates_one_chunk_at_a_time():
+    generator = QuestionGenerator()
+    stream = generator.iter_topic_questions(1, "1.5", 40, chunk_size=10)
+    first = list(islice(stream, 10))
+    assert len(first) == 10
+    assert generator.generated_count == 10
+    rest = list(stream)
+    assert len(first) + len(rest) == 40
+
+
+def test_topic_stream_follows_the_difficulty_distribution():
+    questions = list(QuestionGenerator().iter_topic_questions(1, "1.5", 20))
+    expected = calculate_question_distribution(20)
+    for difficulty, count in expected.items():
+        assert sum(q.difficulty == difficulty for q in questions) == count
+
+
+def test_volume_stream_covers_every_topic():
+    topics = {q.topic_id for q in QuestionGenerator().iter_volume_questions(1, questions_per_topic=2)}
+    assert topics == {t.id for t in get_volume(1).topics}
@@ -0,0 +1,36 @@
+from src.generators.telemetry import GeneratorStats, GeneratorTelemetry
+from src.models.curriculum import Difficulty
+
+
+def _observe(accepted, failures):
+    GeneratorTelemetry.record_outcomes("1.6", Difficulty.FACIL, accepted, failures, 0)
+
+
+def test_default_budget_without_observations():
+    assert GeneratorTelemetry.retry_budget("1.6", Difficulty.FACIL) == GeneratorTelemetry.DEFAULT_ATTEMPTS
+
+
+def test_futile_rate_keeps_default_budget_while_capacity_remains():
+    _observe(0, 100)
+    assert GeneratorTelemetry.retry_budget("1.6", Difficulty.FACIL) == GeneratorTelemetry.DEFAULT_ATTEMPTS
+    assert GeneratorTelemetry.retry_budget("1.6", Difficulty.FACIL, 0.9) == GeneratorTelemetry.DEFAULT_ATTEMPTS
+
+
+def test_futile_rate_cuts_budget_when_space_is_used_up():
+    _observe(0, 100)
+    assert GeneratorTelemetry.retry_budget("1.6", Difficulty.FACIL, 0.01) == GeneratorTelemetry.MIN_ATTEMPTS
+
+
+def test_budget_grows_with_collision_rate():
+    _observe(50, 50)
+    half = GeneratorTelemetry.retry_budget("1.6", Difficulty.FACIL)
+    _observe(10, 290)
+    assert GeneratorTelemetry.MIN_ATTEMPTS <= half < GeneratorTelemetry.retry_budget("1.6", Difficulty.FACIL)
+
+
+def test_merge_and_report():
+    other = GeneratorStats(attempts=5, accepted=4, collisions=1, fallbacks={"no_generator": 2})
+    GeneratorTelemetry.merge({("1.6", Difficulty.MEDIO): other})
+    GeneratorTelemetry.merge({("1.6", Difficulty.MEDIO): other})
+    [row] = GeneratorTelemetry.report()
+    assert (row["attempts"], row["accepted"], row["fallbacks"]) == (10, 8, {"no_generator": 4})
@@ -0,0 +1,94 @@
+import pytest
+
+from src.generators.parameter_space import ParameterSpace
+from src.generators.question_engine import QuestionGenerator
+from src.generators.question_templates import QuestionTemplate
+from src.generators.template_compiler import (
+    CompiledTemplate, TemplateGenerator, compile_expression, compile_pattern
+)
+from src.models.curriculum import Difficulty, get_topic
+
+
+def _template(**overrides):
+    fields = dict(
+        id="soma",
+        topic_id="1.1",
+        difficulty=Difficulty.FACIL,
+        template_type="calculo",
+        parameters=ParameterSpace(a=range(1, 6), b=range(1, 6)),
+        statement_patterns=["{nome} soma {a} e {b}. Quanto obtém?"],
+        answer="a + b",
+        resolution="{a} + {b} = {answer}",
+        constraints=["a < b"],
+        distractors=["a * b", "b - a", "answer + 1", "answer"],
+        contexts={"nome": ["Ana", "Bruno"]},
+    )
+    fields.update(overrides)
+    return QuestionTemplate(**fields)
+
+
+def test_expression_reads_the_scope():
+    expression = compile_expression("gcd(a, b) + sqrt(c)", ["a", "b", "c"], "t")
+    assert expression({"a": 12, "b": 18, "c": 16}) == 10
+
+
+@pytest.mark.parametrize("source", ["a +", "open('x')", "__import__('os')", "z * 2"])
+def test_bad_expressions_fail_at_compile_time(source):
+    with pytest.raises(ValueError):
+        compile_expression(source, ["a"], "t")
+
+
+def test_pattern_formats_and_escapes():
+    pattern = compile_pattern('"{a}" vale {b:.2f}\\', ["a", "b"], "t")
+    assert pattern({"a": "x", "b": 1.5}) == '"x" vale 1.50\\'
+    with pytest.raises(ValueError):
+        compile_pattern("{c}", ["a"], "t")
+    with pytest.raises(ValueError):
+        compile_pattern("{a!r}", ["a"], "t")
+
+
+def test_constraints_shrink_the_space():
+    compiled = CompiledTemplate(_template())
+    assert compiled.space.size == 10
+    assert all(p["a"] < p["b"] for p in (compiled.space.params(i) for i in range(10)))
+    with pytest.raises(ValueError):
+        CompiledTemplate(_template(constraints=["a > 10"]))
+
+
+def test_rendered_questions_are_deterministic_and_well_formed():
+    generator = TemplateGenerator("1.1", [_template()])
+    engine = QuestionGenerator()
+    topic = get_topic(1, "1.1")
+    for seed in range(10):
+        question = generator(engine, topic, Difficulty.FACIL, seed)
+        again = generator(engine, topic, Difficulty.FACIL, seed)
+        assert question.hash_signature == again.hash_signature
+        texts = [a.text for a in question.alternatives]
+        assert len(texts) == len(set(texts)) == 5
+        correct = [a for a in question.alternatives if a.is_correct]
+        assert [a.letter for a in correct] == [question.correct_answer]
+        a, b = (int(n) for n in question.resolution.split(" = ")[0].split(" + "))
+        assert correct[0].text == str(a + b)
+
+
+def test_templates_of_one_difficulty_share_a_union_space():
+    second = _template(id="produto", answer="a * b", constraints=[], resolution="{a} × {b} = {answer}")
+    generator = TemplateGenerator("1.1", [_template(), second])
+    assert generator.parameter_spaces[Difficulty.FACIL].size == 10 + 25
+    engine = QuestionGenerator()
+    topic = get_topic(1, "1.1")
+    resolutions = [generator(engine, topic, Difficulty.FACIL, seed).resolution for seed in range(35)]
+    assert sum("+" in r for r in resolutions) == 10
+
+
+def test_template_must_match_its_topic():
+    with pytest.raises(ValueError):
+        TemplateGenerator("1.2", [_template()])
+    with pytest.raises(ValueError):
+        TemplateGenerator("1.1", [_template(), _template()])
+
+
+def test_registered_template_topics_generate_unique_questions():
+    questions = QuestionGenerator().generate_questions(11, "11.4", [(d, i) for d in Difficulty for i in range(5)])
+    assert len(questions) == 15
+    assert len({q.dedup_key for q in questions}) == 15
@@ -0,0 +1,60 @@
+import os
+import time
+
+from src.generators.hash_registry import UniqueHashRegistry, WindowedHashRegistry
+
+
+def _reopen():
+    UniqueHashRegistry.clear_all_instances()
+    return UniqueHashRegistry.get_instance(1, "1.1")
+
+
+def test_window_size_forgets_the_oldest_hashes(monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "WINDOW_SIZE", 2)
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    assert isinstance(registry, WindowedHashRegistry)
+    registry.register_many(["a", "b", "c"])
+    assert registry.count() == 2
+    assert not registry.contains("a")
+    assert registry.is_unique("a")
+    assert not registry.contains("b")
+
+
+def test_window_survives_a_reload(cache_dir, monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "WINDOW_SIZE", 2)
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register_many(["a", "b", "c"])
+    registry = _reopen()
+    assert registry.count() == 2
+    assert registry.contains("b") and registry.contains("c")
+    record = registry.digest_width() + WindowedHashRegistry.TIMESTAMP.size
+    assert os.path.getsize(os.path.join(cache_dir, "hashes_v1_t1_1.window")) == 2 * record
+
+
+def test_window_days_expire_old_hashes(monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "WINDOW_DAYS", 1)
+    registry = UniqueHashRegistry.get_instance(1, "1.1")
+    registry.register("a")
+    assert registry.contains("a")
+    monkeypatch.setattr(UniqueHashRegistry, "WINDOW_DAYS", 1e-9)
+    time.sleep(0.01)
+    assert not registry.contains("a")
+    assert registry.count() == 0
+
+
+def test_leased_registries_are_never_evicted(monkeypatch):
+    monkeypatch.setattr(UniqueHashRegistry, "MAX_RESIDENT_REGISTRIES", 1)
+    with UniqueHashRegistry.lease(1, "1.1") as first:
+        with UniqueHashRegistry.lease(1, "1.2") as second:
+            assert UniqueHashRegistry.get_instance(1, "1.1") is first
+            assert UniqueHashRegistry.get_instance(1, "1.2") is second
+    UniqueHashRegistry.get_instance(1, "1.3")
+    assert len(UniqueHashRegistry._instances) == 1
+
+
+def test_evicted_registry_keeps_its_hashes(monkeypatch):
+    UniqueHashRegistry.get_instance(1, "1.1").register("a")
+    monkeypatch.setattr(UniqueHashRegistry, "MAX_RESIDENT_REGISTRIES", 1)
+    UniqueHashRegistry.get_instance(1, "1.2")
+    assert "v1_t1.1" not in UniqueHashRegistry._instances
+    assert UniqueHashRegistry.get_instance(1, "1.1").contains("a")